@@ -0,0 +1,36 @@
+"""Micro-benchmark for dealing a whole shoe with pick_card.
+
+Run from the root of the project with: python -m benchmarks.bench_deal
+The per-deal cost should stay flat from a 1-deck shoe up to an 8-deck shoe.
+"""
+import random
+import time
+
+from casino.games.cards import DeckOfCards, CompactShoe
+
+REPEAT = 20
+
+
+def time_per_deal(deck) -> float:
+    """Deals every card in the deck and returns them to it, returns the fastest time per deal in nanoseconds."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        deck.shuffle_cards()
+        cards = len(deck.cards)
+        start = time.perf_counter_ns()
+        for _ in range(cards):
+            deck.pick_card(discard=True)
+        best = min(best, (time.perf_counter_ns() - start) / cards)
+    return best
+
+
+def main() -> None:
+    print(f"{'decks':>5} {'cards':>6} {'DeckOfCards ns/deal':>20} {'CompactShoe ns/deal':>20}")
+    for decks in range(1, 9):
+        results = [time_per_deal(DeckOfCards(decks=decks, rng=random.Random(0))),
+                   time_per_deal(CompactShoe(decks=decks, rng=random.Random(0)))]
+        print(f"{decks:>5} {decks * 52:>6} {results[0]:>20.0f} {results[1]:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
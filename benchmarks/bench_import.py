@@ -0,0 +1,62 @@
+"""Benchmark of the time it takes a fresh interpreter to import the package and its games.
+
+Run from the root of the project with: python -m benchmarks.bench_import
+Every import is timed with python -X importtime in a new process, with its bytecode compiled beforehand, and the
+fastest of REPEAT runs counts. The run fails when an import takes longer than its IMPORT_BUDGETS, which catches
+modules doing work at import time that could wait for first use. Roulette is left out, its import time is that of
+NumPy.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+REPEAT = 7
+IMPORT_BUDGETS = {
+    "casino": 5,
+    "casino.games.wheeloffortune": 40,
+    "casino.games.blackjack": 50,
+    "casino.games.simulation": 60,
+}  # Milliseconds, including the standard library modules imported for the first time
+
+
+def import_time(module: str, cache: str) -> float:
+    """Imports a module in a new interpreter, returns the time the import took in milliseconds.
+
+    Args:
+        module: Name of the module to import.
+        cache: Directory the bytecode of the imported modules is kept in.
+    """
+    environment = dict(os.environ, PYTHONPYCACHEPREFIX=cache)
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], env=environment,
+                               capture_output=True, text=True, check=True)
+    total = 0
+    for line in completed.stderr.splitlines()[1:]:  # The first line is the header of the table
+        cumulative, name = line.split("|")[1:]
+        if name.startswith(" casino"):  # Modules imported at the top level, parent packages included
+            total += int(cumulative)
+    return total / 1000
+
+
+def fastest_import_time(module: str) -> float:
+    """Imports a module REPEAT times after compiling it, returns the fastest time in milliseconds."""
+    with tempfile.TemporaryDirectory() as cache:
+        import_time(module, cache)
+        return min(import_time(module, cache) for _ in range(REPEAT))
+
+
+def main() -> None:
+    print(f"{'module':<30}{'ms':>8}{'budget':>8}")
+    over_budget = []
+    for module, budget in IMPORT_BUDGETS.items():
+        milliseconds = fastest_import_time(module)
+        print(f"{module:<30}{milliseconds:>8.1f}{budget:>8}")
+        if milliseconds > budget:
+            over_budget.append(module)
+    if over_budget:
+        sys.exit(f"Over budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark for settling bets through the balance stores.
+
+Run from the root of the project with: python -m benchmarks.bench_settlement
+"""
+import os
+import tempfile
+import time
+
+from casino.users.balances import MemoryBalanceStore, SQLiteBalanceStore
+from casino.users.users import PlayableUser
+
+SETTLEMENTS = 50000
+USERS = 100
+
+
+def settlements_per_second(store, batched: bool = False) -> float:
+    """Settles alternating wins and losses spread over USERS users, returns settlements per second."""
+    users = [PlayableUser(f"user{number}", balance=1000, store=store) for number in range(USERS)]
+    store.flush()
+    start = time.perf_counter()
+    if batched:
+        with store.batch():
+            settle(users)
+    else:
+        settle(users)
+    store.flush()
+    return SETTLEMENTS / (time.perf_counter() - start)
+
+
+def settle(users: list) -> None:
+    """Lets every user win and lose 1 in turn until SETTLEMENTS settlements are made, returns None."""
+    for number in range(SETTLEMENTS // 2):
+        user = users[number % USERS]
+        user.win_balance(1)
+        user.lose_balance(1)
+
+
+def main() -> None:
+    print(f"{'memory':<24}{settlements_per_second(MemoryBalanceStore()):>10.0f} settlements/s")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, batch_size, batched in (("sqlite, batch_size 1", 1, False), ("sqlite, batch_size 1000", 1000, False),
+                                          ("sqlite, batch()", 1, True)):
+            store = SQLiteBalanceStore(os.path.join(directory, f"{batch_size}-{batched}.db"), batch_size=batch_size)
+            print(f"{name:<24}{settlements_per_second(store, batched):>10.0f} settlements/s")
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmarks of cards, hands and complete rounds, run with pytest-benchmark.
+
+Benchmarks only run when pytest-benchmark is installed. Run them from the root of the project with:
+    python -m pytest benchmarks
+
+Baselines are kept as JSON in benchmarks/baselines, one directory per machine and Python version. Save a new
+baseline after a deliberate change in performance with:
+    python -m pytest benchmarks --benchmark-storage=benchmarks/baselines --benchmark-save=baseline
+
+Compare against the latest baseline, failing when the fastest run of any benchmark is more than 25% slower, with:
+    python -m pytest benchmarks --benchmark-storage=benchmarks/baselines --benchmark-compare \
+        --benchmark-compare-fail=min:25%
+"""
+import random
+
+import pytest
+
+from casino.games.blackjack import Blackjack, BlackjackPlayer, BlackjackHand, BET, ACTION, INSURANCE
+from casino.games.cards import DeckOfCards, Hand, Card, Suit, CardValue
+
+pytest.importorskip("pytest_benchmark")
+
+HAND_CARDS = (CardValue.ACE, CardValue.FIVE, CardValue.ACE, CardValue.THREE, CardValue.SEVEN)
+
+
+class ScriptedBlackjack(Blackjack):
+    """A game of blackjack that stands on 17, bets 1 and declines insurance every round without any output."""
+
+    def __init__(self, user: BlackjackPlayer, deck: DeckOfCards):
+        super(ScriptedBlackjack, self).__init__(user, deck)
+        self.output = None
+
+    def play_scripted_round(self) -> None:
+        decision = self.next_decision()
+        while decision is not None:
+            if decision.name == BET:
+                decision = self.apply(1)
+            elif decision.name == ACTION:
+                decision = self.apply("hit" if max(self.user.hand.value) < 17 else "stand")
+            elif decision.name == INSURANCE:
+                decision = self.apply("n")
+            else:
+                decision = self.apply("y")
+
+
+@pytest.mark.parametrize("decks", [1, 8])
+def test_deck_construction(benchmark, decks):
+    deck = benchmark(DeckOfCards, decks=decks)
+    assert len(deck.cards) == 52 * decks
+
+
+@pytest.mark.parametrize("decks", [1, 8])
+def test_shuffle_cards(benchmark, decks):
+    deck = DeckOfCards(decks=decks, rng=random.Random(0))
+    benchmark(deck.shuffle_cards)
+    assert len(deck.cards) == 52 * decks
+
+
+@pytest.mark.parametrize("decks", [1, 8])
+def test_pick_card_full_shoe(benchmark, decks):
+    deck = DeckOfCards(decks=decks, rng=random.Random(0))
+
+    def deal_shoe():
+        for _ in range(52 * decks):
+            deck.pick_card(discard=True)
+
+    benchmark.pedantic(deal_shoe, setup=deck.shuffle_cards, rounds=200)
+    assert len(deck.discarded_cards) == 52 * decks
+
+
+def test_blackjack_hand_value(benchmark):
+    cards = [Card(Suit.HEARTS, value) for value in HAND_CARDS]
+
+    def value_of_new_hand():
+        hand = BlackjackHand()
+        for card in cards:
+            hand.add_card(card)
+            hand.value
+        return hand.value
+
+    assert benchmark(value_of_new_hand) == (17,)
+
+
+def test_hand_str(benchmark):
+    hand = Hand()
+    hand.cards = [Card(Suit.SPADES, value) for value in HAND_CARDS]
+    assert benchmark(str, hand).endswith("and seven of spades")
+
+
+@pytest.mark.parametrize("decks", [1, 8])
+def test_scripted_round(benchmark, decks):
+    game = ScriptedBlackjack(BlackjackPlayer("Benchmark", balance=10 ** 9), DeckOfCards(decks=decks,
+                                                                                      rng=random.Random(0)))
+    benchmark(game.play_scripted_round)
+    assert game.round_number > 0 and not game.has_ended
+
+
+def test_roulette_settlement(benchmark):
+    numpy = pytest.importorskip("numpy")
+    from casino.games.roulette import BetLedger, bet_layout, EUROPEAN
+
+    layout = bet_layout(EUROPEAN)
+    rng = numpy.random.default_rng(0)
+    ledger = BetLedger()
+    ledger.place_many(rng.integers(0, 1000, 10000), rng.integers(0, len(layout.bets), 10000),
+                      rng.integers(100, 10000, 10000))
+    totals = benchmark(lambda: ledger.totals(ledger.settle(layout, 17), 1000))
+    assert len(totals) == 1000
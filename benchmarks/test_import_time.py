@@ -0,0 +1,19 @@
+"""Checks that importing the package and its games stays within budget, see benchmarks/bench_import.py.
+
+The budgets are wall-clock times of this machine, which slower or busy machines exceed without any regression, so
+the checks are skipped unless the environment variable CASINO_IMPORT_BUDGETS is set:
+    CASINO_IMPORT_BUDGETS=1 python -m pytest benchmarks/test_import_time.py
+"""
+import os
+
+import pytest
+
+from benchmarks.bench_import import IMPORT_BUDGETS, fastest_import_time
+
+pytestmark = pytest.mark.skipif(not os.environ.get("CASINO_IMPORT_BUDGETS"),
+                                reason="set CASINO_IMPORT_BUDGETS to check import times against their budgets")
+
+
+@pytest.mark.parametrize("module", IMPORT_BUDGETS)
+def test_import_time_within_budget(module):
+    assert fastest_import_time(module) <= IMPORT_BUDGETS[module]
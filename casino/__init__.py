@@ -0,0 +1,36 @@
+"""A casino of games played at the terminal or over the network.
+
+Importing the package is cheap: GAMES registers every game by name, and the module of a game is only imported the
+first time it is used, either as an attribute of the package like casino.blackjack or through game_class.
+"""
+import importlib
+
+GAMES = {
+    "blackjack": ("casino.games.blackjack", "Blackjack"),
+    "roulette": ("casino.games.roulette", "Roulette"),
+    "wheeloffortune": ("casino.games.wheeloffortune", "WheelOfFortune"),
+}  # Name of every game mapped to its module and Game class
+
+
+def game_class(name: str) -> type:
+    """Looks up the Game class of a registered game, importing its module on first use, returns type.
+
+    Raises:
+        ValueError: if no game is registered under the name.
+    """
+    if name not in GAMES:
+        raise ValueError(f"There is no game named {name}, choose one of {', '.join(GAMES)}.")
+    module, class_name = GAMES[name]
+    return getattr(importlib.import_module(module), class_name)
+
+
+def __getattr__(name: str):
+    if name in GAMES:
+        module = importlib.import_module(GAMES[name][0])
+        globals()[name] = module  # Later lookups find the module without calling __getattr__ again
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(GAMES))
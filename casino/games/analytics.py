@@ -0,0 +1,382 @@
+"""Streaming statistics of bankroll trajectories, computed from settlements without storing them.
+
+Every statistic takes constant memory however many rounds it consumes, and can merge the partial aggregate of
+another process, so workers each aggregate their own rounds and only send their aggregates back. All amounts are
+integer cents, like the amounts of Events.
+
+AnalyticsSink receives the events of one or more games as their EventSink and keeps a BankrollTracker per player
+of every table. A tracker adds up the SETTLE events of a round, and once the round is over adds its net win to the
+statistics of the player: the mean and variance per round, the drawdown, and per session the net win and whether
+the session would have ruined a player with a given bankroll.
+"""
+import math
+from bisect import bisect_right
+from typing import Generator, Iterable
+
+from casino.games.history import EventSink, Event, EventKind
+
+RELATIVE_ACCURACY = 0.01  # Default largest relative error of the quantiles estimated by a QuantileSketch
+
+
+class RunningStats:
+    """The count, mean, variance and range of a stream of values, updated with Welford's online algorithm.
+
+    Attributes:
+        count: Amount of values added.
+        mean: Mean of the values.
+        sum_of_squares: Sum of squared deviations from the mean, used to calculate the variance.
+        minimum: Lowest value, infinity before the first value.
+        maximum: Highest value, minus infinity before the first value.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.sum_of_squares = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def __repr__(self) -> str:
+        return f"RunningStats(count={self.count}, mean={self.mean:.5f}, variance={self.variance:.5f})"
+
+    @property
+    def variance(self) -> float:
+        """The sample variance of the values, returns float."""
+        return self.sum_of_squares / (self.count - 1) if self.count > 1 else 0.0
+
+    def add(self, value: float) -> None:
+        """Adds a single value, returns None."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.sum_of_squares += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: "RunningStats") -> None:
+        """Adds the values of another aggregate, returns None.
+
+        The variance is combined using Chan's parallel algorithm, like SimulationResult.merge.
+        """
+        count = self.count + other.count
+        if other.count == 0:
+            return None
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.sum_of_squares += other.sum_of_squares + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+class Drawdown:
+    """The largest fall of a running total from its highest point.
+
+    The trajectory starts at 0 before the first change.
+
+    Attributes:
+        total: Sum of the changes.
+        peak: Highest running total, at least 0.
+        low: Lowest running total, at most 0.
+        max_drawdown: Largest difference between a running total and the highest running total before it.
+    """
+    def __init__(self):
+        self.total = 0
+        self.peak = 0
+        self.low = 0
+        self.max_drawdown = 0
+
+    def __repr__(self) -> str:
+        return f"Drawdown(total={self.total}, peak={self.peak}, low={self.low}, max_drawdown={self.max_drawdown})"
+
+    def add(self, change: int) -> None:
+        """Moves the running total, returns None."""
+        total = self.total + change
+        self.total = total
+        if total > self.peak:
+            self.peak = total
+        elif self.peak - total > self.max_drawdown:
+            self.max_drawdown = self.peak - total
+        if total < self.low:
+            self.low = total
+
+    def merge(self, later: "Drawdown") -> None:
+        """Appends the trajectory of another aggregate, which continues where this one ends, returns None.
+
+        Merging the aggregates of consecutive parts of a trajectory in order gives the aggregate of the whole.
+        """
+        self.max_drawdown = max(self.max_drawdown, later.max_drawdown, self.peak - (self.total + later.low))
+        self.peak = max(self.peak, self.total + later.peak)
+        self.low = min(self.low, self.total + later.low)
+        self.total += later.total
+
+
+class QuantileSketch:
+    """Estimates quantiles of a stream of values within a relative error, like DDSketch.
+
+    Values are counted in buckets whose bounds grow geometrically, so the amount of buckets only depends on the
+    range of the values and the accuracy, not on the amount of values. Negative values are counted in buckets of
+    their absolute value.
+
+    Attributes:
+        relative_accuracy: Largest relative error of an estimated quantile.
+        count: Amount of values added.
+        positive: dict mapping the index of a bucket to the amount of positive values in it.
+        negative: dict mapping the index of a bucket to the amount of negative values in it.
+        zeros: Amount of values equal to 0.
+    """
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1.")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.count = 0
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+
+    def add(self, value: float) -> None:
+        """Counts a value in its bucket, returns None."""
+        self.count += 1
+        if value == 0:
+            self.zeros += 1
+            return None
+        buckets = self.positive if value > 0 else self.negative
+        index = math.ceil(math.log(abs(value)) / self._log_gamma)
+        buckets[index] = buckets.get(index, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Adds the values of another sketch, returns None.
+
+        Raises:
+            ValueError: if the sketches have a different accuracy.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged.")
+        for buckets, others in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, amount in others.items():
+                buckets[index] = buckets.get(index, 0) + amount
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, fraction: float) -> float:
+        """Estimates the value below which a fraction of the values lies, returns float.
+
+        Returns 0.0 if nothing has been added.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = fraction * (self.count - 1)
+        seen = 0
+        for value, amount in self._buckets():
+            seen += amount
+            if seen > rank:
+                break
+        return value
+
+    def _buckets(self) -> Generator[tuple, None, None]:
+        """Yields the value and the amount of values of every bucket that is not empty, in increasing order."""
+        for index in sorted(self.negative, reverse=True):  # The most negative values are in the highest buckets
+            yield -self._value(index), self.negative[index]
+        if self.zeros:
+            yield 0.0, self.zeros
+        for index in sorted(self.positive):
+            yield self._value(index), self.positive[index]
+
+    def _value(self, index: int) -> float:
+        """The value within the relative accuracy of every value of a bucket, returns float."""
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+
+class RiskOfRuin:
+    """Counts the sessions which would have ruined a player with a given bankroll.
+
+    A session ruins a bankroll if the running total of the session falls to minus the bankroll or lower at any
+    point, after which the player could not have continued.
+
+    Attributes:
+        bankrolls: The bankrolls in cents, in increasing order.
+        sessions: Amount of sessions counted.
+        ruined: Amount of sessions that ruined every bankroll, in the order of bankrolls.
+    """
+    def __init__(self, bankrolls: Iterable[int]):
+        self.bankrolls = tuple(sorted(bankrolls))
+        self.sessions = 0
+        self.ruined = [0] * len(self.bankrolls)
+
+    def add_session(self, low: int) -> None:
+        """Counts a session by the lowest running total it reached, returns None."""
+        self.sessions += 1
+        for position in range(bisect_right(self.bankrolls, -low)):  # Every bankroll up to the fall is ruined
+            self.ruined[position] += 1
+
+    def merge(self, other: "RiskOfRuin") -> None:
+        """Adds the sessions of another aggregate, returns None.
+
+        Raises:
+            ValueError: if the aggregates count different bankrolls.
+        """
+        if other.bankrolls != self.bankrolls:
+            raise ValueError("Only the risk of ruin of the same bankrolls can be merged.")
+        self.sessions += other.sessions
+        self.ruined = [ruined + others for ruined, others in zip(self.ruined, other.ruined)]
+
+    def probabilities(self) -> dict:
+        """The fraction of sessions that ruined every bankroll, returns dict mapping bankroll to float."""
+        return {bankroll: ruined / self.sessions if self.sessions else 0.0
+                for bankroll, ruined in zip(self.bankrolls, self.ruined)}
+
+
+def ruin_probability(mean: float, variance: float, bankroll: int) -> float:
+    """Estimates the chance of ever losing a bankroll when playing forever, returns float.
+
+    Uses the diffusion approximation exp(-2 * mean * bankroll / variance) for rounds with the given mean and variance
+    of the net win. A player without an edge is ruined eventually.
+    """
+    if bankroll <= 0 or mean <= 0:
+        return 1.0
+    if variance <= 0:
+        return 0.0
+    return math.exp(-2 * mean * bankroll / variance)
+
+
+class BankrollTracker:
+    """Streaming statistics of the bankroll of a single player.
+
+    Rounds are grouped into sessions. A session ends after session_rounds rounds, or when end_session is called.
+
+    Attributes:
+        session_rounds: Amount of rounds in a session, None to only end sessions with end_session.
+        rounds: RunningStats of the net win of every round.
+        drawdown: Drawdown of the whole trajectory of the player.
+        session: Drawdown of the current session.
+        session_length: Amount of rounds played in the current session.
+        sessions: QuantileSketch of the net win of every ended session.
+        ruin: RiskOfRuin of the ended sessions.
+    """
+    def __init__(self, session_rounds: int = None, bankrolls: Iterable[int] = (),
+                 relative_accuracy: float = RELATIVE_ACCURACY):
+        self.session_rounds = session_rounds
+        self.rounds = RunningStats()
+        self.drawdown = Drawdown()
+        self.session = Drawdown()
+        self.session_length = 0
+        self.sessions = QuantileSketch(relative_accuracy)
+        self.ruin = RiskOfRuin(bankrolls)
+
+    def add_round(self, net: int) -> None:
+        """Adds the net win of a round in cents, returns None."""
+        self.rounds.add(net)
+        self.drawdown.add(net)
+        self.session.add(net)
+        self.session_length += 1
+        if self.session_length == self.session_rounds:
+            self.end_session()
+
+    def end_session(self) -> None:
+        """Adds the current session to the statistics of the sessions and starts a new one, returns None.
+
+        Nothing is added if no round was played in the current session.
+        """
+        if self.session_length == 0:
+            return None
+        self.sessions.add(self.session.total)
+        self.ruin.add_session(self.session.low)
+        self.session = Drawdown()
+        self.session_length = 0
+
+    def risk_of_ruin(self, bankroll: int) -> float:
+        """Estimates the chance of ever losing a bankroll from the mean and variance per round, returns float."""
+        return ruin_probability(self.rounds.mean, self.rounds.variance, bankroll)
+
+    def merge(self, other: "BankrollTracker") -> None:
+        """Adds the statistics of the rounds that followed the rounds of this tracker, returns None.
+
+        The open session of this tracker continues with the open session of the other. Merging the trackers of
+        consecutive parts of the rounds of a player in order gives the same statistics as tracking all rounds at
+        once, as long as every part but the last ends with a session.
+
+        Raises:
+            ValueError: if the trackers use different bankrolls or accuracy.
+        """
+        self.rounds.merge(other.rounds)
+        self.drawdown.merge(other.drawdown)
+        self.sessions.merge(other.sessions)
+        self.ruin.merge(other.ruin)
+        self.session.merge(other.session)
+        self.session_length += other.session_length
+        if self.session_rounds is not None and self.session_length >= self.session_rounds:
+            self.end_session()
+
+
+class AnalyticsSink(EventSink):
+    """Tracks the bankroll of every player of one or more tables from their events.
+
+    The net wins of the SETTLE events of a player are added up until the player starts a new round, then the round
+    is added to the BankrollTracker of the player. Flushing the sink adds the rounds that are still open. Players
+    are told apart by their id at the table, which follows them when the seats are renumbered after a player
+    leaves. Tables recording no PLAYER events seat the player with the id of the seat's number.
+
+    Attributes:
+        session_rounds: Amount of rounds in a session of every tracker, None to only end sessions with end_sessions.
+        bankrolls: The bankrolls in cents the risk of ruin is counted for.
+        relative_accuracy: Largest relative error of the quantiles of the net win of sessions.
+        trackers: dict mapping (table, player id) to the BankrollTracker of the player.
+    """
+    def __init__(self, session_rounds: int = None, bankrolls: Iterable[int] = (),
+                 relative_accuracy: float = RELATIVE_ACCURACY):
+        self.session_rounds = session_rounds
+        self.bankrolls = tuple(bankrolls)
+        self.relative_accuracy = relative_accuracy
+        self.trackers = {}
+        self._open = {}  # (table, player id) mapped to [round, net win] of the round being played
+        self._players = {}  # (table, seat) mapped to the id of the player seated there, if it isn't the seat
+
+    def tracker(self, table: int, player: int) -> BankrollTracker:
+        """Finds the tracker of a player, creating it when the player is new, returns BankrollTracker."""
+        tracker = self.trackers.get((table, player))
+        if tracker is None:
+            tracker = self.trackers[table, player] = BankrollTracker(self.session_rounds, self.bankrolls,
+                                                                     self.relative_accuracy)
+        return tracker
+
+    def emit(self, event: Event) -> None:
+        if event.kind == EventKind.SETTLE:
+            key = event.table, self._players.get((event.table, event.seat), event.seat)
+            current = self._open.get(key)
+            if current is None:  # The sink was attached during the round
+                self._open[key] = [event.round, event.amount]
+            else:
+                current[1] += event.amount
+        elif event.kind == EventKind.ROUND:
+            key = event.table, self._players.get((event.table, event.seat), event.seat)
+            current = self._open.get(key)
+            if current is not None and current[0] != event.round:
+                self.tracker(*key).add_round(current[1])
+            self._open[key] = [event.round, 0]
+        elif event.kind == EventKind.PLAYER:
+            self._players[event.table, event.seat] = event.amount
+
+    def flush(self) -> None:
+        for key, (_, net) in self._open.items():
+            self.tracker(*key).add_round(net)
+        self._open.clear()
+
+    def end_sessions(self) -> None:
+        """Adds the open rounds and ends the session of every tracker, returns None."""
+        self.flush()
+        for tracker in self.trackers.values():
+            tracker.end_session()
+
+    def merge(self, other: "AnalyticsSink") -> None:
+        """Adds the trackers of another sink, whose rounds followed the rounds of this sink, returns None.
+
+        Open rounds are added before merging, so both sinks are flushed.
+        """
+        self.flush()
+        other.flush()
+        for (table, player), tracker in other.trackers.items():
+            self.tracker(table, player).merge(tracker)
+        self._players.update(other._players)
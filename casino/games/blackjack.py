@@ -1,7 +1,57 @@
-from casino.games.cards import DeckOfCards, Hand, CardValue, CardEnum
-from casino.games.game import Game
+from contextlib import ExitStack
+from typing import Generator
+
+from casino.games.cards import DeckOfCards, Hand, Card, ShufflePolicy, encode_card, decode_card
+from casino.games.game import Game, Decision
+from casino.games.history import EventSink, Event, EventKind, Action, Outcome, HOUSE_SEAT
+from casino.games.snapshot import SnapshotWriter, SnapshotReader, SnapshotKind
+from casino.users.balances import BalanceStore
+from casino.users.money import Money
 from casino.users.users import BaseUser, PlayableUser
 
+HIT = "hit"
+STAND = "stand"
+DOUBLE = "double"
+SPLIT = "split"
+SURRENDER = "surrender"
+BET = "bet"
+ACTION = "action"
+INSURANCE = "insurance"
+PLAY_AGAIN = "play again"
+HOUSE_STANDS_ON = 17  # The house draws cards until its highest value is at least this
+MAX_SEATS = 7  # Amount of players a single table can seat
+MAX_HANDS = 4  # Amount of hands a seat can play by splitting and re-splitting pairs
+
+_OPTIONAL_ACTIONS = (DOUBLE, SPLIT, SURRENDER)  # Bit i of an action mask allows _OPTIONAL_ACTIONS[i]
+_NO_MONEY = Money()
+_CLOSED = 0x80  # Added to the code of a closed card in the snapshot of a hand
+
+
+def _seat_decisions(name: str, prompt: str, options: tuple = None) -> tuple:
+    """Creates the same Decision for every seat of a table, returns tuple."""
+    return tuple(Decision(name, prompt, options, seat) for seat in range(MAX_SEATS))
+
+
+def _action_decisions() -> tuple:
+    """Creates the action Decision of every seat for every combination of allowed actions, returns tuple.
+
+    Returns:
+        Tuple indexed by seat of tuples indexed by the action mask.
+    """
+    decisions = []
+    for mask in range(1 << len(_OPTIONAL_ACTIONS)):
+        options = (HIT, STAND) + tuple(action for bit, action in enumerate(_OPTIONAL_ACTIONS) if mask >> bit & 1)
+        numbered = [f"{number}. {option}" for number, option in enumerate(options, 1)]
+        prompt = f"Do you want to {', '.join(numbered[:-1])} or {numbered[-1]}?"
+        decisions.append(_seat_decisions(ACTION, prompt, options))
+    return tuple(zip(*decisions))
+
+
+_BET_DECISIONS = _seat_decisions(BET, "Please enter the amount you want to bet.")
+_ACTION_DECISIONS = _action_decisions()
+_INSURANCE_DECISIONS = _seat_decisions(INSURANCE, "The house shows an ace, do you want insurance?[y/n]", ("y", "n"))
+_PLAY_AGAIN_DECISIONS = _seat_decisions(PLAY_AGAIN, "\nDo you want to play another round?[y/n]", ("y", "n"))
+
 
 class BaseBlackjackPlayer(BaseUser):
     """Base for both playable blackjack player and the house."""
@@ -13,118 +63,685 @@ class BaseBlackjackPlayer(BaseUser):
 class BlackjackPlayer(PlayableUser, BaseBlackjackPlayer):
     """A playable character for blackjack.
 
+    Splitting never creates hands. Every player owns a pool of MAX_HANDS hands which are cleared and reused every
+    round, hand_count of them are in play.
+
     Attributes:
         username: Name of the user.
         balance: Amount of money the player has.
+        store: The BalanceStore keeping the balance.
+        hand: The hand currently played, the first hand of the pool outside of the player's turn.
+        hands: The pool of BlackjackHands of the player.
+        hand_count: Amount of hands of the pool in play this round.
+        insurance: Amount of the insurance bet of this round.
     """
-    def __init__(self, username: str, balance: float = 100):
-        super(BlackjackPlayer, self).__init__(username=username, balance=balance)
+    def __init__(self, username: str, balance: Money = 100, store: BalanceStore = None):
+        super(BlackjackPlayer, self).__init__(username=username, balance=balance, store=store)
         self.bet = 0
+        self.hands = [self.hand] + [BlackjackHand() for _ in range(MAX_HANDS - 1)]
+        self.hand_count = 1
+        self.insurance = _NO_MONEY
+
+    @property
+    def committed(self) -> Money:
+        """The amount bet on all hands in play and insurance, returns Money."""
+        total = self.insurance
+        for hand in self.hands[:self.hand_count]:
+            total += hand.bet
+        return total
+
+    def can_afford(self, amount: Money) -> bool:
+        """Checks whether the balance covers an additional bet next to the committed bets, returns bool.
+
+        Only the bets of this player count, Blackjack.can_afford includes other seats sharing the same account.
+        """
+        return self.committed + amount <= self.balance
+
+    def reset_hands(self) -> None:
+        """Returns all hands to the pool and clears the hands played last round, returns None."""
+        for hand in self.hands[:self.hand_count]:
+            hand.clear()
+        self.hand = self.hands[0]
+        self.hand_count = 1
+        self.insurance = _NO_MONEY
+
+    def snapshot(self) -> bytes:
+        """Captures the balance, bets and hands in play of the player, returns bytes."""
+        writer = SnapshotWriter(SnapshotKind.PLAYER)
+        writer.text(self.username)
+        writer.integer(self.balance.cents)
+        writer.integer(self.bet.cents)
+        writer.integer(self.insurance.cents)
+        writer.integer(self.hands.index(self.hand))
+        writer.integer(self.hand_count)
+        for hand in self.hands[:self.hand_count]:
+            writer.blob(hand.snapshot())
+        return writer.getvalue()
+
+    @classmethod
+    def from_snapshot(cls, data: bytes) -> "BlackjackPlayer":
+        """Creates a player with the username, balance, bets and hands of a snapshot, returns BlackjackPlayer."""
+        player = cls(SnapshotReader(data, SnapshotKind.PLAYER).text())
+        player.restore(data)
+        return player
+
+    def restore(self, data: bytes, balance: bool = True) -> None:
+        """Replaces the bets and hands of the player with a snapshot, returns None.
+
+        The hands are restored into the pool of the player. The username is not restored.
+
+        Args:
+            data: The snapshot.
+            balance: Checks whether the balance is restored too. Players whose balance is kept in a BalanceStore
+                shared with other processes should keep the balance of the store.
+
+        Raises:
+            ValueError: if the data is not a snapshot of a BlackjackPlayer.
+        """
+        reader = SnapshotReader(data, SnapshotKind.PLAYER)
+        reader.text()
+        cents = reader.integer()
+        bet = Money.from_cents(reader.integer())
+        insurance = Money.from_cents(reader.integer())
+        current = reader.integer()
+        hand_count = reader.integer()
+        if not 1 <= hand_count <= MAX_HANDS or not 0 <= current < hand_count:
+            raise ValueError("Snapshot contains an invalid amount of hands")
+        hands = [reader.blob() for _ in range(hand_count)]
+        reader.finish()
+        for hand_data in hands:  # Checks every hand before the player changes
+            BlackjackHand().restore(hand_data)
+        self.reset_hands()
+        for hand, hand_data in zip(self.hands, hands):
+            hand.restore(hand_data)
+        if balance:
+            self.balance = Money.from_cents(cents)
+        self.bet = bet
+        self.insurance = insurance
+        self.hand_count = hand_count
+        self.hand = self.hands[current]
 
     @property
-    def bet(self) -> float:
+    def bet(self) -> Money:
         return self.__bet
 
     @bet.setter
-    def bet(self, amount: float) -> None:
-        """Sets the bet property, returns bool.
+    def bet(self, amount: Money) -> None:
+        """Sets the bet property, returns None.
 
         Args:
-            amount: Amount the player wishes to bet
+            amount: Amount the player wishes to bet, converted to Money.
 
-        Returns:
-            Returns True if bet was successful, False if bet amount exceeds balance.
+        Raises:
+            ValueError: if the amount is negative, exceeds the balance or can't be converted to Money.
         """
+        amount = Money(amount)
+        if amount < 0:
+            raise ValueError("Amount can't be negative.")
         if amount <= self.balance:
             self.__bet = amount
         else:
             raise ValueError("Amount exceeds balance.")
 
 
+class BlackjackBot(BlackjackPlayer):
+    """A player whose decisions are made by policies instead of a user.
+
+    Bots are seated like any player. The table answers the decisions of its bots itself, so next_decision and apply
+    only return the decisions of the other players. The policies are the same as those of HeadlessBlackjack in
+    casino.games.simulation. A bot leaves the table once its balance can't cover its next bet or it played its
+    rounds. At a table seating only bots, every call of next_decision plays a whole round.
+
+    Attributes:
+        strategy: Callable receiving the hand of the bot and the house's open card, returns the action to play or a
+            tuple of actions in order of preference, of which the first allowed action is played. The compiled
+            decision tables of casino.games.strategy are such strategies.
+        bet_policy: Callable receiving the bot, returns the amount to bet. Bets 1 by default.
+        insurance_policy: Callable receiving the hand of the bot and the house's open card, returns True to take
+            insurance. Insurance is never taken by default.
+        rounds: The amount of rounds the bot plays before leaving, None to play as long as its balance allows.
+        rounds_played: The amount of rounds the bot finished.
+    """
+    def __init__(self, username: str, strategy, balance: Money = 100, store: BalanceStore = None, bet_policy=None,
+                 insurance_policy=None, rounds: int = None):
+        super(BlackjackBot, self).__init__(username=username, balance=balance, store=store)
+        self.strategy = strategy
+        self.bet_policy = bet_policy
+        self.insurance_policy = insurance_policy
+        self.rounds = rounds
+        self.rounds_played = 0
+
+    def next_bet(self) -> Money:
+        """The amount the bot bets next round, returns Money."""
+        return Money(self.bet_policy(self)) if self.bet_policy is not None else Money(1)
+
+    def answer(self, decision: Decision, upcard: Card):
+        """Answers a decision of the seat of the bot, returns the answer.
+
+        Raises:
+            ValueError: if the strategy allows none of the options of an action decision.
+        """
+        if decision.name == ACTION:
+            preferences = self.strategy(self.hand, upcard)
+            for action in (preferences,) if isinstance(preferences, str) else preferences:
+                if action in decision.options:
+                    return action
+            raise ValueError(f"The strategy of {self.username} allows none of {decision.options}")
+        if decision.name == BET:
+            return self.next_bet()
+        if decision.name == INSURANCE:
+            insure = self.insurance_policy is not None and self.insurance_policy(self.hand, upcard)
+            return "y" if insure else "n"
+        self.rounds_played += 1
+        if self.rounds is not None and self.rounds_played >= self.rounds:
+            return "n"
+        return "y" if self.next_bet() <= self.balance else "n"
+
+
+def _hand_state(hard: int, has_ace: bool, count: int) -> int:
+    """Encodes the state of a blackjack hand as an index into the hand tables, returns int.
+
+    Args:
+        hard: Total of the open cards with aces counted as 1, capped at MAX_HAND_TOTAL.
+        has_ace: Checks whether there is an open ace in the hand.
+        count: Amount of cards in the hand, all counts above 3 share a state.
+    """
+    return (min(hard, MAX_HAND_TOTAL) * 2 + has_ace) * 4 + min(count, 3)
+
+
+def _hand_value(hard: int, has_ace: bool) -> tuple:
+    """Calculates the value of a hand from its hard total, returns tuple."""
+    values = [hard]
+    if has_ace:
+        if hard + 10 < 21:  # Ace is worth either 1 or 11 and its enum value is 1 so 10 is added
+            values.append(hard + 10)
+        if hard + 10 == 21:  # No need to return other values if blackjack
+            values = [21]
+    return tuple(values)
+
+
+MAX_HAND_TOTAL = 63  # Hard totals above this are stored as this value
+CARD_POINTS = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 14)  # Points of a card indexed by int(card)
+_SYMBOLS = len(CARD_POINTS)
+
+
+def _build_hand_tables() -> tuple:
+    """Precomputes the transitions and classification of every hand state, returns tuple.
+
+    Returns:
+        The transitions, indexed by state * len(CARD_POINTS) + int(card), followed by the values, bust flags,
+        blackjack flags and soft flags of every state.
+    """
+    states = _hand_state(MAX_HAND_TOTAL, True, 3) + 1
+    transitions = [0] * states * _SYMBOLS
+    values = [()] * states
+    is_bust = [False] * states
+    is_blackjack = [False] * states
+    is_soft = [False] * states
+    for hard in range(MAX_HAND_TOTAL + 1):
+        for has_ace in (False, True):
+            for count in range(4):
+                state = _hand_state(hard, has_ace, count)
+                values[state] = _hand_value(hard, has_ace)
+                is_bust[state] = hard > 21
+                is_blackjack[state] = has_ace and hard == 11 and count == 2
+                is_soft[state] = has_ace and hard + 10 <= 21
+                for symbol, points in enumerate(CARD_POINTS):
+                    transitions[state * _SYMBOLS + symbol] = _hand_state(hard + points, has_ace or symbol == 1,
+                                                                         count + 1)
+    return transitions, values, is_bust, is_blackjack, is_soft
+
+
+_HAND_TABLES = ("HAND_TRANSITIONS", "HAND_VALUES", "HAND_IS_BUST", "HAND_IS_BLACKJACK", "HAND_IS_SOFT")
+
+
+def _load_hand_tables() -> None:
+    """Builds the hand tables into the module the first time they are needed, returns None.
+
+    Building the tables takes longer than the rest of the import, so they are left out until the first
+    BlackjackHand is created or one of the tables is imported from the module.
+    """
+    if "HAND_TRANSITIONS" not in globals():
+        globals().update(zip(_HAND_TABLES, _build_hand_tables()))
+
+
+def __getattr__(name: str):
+    if name in _HAND_TABLES:
+        _load_hand_tables()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class BlackjackHand(Hand):
     """Overwrites the value property of Hand.
 
     Changes the value property of Hand to return multiple values if there is an ace in the hand.
+
+    The hand keeps its state as an index into the precomputed hand tables. Every new card moves the hand to a new
+    state with a single lookup in HAND_TRANSITIONS, so the value is never recalculated from all cards. Cards may be
+    appended to cards directly, but add_card avoids the check for new cards. Replacing or shrinking cards and
+    revealing the hand resets the state. The text of the hand is cached the same way, it is formatted again only
+    after cards were added, removed or revealed.
+
+    Attributes:
+        bet: Amount bet on the hand.
+        is_split: Checks whether the hand was created by splitting a pair, it can't be a blackjack then.
+        is_settled: Checks whether the bet of the hand has been settled this round.
     """
+    def __init__(self):
+        _load_hand_tables()
+        super(BlackjackHand, self).__init__()
+        self.bet = _NO_MONEY
+        self.is_split = False
+        self.is_settled = False
+
+    @property
+    def cards(self) -> list:
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards: list) -> None:
+        self._cards = cards
+        self._state = 0
+        self._counted = 0
+        self._text = None
+
+    @property
+    def state(self) -> int:
+        """The index of the hand in the hand tables, returns int."""
+        cards = self._cards
+        if len(cards) != self._counted:
+            if len(cards) < self._counted:
+                self._state = 0
+                self._counted = 0
+            state = self._state
+            for card in cards[self._counted:]:
+                state = HAND_TRANSITIONS[state * _SYMBOLS + (card.value._value_ if card.is_open else 0)]
+            self._state = state
+            self._counted = len(cards)
+        return self._state
+
     @property
     def value(self) -> tuple:
-        count = 0
-        for card in self.cards:
-            if int(card) in (11, 12, 13):
-                count += 10
-            else:
-                count += int(card)
-        values = [count]
-        if CardValue.ACE in [card.value for card in self.cards]:
-            if values[0] + 10 < 21:  # Ace is worth either 1 or 11 and its enum value is 1 so 10 is added
-                values.append(values[0] + 10)
-            if values[0] + 10 == 21:  # No need to return other values if blackjack
-                values = [21]
-        if max(values) > 21 >= min(values):
-            values = [min(values)]
-        return tuple(values)
+        return HAND_VALUES[self.state]
+
+    @property
+    def is_bust(self) -> bool:
+        """Checks whether the hand is worth more than 21, returns bool."""
+        return HAND_IS_BUST[self.state]
+
+    @property
+    def is_blackjack(self) -> bool:
+        """Checks whether the hand is an ace and a card worth 10 which was not split, returns bool."""
+        return HAND_IS_BLACKJACK[self.state] and not self.is_split
+
+    @property
+    def is_pair(self) -> bool:
+        """Checks whether the hand is two cards worth the same points, which may be split, returns bool."""
+        cards = self._cards
+        return (len(cards) == 2 and
+                CARD_POINTS[cards[0].value._value_] == CARD_POINTS[cards[1].value._value_])
+
+    @property
+    def is_soft(self) -> bool:
+        """Checks whether the hand contains an ace that can be counted as 11, returns bool."""
+        return HAND_IS_SOFT[self.state]
+
+    def __str__(self) -> str:
+        cards = self._cards
+        if self._text is None or len(cards) != self._text_count:
+            self._text = super(BlackjackHand, self).__str__()
+            self._text_count = len(cards)
+        return self._text
+
+    def add_card(self, card: Card) -> None:
+        """Adds a card to the hand and updates its state, returns None."""
+        state = self.state
+        self._cards.append(card)
+        self._state = HAND_TRANSITIONS[state * _SYMBOLS + (card.value._value_ if card.is_open else 0)]
+        self._counted += 1
+
+    def pop_card(self) -> Card:
+        """Removes the last card from the hand, returns Card."""
+        card = self._cards.pop()
+        self._state = 0
+        self._counted = 0
+        self._text = None
+        return card
+
+    def reveal_hand(self) -> None:
+        super(BlackjackHand, self).reveal_hand()
+        self._state = 0
+        self._counted = 0
+        self._text = None
+
+    def clear(self) -> None:
+        """Removes all cards and the bet, keeping the list of cards for the next round, returns None."""
+        self._cards.clear()
+        self._state = 0
+        self._counted = 0
+        self._text = None
+        self.bet = _NO_MONEY
+        self.is_split = False
+        self.is_settled = False
+
+    def snapshot(self) -> bytes:
+        """Captures the cards, including which are closed, and the bet of the hand, returns bytes."""
+        writer = SnapshotWriter(SnapshotKind.HAND)
+        writer.blob(bytes(encode_card(card) | (0 if card.is_open else _CLOSED) for card in self._cards))
+        writer.integer(self.bet.cents)
+        writer.integer(self.is_split << 1 | self.is_settled)
+        return writer.getvalue()
+
+    def restore(self, data: bytes) -> None:
+        """Replaces the cards and the bet of the hand with a snapshot, returns None.
+
+        Raises:
+            ValueError: if the data is not a snapshot of a BlackjackHand.
+        """
+        reader = SnapshotReader(data, SnapshotKind.HAND)
+        cards = [decode_card(code & ~_CLOSED, not code & _CLOSED) for code in reader.blob()]
+        bet = Money.from_cents(reader.integer())
+        flags = reader.integer()
+        reader.finish()
+        self.clear()
+        self._cards.extend(cards)
+        self.bet = bet
+        self.is_split = bool(flags & 2)
+        self.is_settled = bool(flags & 1)
 
 
 class Blackjack(Game):
     """A game of blackjack
     
+    A table seats up to MAX_SEATS players who share the deck and the house. Every round the seats bet and act in
+    seat order, the house plays its hand once for all seats and the results of all seats are applied to their
+    balances together at the end of the round. Every Decision carries the seat it belongs to.
+
+    Players may double down on any two cards, also after splitting, and split pairs of cards worth the same points
+    into up to MAX_HANDS hands. Split aces receive a single card each and can't be split again. Surrender is offered
+    on the first two cards of a hand that was not split, after the house has checked for blackjack, and returns half
+    the bet. Insurance is offered when the house shows an ace, costs half the bet and pays 2:1.
+
     Attributes:
-        user: The user currently playing the game.
+        user: The player at the first seat.
+        seats: The BlackjackPlayers seated at the table, in seat order. The decisions of BlackjackBots are answered
+            by the table itself.
         deck: Instance of DeckOfCards representing the cards the game will be played with.
         house: BaseBlackjackPlayer representing the house.
-        has_game_ending_hand: Is true if there are any game ending hands in the game.
+        has_game_ending_hand: Is true if the bets of all seats were settled before the house plays its hand.
+        shuffle_policy: ShufflePolicy deciding when the deck is shuffled, defaults to a shuffle before every round.
+        history: EventSink receiving the events of every round, None if the rounds are not recorded.
+        table_id: Id of the table in the recorded events.
+        round_number: Number of the current round, starting at 1.
+        active: Per seat, whether its bet is still open in the current round.
+        settlements: Tuples of a player and the Money they won in the current round, negative if they lost,
+            applied to the balances by settle_round.
+        leaving: The seats which answered they don't play another round, they leave once every seat answered.
+        player_ids: Per seat, the id of its player at the table. Ids are given in the order players sit down and
+            never reused, so they stay the same when seats are renumbered after a player leaves. A PLAYER event is
+            recorded whenever a player takes a seat whose number differs from their id.
     """
+    PHASES = ("reset_game", "first_deal", "get_player_action", "house_deal", "get_winner", "settle_round")
+    COUNTERS = {"deal_card": "cards_dealt", "event_shuffle": "shuffles"}
 
-    def __init__(self, user: BlackjackPlayer, deck: DeckOfCards):
+    def __init__(self, user: BlackjackPlayer, deck: DeckOfCards, shuffle_policy: ShufflePolicy = None,
+                 history: EventSink = None):
         super(Blackjack, self).__init__(user=user)
         self.user = user  # overwrite Game.user to make it of type BlackjackPlayer
+        self.seats = [user]
         self.deck = deck
+        self.shuffle_policy = shuffle_policy if shuffle_policy is not None else ShufflePolicy()
+        self.history = history
+        self.table_id = 0
+        self.round_number = 0
         self.house = BaseBlackjackPlayer("House")
         self.has_game_ending_hand = False
+        self.active = []
+        self.settlements = []
+        self.leaving = []
+        self.player_ids = [0]
+        self._next_player_id = 1
+
+    def sit(self, player: BlackjackPlayer) -> int:
+        """Seats another player at the table, returns the index of their seat.
+
+        Raises:
+            ValueError: if all seats are taken or a round is in progress.
+        """
+        if self._steps is not None:
+            raise ValueError("Players can only sit down between rounds.")
+        if len(self.seats) >= MAX_SEATS:
+            raise ValueError("The table is full.")
+        self.seats.append(player)
+        self.player_ids.append(self._next_player_id)
+        self._next_player_id += 1
+        seat = len(self.seats) - 1
+        if self.player_ids[seat] != seat:
+            self.record(EventKind.PLAYER, seat, amount=self.player_ids[seat])
+        return seat
+
+    def snapshot(self) -> bytes:
+        """Captures the deck, the seats and the state of the current round, returns bytes.
+
+        Snapshots can be taken between rounds and while the round waits for a decision. A game restored from a
+        snapshot taken during a round continues it by asking the pending decision again.
+        """
+        writer = SnapshotWriter(SnapshotKind.BLACKJACK)
+        pending = self._pending
+        writer.text(pending.name if pending is not None else "")
+        writer.integer(pending.seat if pending is not None else 0)
+        writer.integer(self.round_number)
+        writer.integer(self.table_id)
+        writer.integer(self.has_ended << 1 | self.has_game_ending_hand)
+        writer.blob(self.deck.snapshot())
+        writer.blob(self.house.hand.snapshot())
+        writer.integer(len(self.seats))
+        for player in self.seats:
+            writer.blob(player.snapshot())
+        writer.blob(bytes(self.active))
+        writer.blob(bytes(self.leaving))
+        writer.integer(len(self.settlements))
+        for player, net in self.settlements:
+            writer.integer(self.seat_of(player))
+            writer.integer(net.cents)
+        return writer.getvalue()
+
+    def restore(self, data: bytes, balances: bool = True) -> None:
+        """Replaces the deck, the seats and the current round with a snapshot, returns None.
+
+        The players seated are restored in place, seats missing at the table are taken by new players of the same
+        class as the user, extra seats are removed. Bots can't be created from a snapshot, so a table whose user is a
+        BlackjackBot needs all its seats taken before restoring. The snapshot is checked completely before the game
+        changes, an invalid snapshot leaves the game as it was.
+
+        Args:
+            data: The snapshot.
+            balances: Checks whether the balances of the players seated are restored too, see
+                BlackjackPlayer.restore.
+
+        Raises:
+            ValueError: if the data is not a snapshot of a Blackjack game, or has more seats than a table of bots.
+        """
+        reader = SnapshotReader(data, SnapshotKind.BLACKJACK)
+        name = reader.text()
+        seat = reader.integer()
+        round_number = reader.integer()
+        table_id = reader.integer()
+        flags = reader.integer()
+        deck = reader.blob()
+        house = reader.blob()
+        seats = reader.integer()
+        if not 1 <= seats <= MAX_SEATS or not 0 <= seat < seats:
+            raise ValueError("Snapshot contains an invalid amount of seats")
+        if name not in ("", BET, INSURANCE, ACTION, PLAY_AGAIN):
+            raise ValueError(f"Snapshot waits for an unknown decision {name!r}")
+        players = [reader.blob() for _ in range(seats)]
+        active = [bool(flag) for flag in reader.blob()]
+        leaving = list(reader.blob())
+        settlements = [(reader.integer(), reader.integer()) for _ in range(reader.integer())]
+        reader.finish()
+        if any(not 0 <= index < seats for index, _ in settlements):
+            raise ValueError("Snapshot settles a seat that is not taken")
+        BlackjackHand().restore(house)
+        for player_data in players[:len(self.seats)]:
+            BlackjackPlayer.from_snapshot(player_data)  # Checks the data before the players are changed
+        if seats > len(self.seats) and isinstance(self.user, BlackjackBot):
+            raise ValueError(f"The snapshot has {seats} seats, seat its bots at this table before restoring")
+        new_players = [type(self.user).from_snapshot(player_data) for player_data in players[len(self.seats):]]
+        self.deck.restore(deck)
+        self.house.hand.restore(house)
+        del self.seats[seats:]
+        for player, player_data in zip(self.seats, players):
+            player.restore(player_data, balance=balances)
+        self.seats.extend(new_players)
+        self.user = self.seats[0]
+        self.player_ids = list(range(seats))  # Ids are not captured, the restored players count as seated anew
+        self._next_player_id = seats
+        self.active = active
+        self.leaving = leaving
+        self.settlements = [(self.seats[index], Money.from_cents(cents)) for index, cents in settlements]
+        self.round_number = round_number
+        self.table_id = table_id
+        self.has_ended = bool(flags & 2)
+        self.has_game_ending_hand = bool(flags & 1)
+        self._steps = None
+        self._pending = None
+        if name:
+            self._steps = self.resume_steps(name, seat)
+            self._advance(None)
 
     def content(self) -> None:
-        super(Blackjack, self).content()
+        """Plays a single round with the users at the terminal, returns None."""
+        self.play_round()
+
+    def steps(self) -> Generator[Decision, str, None]:
         self.reset_game()
-        self.get_player_bet()
-        self.first_deal()
-        if not self.get_game_ending_hands():
-            self.get_player_action()
+        yield from self.resume_steps(BET)
+
+    def resume_steps(self, name: str, seat: int = 0) -> Generator[Decision, str, None]:
+        """Plays the rest of a round starting at the decision of a seat, yields Decision.
+
+        Every phase of a round only depends on the state of the game, not on local variables, so a round restored
+        from a snapshot continues by asking the decision it was waiting for again.
+
+        Args:
+            name: Name of the first decision, BET starts a round which has been reset.
+            seat: The seat of the first decision.
+        """
+        if name == BET:
+            yield from self.get_player_bet(seat)
+            self.first_deal()
+            name, seat = INSURANCE, 0
+        if name == INSURANCE:
+            yield from self.get_insurance(seat)
+            name, seat = ACTION if not self.get_game_ending_hands() else None, 0
+        if name == ACTION:
+            yield from self.get_player_action(seat)
             self.house_deal()
             self.get_winner()
-        self.round_end()
+        if name != PLAY_AGAIN:
+            self.settle_round()
+            seat = 0
+        yield from self.round_end(seat)
+
+    def _advance(self, answer) -> None:
+        """Resumes the round, answering the decisions of bots itself, until a user has to decide, returns None.
+
+        Raises:
+            ValueError: if a bot can't place its bet or its strategy allows none of the actions.
+        """
+        super(Blackjack, self)._advance(answer)
+        decision = self._pending
+        while decision is not None:
+            player = self.seats[decision.seat]
+            if not isinstance(player, BlackjackBot):
+                return None
+            cards = self.house.hand.cards
+            answer = player.answer(decision, cards[0] if cards else None)  # Leaves the decision pending if it fails
+            self._pending = None
+            super(Blackjack, self)._advance(answer)
+            if self._pending is decision and decision.name == BET:  # The bet was refused, asking again won't help
+                raise ValueError(f"{player.username} can't bet {player.next_bet()}")
+            decision = self._pending
+
+    def ask(self, decision: Decision) -> str:
+        """Asks the player of the seat at the terminal to make a decision, returns string."""
+        if len(self.seats) > 1 and self.output is not None:
+            self.message(f"\n{self.seats[decision.seat].username}:")
+        return super(Blackjack, self).ask(decision)
+
+    def seat_message(self, seat: int, message: str) -> None:
+        """Shows a message meant for the player of a seat, prefixed with their name at shared tables, returns None."""
+        if self.output is None:
+            return
+        if len(self.seats) > 1:
+            text = message.lstrip("\n")
+            message = f"{message[:len(message) - len(text)]}{self.seats[seat].username}: {text}"
+        self.message(message)
 
     def reset_game(self) -> None:
         """Resets all the variables in the beginning of a round, returns None."""
         self.has_game_ending_hand = False
-        self.user.hand.cards = []
-        self.house.hand.cards = []
-        self.deck.shuffle_cards()  # This shuffle includes any previously discarded cards.
-        print(len(self.deck.cards))
-
-    def get_player_bet(self) -> None:
-        """Allows user to place bets, returns None."""
-        print("Please enter the amount you want to bet.")
-        while self.user.bet == 0:
-            input_ = input(">>> ")
-            try:
-                input_ = float(input_)
-                self.user.bet = input_
-            except ValueError as e:
-                print(str(e))
-                continue
+        for player in self.seats:
+            player.reset_hands()
+        self.house.hand.clear()
+        self.active = [True] * len(self.seats)
+        self.settlements = []
+        self.leaving = []
+        self.round_number += 1
+        for seat, player in enumerate(self.seats):
+            self.record(EventKind.ROUND, seat, amount=player.balance.cents)
+        if self.shuffle_policy.new_round(self.deck):  # Returns previously discarded cards to the deck when it's time.
+            self.event_shuffle()
+        if self.output is not None:
+            self.message(str(len(self.deck.cards)))
+
+    def record(self, kind: EventKind, seat: int = 0, card: int = 0, detail: int = 0, amount: int = 0) -> None:
+        """Emits an event of the current round into the history, returns None.
+
+        Args:
+            kind: The EventKind.
+            seat: Seat the event belongs to, HOUSE_SEAT for the house.
+            card: The card involved encoded with encode_card.
+            detail: Meaning depends on the kind of the event.
+            amount: Amount of money in cents.
+        """
+        if self.history is not None:
+            self.history.emit(Event(self.round_number, self.table_id, kind, seat, card, detail, amount))
+
+    def get_player_bet(self, first_seat: int = 0) -> Generator[Decision, str, None]:
+        """Allows the seats from first_seat on to place their bet, yields Decision."""
+        for seat in range(first_seat, len(self.seats)):
+            player = self.seats[seat]
+            while player.bet == 0:
+                amount = yield _BET_DECISIONS[seat]
+                try:
+                    amount = Money(amount)
+                    if amount > 0 and not self.can_afford(seat, amount):
+                        raise ValueError("Amount exceeds the balance left after the bets at your other seats.")
+                    player.bet = amount
+                except (TypeError, ValueError) as e:
+                    self.seat_message(seat, str(e))
+                else:
+                    self.record(EventKind.BET, seat, amount=player.bet.cents)
 
     def first_deal(self) -> None:
-        """Deals cards to the user and house, returns None.
+        """Deals cards to the seats and house, returns None.
 
-        Deals two cards to player and house each. House receives one open and one closed card.
-        If cards have already been dealt this method just returns None.
+        Deals two cards to every seat and the house, one card per round of dealing. House receives one open and one
+        closed card. If cards have already been dealt this method just returns None.
         """
-        if len(self.house.hand.cards) == 0 and len(self.user.hand.cards) == 0:  # Check if cards are already dealt.
-            print(self.deal_card(self.user))
-            print(self.deal_card(self.house))
-            print(self.deal_card(self.user))
-            print(self.deal_card(self.house, is_open=False))
-            print(f"The house has: {self.house.hand.cards} totalling to {self.house.hand.value}")
+        if len(self.house.hand.cards) == 0:  # Check if cards are already dealt.
+            for player in self.seats:
+                player.hand.bet = player.bet
+                self.message(self.deal_card(player))
+            self.message(self.deal_card(self.house))
+            for player in self.seats:
+                self.message(self.deal_card(player))
+            self.message(self.deal_card(self.house, is_open=False))
+            if self.output is not None:
+                self.message(f"The house has: {self.house.hand.cards} totalling to {self.house.hand.value}")
 
     def deal_card(self, player: BaseBlackjackPlayer, is_open: bool = True) -> str:
         """Picks card from top of the deck and adds it to specified hand, returns string.
@@ -134,98 +751,318 @@ class Blackjack(Game):
             is_open: Check if card should be dealt open or closed.
 
         Returns:
-            String in format {name} received {card}.
+            String in format {name} received {card}, empty if the game is quiet.
         """
+        if not self.deck.cards:  # The seats of a table can use up the rest of the shoe within a round
+            self.deck.shuffle_cards(keep=self.cards_in_play())
+            self.event_shuffle()
         card = self.deck.pick_card(discard=True, is_open=is_open)
-        player.hand.cards.append(card)
+        player.hand.add_card(card)
+        self.record_deal(player, card)
+        if self.output is None:
+            return ""
         return f"\n{player.username} received {card}. Total is: {player.hand.value}"
 
+    def cards_in_play(self) -> int:
+        """Counts the cards dealt to the hands of the current round, returns int.
+
+        They are the most recently discarded cards of the deck, which a shuffle in the middle of a round keeps out of
+        the deck.
+        """
+        return len(self.house.hand.cards) + sum(len(hand.cards) for player in self.seats
+                                                for hand in player.hands[:player.hand_count])
+
+    def record_deal(self, player: BaseBlackjackPlayer, card: Card) -> None:
+        """Emits the event of a card dealt to a player into the history, returns None."""
+        if self.history is not None:
+            self.record(EventKind.DEAL, HOUSE_SEAT if player is self.house else self.seat_of(player),
+                        encode_card(card), int(card.is_open))
+
+    def can_afford(self, seat: int, amount: Money) -> bool:
+        """Checks whether the account of a seat covers an additional bet of the seat, returns bool.
+
+        A user may sit at several seats sharing one account, so the bets of all of them count. The bet of a seat
+        counts from the moment it is placed, before its hands are dealt.
+        """
+        player = self.seats[seat]
+        if len(self.seats) == 1:
+            return player.can_afford(amount)
+        account = player.account
+        committed = _NO_MONEY
+        for seated in self.seats:
+            if seated.account is account:
+                committed += seated.committed or seated.bet
+        return committed + amount <= account.balance
+
+    def seat_of(self, player: BlackjackPlayer) -> int:
+        """Finds the seat of a player at the table, returns int."""
+        for seat, seated in enumerate(self.seats):
+            if seated is player:
+                return seat
+        raise ValueError(f"{player.username} is not seated at the table.")
+
     def house_deal(self) -> None:
         """Deals cards to house, returns None
 
-        Deals cards to house adhering to the following rules:
+        The house plays once per round, and only if any seat is still waiting for its result. Deals cards to house
+        adhering to the following rules:
             - House stops at soft 17 or above
         """
         if not self.has_game_ending_hand:
-            while max(self.house.hand.value) < 17:
-                print(f"{self.deal_card(self.house)}")
+            while max(self.house.hand.value) < HOUSE_STANDS_ON:
+                self.message(self.deal_card(self.house))
 
-    def get_player_action(self) -> None:
-        """Asks the user which blackjack action they want to use, returns None.
+    def get_insurance(self, first_seat: int = 0) -> Generator[Decision, str, None]:
+        """Offers insurance to the seats from first_seat on when the house shows an ace, yields Decision."""
+        if self.house.hand.cards[0].value._value_ != 1:  # CardValue.ACE has a value of 1
+            return None
+        for seat in range(first_seat, len(self.seats)):
+            player = self.seats[seat]
+            amount = player.bet.payout(1, 2)
+            if self.active[seat] and amount and self.can_afford(seat, amount):
+                answer = yield _INSURANCE_DECISIONS[seat]
+                if answer == "y":
+                    player.insurance = amount
+                    self.record(EventKind.ACTION, seat, detail=Action.INSURANCE, amount=amount.cents)
 
-        Asks the player what they wants to do and then executes the corresponding method.
+    def action_decision(self, seat: int) -> Decision:
+        """Gets the Decision offering the actions allowed for the current hand of a seat, returns Decision."""
+        player = self.seats[seat]
+        hand = player.hand
+        mask = 0
+        if len(hand.cards) == 2 and self.can_afford(seat, hand.bet):
+            mask |= 1  # DOUBLE
+            if hand.is_pair and player.hand_count < MAX_HANDS:
+                mask |= 2  # SPLIT
+        if len(hand.cards) == 2 and player.hand_count == 1:
+            mask |= 4  # SURRENDER
+        return _ACTION_DECISIONS[seat][mask]
 
-        TODO:
-            Add double down action
-            Add split action
+    def get_player_action(self, first_seat: int = 0) -> Generator[Decision, str, None]:
+        """Asks the seats from first_seat on with an open bet which blackjack action they want to use, yields Decision.
+
+        Plays the hands of every seat in order, a pair that is split adds a hand which is played once the current
+        hand is finished. A hand is finished when the player stands, doubles down, surrenders or goes bust. The first
+        seat continues with its current hand. Then reveals the hand of the house if any seat is still waiting for its
+        result.
         """
-        print(f"\nYou have: {self.user.hand.cards} totalling to {self.user.hand.value}")
-        while not self.get_game_ending_hands():
-            action = self.validate_input("Do you want to 1. hit or 2. stand?", ('1', '2'))
-            if action == '1':
-                self.action_hit()
-            elif action == '2':
-                self.action_stand()
-                break
+        for seat in range(first_seat, len(self.seats)):
+            player = self.seats[seat]
+            if not self.active[seat]:
+                continue
+            index = player.hands.index(player.hand) if seat == first_seat else 0
+            while index < player.hand_count:
+                hand = player.hand = player.hands[index]
+                index += 1
+                if len(hand.cards) == 1:  # The second card of a split hand is dealt when its turn comes
+                    self.message(self.deal_card(player))
+                if self.output is not None:
+                    self.seat_message(seat, f"\nYou have: {hand.cards} totalling to {hand.value}")
+                if hand.is_split and hand.cards[0].value._value_ == 1:  # Split aces receive a single card
+                    continue
+                while True:
+                    action = yield self.action_decision(seat)
+                    if action == HIT:
+                        self.record(EventKind.ACTION, seat, detail=Action.HIT)
+                        self.action_hit(seat)
+                        if hand.is_bust:
+                            self.event_player_bust(seat)
+                            break
+                    elif action == STAND:
+                        self.record(EventKind.ACTION, seat, detail=Action.STAND)
+                        self.action_stand(seat)
+                        break
+                    elif action == DOUBLE:
+                        self.record(EventKind.ACTION, seat, detail=Action.DOUBLE, amount=hand.bet.cents)
+                        self.action_double(seat)
+                        if hand.is_bust:
+                            self.event_player_bust(seat)
+                        break
+                    elif action == SPLIT:
+                        self.record(EventKind.ACTION, seat, detail=Action.SPLIT, amount=hand.bet.cents)
+                        self.action_split(seat)
+                        index -= 1  # Play the current hand again with its new second card
+                        break
+                    elif action == SURRENDER:
+                        self.record(EventKind.ACTION, seat, detail=Action.SURRENDER)
+                        self.event_player_surrender(seat)
+                        break
+            player.hand = player.hands[0]
+        if any(self.active):
+            self.action_house_reveal()
+        else:
+            self.has_game_ending_hand = True
 
     def get_winner(self) -> None:
-        """Happens when all cards are dealt and no one has a blackjack or is bust."""
-        if not self.get_game_ending_hands():
-            if max(self.user.hand.value) > max(self.house.hand.value):  # Values above 21 are omitted
-                self.event_player_wins()
-            elif max(self.user.hand.value) == max(self.house.hand.value):
-                self.event_player_push()
-            else:
-                self.event_house_wins()
+        """Happens when all cards are dealt, settles every hand which has neither a blackjack nor is bust."""
+        if self.has_game_ending_hand:
+            return None
+        house = max(self.house.hand.value)  # Values above 21 are omitted
+        for seat, player in enumerate(self.seats):
+            if not self.active[seat]:
+                continue
+            for hand in player.hands[:player.hand_count]:
+                if hand.is_settled:
+                    continue
+                player.hand = hand
+                if self.house.hand.is_bust:
+                    self.event_house_bust(seat)
+                elif max(hand.value) > house:
+                    self.event_player_wins(seat)
+                elif max(hand.value) == house:
+                    self.event_player_push(seat)
+                else:
+                    self.event_house_wins(seat)
+            player.hand = player.hands[0]
 
     def get_game_ending_hands(self) -> bool:
-        """Checks for the different kinds of hands the player and house has, returns bool.
+        """Checks for blackjacks after the first deal and settles the seats they decide, returns bool.
 
         Returns:
-            True if there are any game-ending hands, false if the game continues as usually.
-            Game ending hands are if someone has either blackjack or has gone bust.
+            True if the bets of all seats are settled, false if the game continues as usually.
+            A blackjack of the house settles every seat, the blackjack of a player only their own seat.
         """
-        end = False
-        if 10 in self.house.hand.value:  # Check if house's first card is a 10
-            if self.action_peek_cards() == 1:  # Peek the card to check for and ace. CardValue.ACE has a value of 1
-                self.event_house_blackjack()
-                end = True
-        elif 11 in self.house.hand.value:  # Check if house's first card is an ace
-            if self.action_peek_cards() in (10, 11, 12, 13):  # TEN, JACK, QUEEN, KING in respective order
-                self.event_house_blackjack()
-                end = True
-        elif min(self.house.hand.value) > 21:  # Check if house has gone bust
-            self.event_house_bust()
-            end = True
-        elif max(self.user.hand.value) == 21:  # Check for player blackjack
-            self.event_player_blackjack()
-            end = True
-        elif min(self.user.hand.value) > 21:  # Check if player has gone bust
-            self.event_player_bust()
-            end = True
-        self.has_game_ending_hand = end
-        return end
-
-    def round_end(self) -> None:
-        """Asks user if the game should be ended or not, returns None."""
-        input_ = self.validate_input("\nDo you want to play another round?[y/n]", ("y", "n"))
-        if input_ == "n":
-            self.has_ended = True
+        # Check if house's first card is a 10 and peek the card to check for an ace. CardValue.ACE has a value of 1
+        # or if house's first card is an ace and peek for TEN, JACK, QUEEN or KING
+        house_blackjack = ((10 in self.house.hand.value and self.action_peek_cards() == 1)
+                           or (11 in self.house.hand.value and self.action_peek_cards() in (10, 11, 12, 13)))
+        for seat, player in enumerate(self.seats):
+            if player.insurance:
+                self.event_insurance(seat, house_blackjack)
+        if house_blackjack:
+            for seat in range(len(self.seats)):
+                if self.active[seat]:
+                    self.event_house_blackjack(seat)
         else:
-            self.user.bet = 0
+            for seat, player in enumerate(self.seats):
+                if self.active[seat] and player.hand.is_blackjack:  # Check for player blackjack
+                    self.event_player_blackjack(seat)
+        self.has_game_ending_hand = not any(self.active)
+        return self.has_game_ending_hand
+
+    def settle(self, seat: int, outcome: Outcome, net: Money) -> None:
+        """Closes the bet of the current hand of a seat, returns None.
+
+        The seat stays active until all its hands are settled. The balance changes once all seats are settled, in
+        settle_round.
+
+        Args:
+            seat: The seat of the hand.
+            outcome: The Outcome recorded in the history.
+            net: The Money the player won, negative if they lost.
+        """
+        player = self.seats[seat]
+        player.hand.is_settled = True
+        if player.hand_count == 1:
+            self.active[seat] = False
+        else:
+            self.active[seat] = not all(hand.is_settled for hand in player.hands[:player.hand_count])
+        if net:
+            self.settlements.append((player, net))
+        self.record(EventKind.SETTLE, seat, detail=outcome, amount=net.cents)
+
+    def settle_round(self) -> None:
+        """Applies the results of all seats to their balances, returns None.
 
-    def action_hit(self) -> None:
-        """Activates when user chooses hit, returns None."""
-        print(self.deal_card(self.user))
+        The settlements of every BalanceStore are written in a single batch. Winnings are credited before losses are
+        debited, so a player sitting at multiple seats never fails a debit their winnings cover. The batch is all or
+        nothing: if a balance can't cover the losses of its seats, no balance changes, and if a debit fails anyway
+        the settlements already applied are reversed. The settlements are only cleared once all were applied.
+
+        Raises:
+            ValueError: if the balance of a player is lower than their losses this round.
+        """
+        settlements = self.settlements
+        if len(settlements) == 1:
+            self._pay(*settlements[0])
+            self.settlements = []
+            return None
+        totals = {}
+        for player, net in settlements:
+            totals[id(player.account)] = totals.get(id(player.account), player.balance) + net
+        if any(total < 0 for total in totals.values()):
+            raise ValueError("User balance is too low")
+        settlements.sort(key=lambda settlement: settlement[1] < 0)
+        paid = 0
+        with ExitStack() as batches:
+            for store in {id(player.store): player.store for player, _ in settlements}.values():
+                batches.enter_context(store.batch())
+            try:
+                for player, net in settlements:
+                    self._pay(player, net)
+                    paid += 1
+            except ValueError:
+                for player, net in reversed(settlements[:paid]):  # Another process spent the balance meanwhile
+                    player.store.credit(player.account, -net)
+                raise
+        self.settlements = []
+
+    @staticmethod
+    def _pay(player: BlackjackPlayer, net: Money) -> None:
+        """Credits or debits the net result of a round to a player, returns None."""
+        if net > 0:
+            player.win_balance(net)
+        else:
+            player.lose_balance(-net)
+
+    def round_end(self, first_seat: int = 0) -> Generator[Decision, str, None]:
+        """Asks the seats from first_seat on if they play another round, yields Decision.
+
+        Players answering no leave the table after the round, the game ends when the last player leaves.
+        """
+        leaving = self.leaving
+        for seat in range(first_seat, len(self.seats)):
+            answer = yield _PLAY_AGAIN_DECISIONS[seat]
+            if answer == "n":
+                leaving.append(seat)
+            else:
+                self.seats[seat].bet = 0
+        if len(leaving) == len(self.seats):
+            self.has_ended = True
+        elif leaving:
+            self.seats = [player for seat, player in enumerate(self.seats) if seat not in leaving]
+            self.player_ids = [player_id for seat, player_id in enumerate(self.player_ids) if seat not in leaving]
+            self.user = self.seats[0]
+            for seat in range(leaving[0], len(self.seats)):  # Seats before the first leaving seat keep their number
+                self.record(EventKind.PLAYER, seat, amount=self.player_ids[seat])
 
-    def action_stand(self) -> None:
-        """Activates when user chooses to stand, returns None."""
-        self.action_house_reveal()
+    def action_hit(self, seat: int = 0) -> None:
+        """Activates when the player of a seat chooses hit, returns None."""
+        self.message(self.deal_card(self.seats[seat]))
+
+    def action_stand(self, seat: int = 0) -> None:
+        """Activates when the player of a seat chooses to stand, returns None."""
+        return None
+
+    def action_double(self, seat: int = 0) -> None:
+        """Activates when the player of a seat doubles down, doubling the bet for a single card, returns None."""
+        hand = self.seats[seat].hand
+        hand.bet += hand.bet
+        self.message(self.deal_card(self.seats[seat]))
+
+    def action_split(self, seat: int = 0) -> None:
+        """Activates when the player of a seat splits a pair, returns None.
+
+        The second card moves to the next hand of the pool with the same bet, both hands receive a new second card
+        when they are played.
+        """
+        player = self.seats[seat]
+        hand = player.hand
+        split = player.hands[player.hand_count]
+        player.hand_count += 1
+        card = hand.pop_card()
+        split.add_card(card)
+        split.bet = hand.bet
+        split.is_split = hand.is_split = True
+        self.seat_message(seat, f"You split your {card.value.name.lower()}s into {player.hand_count} hands")
 
     def action_house_reveal(self) -> None:
         """Reveals cards in house_hand, returns None."""
         self.house.hand.reveal_hand()
-        print(f"\nThe house reveals their hand containing: {self.house.hand}, totalling to {self.house.hand.value}")
+        self.record(EventKind.REVEAL, HOUSE_SEAT)
+        if self.output is not None:
+            self.message(f"\nThe house reveals their hand containing: {self.house.hand}, "
+                         f"totalling to {self.house.hand.value}")
 
     def action_peek_cards(self) -> int:
         """Gets the value of a closed card, returns int."""
@@ -233,41 +1070,74 @@ class Blackjack(Game):
             if not card.is_open:
                 return int(card.value)
 
-    def event_house_blackjack(self) -> None:
+    def event_shuffle(self) -> None:
+        """Event for when the discarded cards have been shuffled back into the deck, returns None."""
+        self.record(EventKind.SHUFFLE)
+
+    def event_insurance(self, seat: int, house_blackjack: bool) -> None:
+        """Event for when the insurance bet of a seat is settled by the house peeking, returns None.
+
+        Insurance pays 2:1 if the house has blackjack.
+        """
+        player = self.seats[seat]
+        if house_blackjack:
+            net = player.insurance + player.insurance
+            self.seat_message(seat, f"Your insurance pays: {net}")
+        else:
+            net = -player.insurance
+            self.seat_message(seat, f"The house has no blackjack, your insurance of {player.insurance} is lost")
+        self.settlements.append((player, net))
+        self.record(EventKind.SETTLE, seat, detail=Outcome.INSURANCE, amount=net.cents)
+
+    def event_player_surrender(self, seat: int = 0) -> None:
+        """Event for when the player of a seat surrenders, returns None.
+
+        Half of the bet, rounded down to the cent, is returned.
+        """
+        bet = self.seats[seat].hand.bet
+        returned = bet.payout(1, 2)
+        self.seat_message(seat, f"You surrender, {returned} of your bet is returned")
+        self.settle(seat, Outcome.SURRENDER, returned - bet)
+
+    def event_house_blackjack(self, seat: int = 0) -> None:
         """Event for when house has blackjack, returns None."""
-        if 21 in self.user.hand.value:
-            self.event_player_push()
+        if self.seats[seat].hand.is_blackjack:
+            self.event_player_push(seat)
         else:
-            print("The house has blackjack")
-            self.event_house_wins()
-
-    def event_player_blackjack(self) -> None:
-        """Event for when user has blackjack, returns None."""
-        win_amount = self.user.bet + 1.5
-        print("Congratulations, you win:", win_amount)
-        self.user.win_balance(win_amount)
-
-    def event_player_wins(self) -> None:
-        """Event for when user wins, returns None."""
-        win_amount = self.user.bet
-        print("Congratulations, you win:", win_amount)
-        self.user.win_balance(self.user.bet)
-
-    def event_house_wins(self) -> None:
-        """Event for when house wins, returns None."""
-        print("You lose")
-        self.user.lose_balance(self.user.bet)
-
-    def event_player_push(self) -> None:
-        """Event for when player and house have the same value hand, returns None."""
-        print(f"You got a push, your bet of {self.user.bet} is returned")
-
-    def event_house_bust(self) -> None:
+            self.seat_message(seat, "The house has blackjack")
+            self.event_house_wins(seat)
+
+    def event_player_blackjack(self, seat: int = 0) -> None:
+        """Event for when the player of a seat has blackjack, returns None.
+
+        Blackjack pays 3:2, rounded down to the cent.
+        """
+        win_amount = self.seats[seat].hand.bet.payout(3, 2)
+        self.seat_message(seat, f"Congratulations, you win: {win_amount}")
+        self.settle(seat, Outcome.BLACKJACK, win_amount)
+
+    def event_player_wins(self, seat: int = 0) -> None:
+        """Event for when the player of a seat wins, returns None."""
+        win_amount = self.seats[seat].hand.bet
+        self.seat_message(seat, f"Congratulations, you win: {win_amount}")
+        self.settle(seat, Outcome.WIN, win_amount)
+
+    def event_house_wins(self, seat: int = 0) -> None:
+        """Event for when house wins against a seat, returns None."""
+        self.seat_message(seat, "You lose")
+        self.settle(seat, Outcome.LOSS, -self.seats[seat].hand.bet)
+
+    def event_player_push(self, seat: int = 0) -> None:
+        """Event for when the player of a seat and house have the same value hand, returns None."""
+        self.seat_message(seat, f"You got a push, your bet of {self.seats[seat].hand.bet} is returned")
+        self.settle(seat, Outcome.PUSH, Money())
+
+    def event_house_bust(self, seat: int = 0) -> None:
         """Event for when house goes bust, returns None."""
-        print(f"The house's hand contains {min(self.house.hand.value)}, they're bust")
-        self.event_player_wins()
+        self.seat_message(seat, f"The house's hand contains {min(self.house.hand.value)}, they're bust")
+        self.event_player_wins(seat)
 
-    def event_player_bust(self) -> None:
-        """Event for when player goes bust, returns None."""
-        print(f"Your hand contains {min(self.user.hand.value)}, you're bust")
-        self.event_house_wins()
+    def event_player_bust(self, seat: int = 0) -> None:
+        """Event for when the player of a seat goes bust, returns None."""
+        self.seat_message(seat, f"Your hand contains {min(self.seats[seat].hand.value)}, you're bust")
+        self.event_house_wins(seat)
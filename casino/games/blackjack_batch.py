@@ -0,0 +1,99 @@
+"""Vectorized evaluation of many blackjack hands at once.
+
+Hands are given as 2-D integer arrays with one hand per row and the int() of every card (1 for ACE up to 13 for
+KING) in the columns. Empty slots are 0, so hands of different sizes fit in one array. The results match
+BlackjackHand.value for every hand with a hard total up to MAX_HAND_TOTAL.
+
+This module requires numpy, which can be installed with the numpy extra of the package.
+"""
+import numpy as np
+
+from casino.games.blackjack import CARD_POINTS, HOUSE_STANDS_ON
+
+_POINTS = np.array(CARD_POINTS, dtype=np.int16)
+
+
+class BatchHandValues:
+    """The values of a batch of blackjack hands.
+
+    min_value and max_value are the smallest and largest item of the tuple BlackjackHand.value returns for the
+    same hand, they are equal if the value is a single number.
+
+    Attributes:
+        hard: Total of every hand with aces counted as 1.
+        min_value: Lowest value of every hand.
+        max_value: Highest value of every hand that does not exceed 21, or the hard total if the hand is bust.
+        is_soft: Mask of hands with an ace that can be counted as 11.
+        is_bust: Mask of hands worth more than 21.
+        is_blackjack: Mask of hands consisting of an ace and a card worth 10.
+    """
+    def __init__(self, ranks: np.ndarray):
+        ranks = np.asarray(ranks)
+        if ranks.ndim != 2:
+            raise ValueError("ranks must be a 2-D array with one hand per row")
+        self.hard = np.zeros(len(ranks), dtype=np.int16)
+        has_ace = np.zeros(len(ranks), dtype=bool)
+        count = np.zeros(len(ranks), dtype=np.int16)
+        # Hands have few cards, so accumulating column by column is faster than reducing along the rows.
+        for column in np.ascontiguousarray(ranks.T, dtype=np.uint8):
+            self.hard += _POINTS[column]
+            has_ace |= column == 1
+            count += column != 0
+        soft_total = self.hard + 10
+        self.is_soft = has_ace & (soft_total <= 21)
+        self.min_value = np.where(has_ace & (soft_total == 21), 21, self.hard)
+        self.max_value = np.where(self.is_soft, soft_total, self.hard)
+        self.is_bust = self.hard > 21
+        self.is_blackjack = has_ace & (self.hard == 11) & (count == 2)
+
+    def __len__(self) -> int:
+        return len(self.hard)
+
+
+def evaluate_hands(ranks: np.ndarray) -> BatchHandValues:
+    """Calculates the values of a batch of hands, returns BatchHandValues.
+
+    Args:
+        ranks: 2-D array with one hand per row, empty slots are 0.
+    """
+    return BatchHandValues(ranks)
+
+
+def house_play(ranks: np.ndarray, draws: np.ndarray) -> tuple:
+    """Plays out a batch of house hands by the rules of Blackjack.house_deal, returns tuple.
+
+    Every house draws cards from its row of draws, in order, until its highest value is at least 17. The house
+    therefore stands on soft 17.
+
+    Args:
+        ranks: 2-D array with the cards the house holds before drawing, one hand per row.
+        draws: 2-D array with the cards every house draws from, one row per hand in ranks.
+
+    Returns:
+        A tuple of the final BatchHandValues and an array with the amount of cards every house drew.
+
+    Raises:
+        ValueError: if a house still has to draw after its row of draws is used up.
+    """
+    ranks = np.asarray(ranks)
+    draws = np.asarray(draws)
+    if len(ranks) != len(draws):
+        raise ValueError("ranks and draws must have the same amount of rows")
+    values = BatchHandValues(ranks)
+    hard = values.hard.copy()
+    has_ace = (ranks == 1).any(axis=1)
+    drawn = np.zeros(len(ranks), dtype=np.int16)
+    active = np.where(values.is_soft, hard + 10, hard) < HOUSE_STANDS_ON
+    for column in range(draws.shape[1]):
+        if not active.any():
+            break
+        card = np.where(active, draws[:, column], 0)
+        hard += _POINTS[card]
+        has_ace |= card == 1
+        drawn += active
+        active = np.where(has_ace & (hard + 10 <= 21), hard + 10, hard) < HOUSE_STANDS_ON
+    if active.any():
+        raise ValueError("Not enough cards in draws to finish every house hand")
+    columns = np.arange(draws.shape[1])
+    final = np.concatenate((ranks, np.where(columns < drawn[:, None], draws, 0)), axis=1)
+    return BatchHandValues(final), drawn
@@ -1,10 +1,13 @@
-from random import shuffle, randint
+import random
+from array import array
 from enum import Enum
 
+from casino.games.snapshot import SnapshotWriter, SnapshotReader, SnapshotKind
+
 
 class CardEnum(Enum):
     def __str__(self) -> str:
-        return self.name.lower()
+        return self._label
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -38,6 +41,23 @@ class CardValue(CardEnum):
     JOKER = 14
 
 
+for _member in (*Suit, *CardValue):
+    _member._label = _member.name.lower()  # Names are formatted once instead of on every str()
+del _member
+
+
+def _card_names() -> list:
+    """Formats the name of every open card, returns list indexed by the code of encode_card."""
+    names = [""] * 256
+    for suit in Suit:
+        for value in CardValue:
+            names[int(suit) << 4 | int(value)] = str(value) if suit == Suit.JOKER else f"{value} of {suit}"
+    return names
+
+
+CARD_NAMES = _card_names()
+
+
 class Card:
     """A class to simulate the properties of real life playing deck.
     
@@ -46,6 +66,8 @@ class Card:
         value: A CardValue instance representing the value of the card.
         is_open: Checks whether the card is faced up (open) or faced down (closed/hidden).
     """
+    __slots__ = ("suit", "value", "is_open")
+
     def __init__(self, suit: Suit, value: CardValue, is_open: bool = True):
         self.suit = suit
         self.value = value
@@ -53,13 +75,8 @@ class Card:
             
     def __str__(self) -> str:
         if self.is_open:
-            if self.suit == Suit.JOKER:
-                _str = f"{self.value}"
-            else:
-                _str = f"{self.value} of {self.suit}"
-        else:
-            _str = "hidden"
-        return _str
+            return CARD_NAMES[self.suit._value_ << 4 | self.value._value_]
+        return "hidden"
     
     def __repr__(self) -> str:
         return self.__str__()
@@ -78,16 +95,12 @@ class Hand:
         self.cards = []
 
     def __str__(self) -> str:
-        len_cards = len(self.cards)
-        if len_cards == 0:
-            str_ = "nothing"
-        elif len_cards == 1:
-            str_ = str(self.cards[0])
-        elif len_cards == 2:
-            str_ = " and ".join([str(card) for card in self.cards])
-        else:
-            str_ = ", ".join([str(card) for card in self.cards[:-1]]) + " and " + str(self.cards[-1])
-        return str_
+        names = list(map(str, self.cards))
+        if len(names) == 0:
+            return "nothing"
+        if len(names) == 1:
+            return names[0]
+        return ", ".join(names[:-1]) + " and " + names[-1]
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -107,57 +120,391 @@ class Hand:
 
 
 class DeckOfCards:
-    """A deck of deck containing multiple deck.
-    
+    """A deck of cards containing one or more decks.
+
+    The top of the deck is the last card in cards, so dealing and discarding only append to and pop from the end
+    of a list.
+
     Attributes:
-        deck[Card]: A list of Card objects contained within the deck.
+        cards[Card]: A list of Card objects contained within the deck, the top card is the last one.
         discarded_cards[*Card]: A list of Card objects no longer in the active card pool.
+        decks: Amount of decks of 52 cards, plus jokers if requested, in the deck.
         jokers: Checks whether the deck contains joker deck or not.
+        rng: The random number generator used to shuffle and pick cards, defaults to a new unseeded generator.
+        tracker: The ShoeTracker following the cards dealt from the deck, None if the deck is not tracked.
+        is_shuffled: Checks whether the deck has been shuffled since it was created in factory order. A restored
+            deck counts as shuffled.
     """
-    def __init__(self, jokers: bool = False):
+    def __init__(self, jokers: bool = False, rng: random.Random = None, decks: int = 1):
+        self.rng = rng if rng is not None else random.Random()
+        self.decks = decks
+        self.tracker = None
+        self.is_shuffled = False
         self.cards = []
         self.discarded_cards = []
-        #  Add normal deck to deck, skip all jokers
-        for suit in Suit:
-            if suit != Suit.JOKER:
-                for value in CardValue:
-                    if value != CardValue.JOKER:
-                        self.cards.append(Card(suit, value))
-        #  Add 2 jokers to deck
-        if jokers:
-            self.cards.append(Card(Suit.JOKER, CardValue.JOKER))
-            self.cards.append(Card(Suit.JOKER, CardValue.JOKER))
-        self._deck_length = len(self.cards)
-                
+        for _ in range(decks):
+            #  Add normal deck to deck, skip all jokers
+            for suit in Suit:
+                if suit != Suit.JOKER:
+                    for value in CardValue:
+                        if value != CardValue.JOKER:
+                            self.cards.append(Card(suit, value))
+            #  Add 2 jokers to deck
+            if jokers:
+                self.cards.append(Card(Suit.JOKER, CardValue.JOKER))
+                self.cards.append(Card(Suit.JOKER, CardValue.JOKER))
+        self.cards.reverse()  # The first card of a new deck is on top.
+
     def show_cards(self) -> str:
         """Return a string with the deck in current order."""
         return f'This deck contains {self.cards}'
     
-    def shuffle_cards(self, include_discarded: bool = True) -> None:
+    def shuffle_cards(self, include_discarded: bool = True, keep: int = 0) -> None:
         """Shuffle the list of deck contained in the deck, return None.
         
         Args:
             include_discarded: Include discarded deck into shuffle thus returning them to deck.
+            keep: Amount of the most recently discarded cards that stay discarded, e.g. the cards on the table.
         """
         if include_discarded:
-            self.cards.extend(self.discarded_cards)
-            self.discarded_cards.clear()
-        shuffle(self.cards)
-    
+            returned = len(self.discarded_cards) - keep if keep > 0 else len(self.discarded_cards)
+            self.cards.extend(self.discarded_cards[:returned])
+            del self.discarded_cards[:returned]
+            if self.tracker is not None:
+                self.tracker.reset()
+        self.rng.shuffle(self.cards)
+        self.is_shuffled = True
+
+    def reinsert_discarded(self) -> None:
+        """Returns the discarded cards to the deck at random positions, return None.
+
+        Every discarded card swaps places with a random card of the deck, so returning a card takes constant time
+        instead of a shuffle of the whole deck.
+        """
+        cards = self.cards
+        randrange = self.rng.randrange
+        for card in self.discarded_cards:
+            cards.append(card)
+            index = randrange(len(cards))
+            cards[-1], cards[index] = cards[index], card
+        self.discarded_cards.clear()
+        if self.tracker is not None:
+            self.tracker.reset()
+
+    @property
+    def penetration(self) -> float:
+        """The fraction of the cards that has been dealt since the last shuffle, returns float."""
+        total = len(self.cards) + len(self.discarded_cards)
+        return len(self.discarded_cards) / total if total else 0.0
+
+    def snapshot(self) -> bytes:
+        """Captures the order of the cards, the discarded cards and the state of rng, returns bytes."""
+        writer = SnapshotWriter(SnapshotKind.DECK)
+        writer.integer(self.decks)
+        writer.blob(bytes([card.suit._value_ << 4 | card.value._value_ for card in self.cards]))
+        writer.blob(bytes([card.suit._value_ << 4 | card.value._value_ for card in self.discarded_cards]))
+        writer.random_state(self.rng)
+        return writer.getvalue()
+
+    def restore(self, data: bytes) -> None:
+        """Replaces the cards, the discarded cards and the state of rng with a snapshot, returns None.
+
+        Raises:
+            ValueError: if the data is not a snapshot of a DeckOfCards.
+        """
+        reader = SnapshotReader(data, SnapshotKind.DECK)
+        decks = reader.integer()
+        cards = [decode_card(code) for code in reader.blob()]
+        discarded_cards = [decode_card(code) for code in reader.blob()]
+        state = reader.random_state()
+        reader.finish()
+        self.decks = decks
+        self.cards = cards
+        self.discarded_cards = discarded_cards
+        self.rng.setstate(state)
+        self.is_shuffled = True
+        if self.tracker is not None:
+            self.tracker.reset()
+
     def pick_card(self, discard: bool = False, is_open: bool = True, random: bool = False) -> Card:
-        """Pick card from top of the deck (index = 0), return Card.
-        
+        """Pick card from top of the deck (index = -1), return Card.
+
+        Picking a card takes constant time. A randomly picked card that is discarded is replaced by the top card.
+
         Args: 
             discard: Remove card from deck into discarded_cards if true, default False.
             is_open: Checks whether the card should be dealt face up (open).
             random: Checks whether a random card should be selected rather than the top one.
         """
-        _card = self.cards[randint(0, self._deck_length - 1)] if random is True else self.cards[0]
-        if is_open:
-            _card.is_open = True
+        cards = self.cards
+        if random is True:
+            index = self.rng.randrange(len(cards))
+            _card = cards[index]
+            if discard:
+                cards[index] = cards[-1]
+                cards.pop()
         else:
-            _card.is_open = False
+            _card = cards.pop() if discard else cards[-1]
+        _card.is_open = is_open
         if discard:
             self.discarded_cards.append(_card)
-            self.cards.remove(_card)
+            if self.tracker is not None:
+                self.tracker.remove(_card.suit._value_, _card.value._value_)
         return _card
+
+
+_SUITS = {int(suit): suit for suit in Suit}
+_CARD_VALUES = {int(value): value for value in CardValue}
+_CARD_CODES = frozenset(suit << 4 | value for suit in _SUITS for value in _CARD_VALUES)
+
+
+def encode_card(card: Card) -> int:
+    """Encodes a card into a single byte, returns int.
+
+    The suit is stored in the high nibble and the value in the low nibble.
+    """
+    return int(card.suit) << 4 | int(card.value)
+
+
+def decode_card(code: int, is_open: bool = True) -> Card:
+    """Creates the Card encoded by encode_card, returns Card.
+
+    Raises:
+        ValueError: if code is not the code of a card.
+    """
+    try:
+        return Card(_SUITS[code >> 4], _CARD_VALUES[code & 15], is_open)
+    except KeyError:
+        raise ValueError(f"{code} is not the code of a card") from None
+
+
+def check_card_codes(codes: bytes) -> None:
+    """Checks that every byte is the code of a card, returns None.
+
+    Raises:
+        ValueError: if a byte is not the code of a card.
+    """
+    invalid = set(codes) - _CARD_CODES
+    if invalid:
+        raise ValueError(f"{min(invalid)} is not the code of a card")
+
+
+class CardView:
+    """A read-only sequence of Card objects which are only created when they are accessed.
+
+    Attributes:
+        codes: The encoded cards viewed.
+    """
+    __slots__ = ("codes",)
+
+    def __init__(self, codes: array):
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [decode_card(code) for code in self.codes[index]]
+        return decode_card(self.codes[index])
+
+    def __iter__(self):
+        return map(decode_card, self.codes)
+
+    def __str__(self) -> str:
+        return str(list(self))
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class CompactShoe:
+    """A shoe of one or more decks which stores every card as a single byte.
+
+    CompactShoe can be used in place of DeckOfCards. Card objects are only created when a card is picked or when
+    the cards are viewed, which makes a shoe take a few hundred bytes instead of a few hundred objects. The top of
+    the shoe is the last card, so cards are dealt by popping from the end of an array.
+
+    Attributes:
+        codes: Array of the encoded cards in the shoe.
+        discarded_codes: Array of the encoded cards no longer in the active card pool.
+        decks: Amount of decks in the shoe.
+        jokers: Checks whether every deck contains 2 jokers.
+        rng: The random number generator used to shuffle and pick cards, defaults to a new unseeded generator.
+        tracker: The ShoeTracker following the cards dealt from the shoe, None if the shoe is not tracked.
+        is_shuffled: Checks whether the shoe has been shuffled since it was created in factory order. A restored
+            shoe counts as shuffled.
+    """
+    def __init__(self, decks: int = 1, jokers: bool = False, rng: random.Random = None):
+        self.decks = decks
+        self.jokers = jokers
+        self.rng = rng if rng is not None else random.Random()
+        self.tracker = None
+        self.is_shuffled = False
+        deck = [int(suit) << 4 | int(value) for suit in Suit if suit != Suit.JOKER
+                for value in CardValue if value != CardValue.JOKER]
+        if jokers:
+            deck += [int(Suit.JOKER) << 4 | int(CardValue.JOKER)] * 2
+        deck.reverse()  # The first card of a new deck is on top.
+        self.codes = array("B", deck * decks)
+        self.discarded_codes = array("B")
+
+    @property
+    def cards(self) -> CardView:
+        """The cards in the shoe in current order, the top card is the last one, returns CardView."""
+        return CardView(self.codes)
+
+    @property
+    def discarded_cards(self) -> CardView:
+        """The cards no longer in the active card pool, returns CardView."""
+        return CardView(self.discarded_codes)
+
+    def show_cards(self) -> str:
+        """Return a string with the shoe in current order."""
+        return f'This shoe contains {self.cards}'
+
+    def shuffle_cards(self, include_discarded: bool = True, keep: int = 0) -> None:
+        """Shuffle the cards in the shoe, return None.
+
+        Args:
+            include_discarded: Include discarded cards into shuffle thus returning them to the shoe.
+            keep: Amount of the most recently discarded cards that stay discarded, e.g. the cards on the table.
+        """
+        if include_discarded:
+            returned = len(self.discarded_codes) - keep if keep > 0 else len(self.discarded_codes)
+            self.codes.extend(self.discarded_codes[:returned])
+            del self.discarded_codes[:returned]
+            if self.tracker is not None:
+                self.tracker.reset()
+        self.rng.shuffle(self.codes)
+        self.is_shuffled = True
+
+    def reinsert_discarded(self) -> None:
+        """Returns the discarded cards to the shoe at random positions, return None.
+
+        Every discarded card swaps places with a random card of the shoe, so returning a card takes constant time
+        instead of a shuffle of the whole shoe.
+        """
+        codes = self.codes
+        randrange = self.rng.randrange
+        for code in self.discarded_codes:
+            codes.append(code)
+            index = randrange(len(codes))
+            codes[-1], codes[index] = codes[index], code
+        del self.discarded_codes[:]
+        if self.tracker is not None:
+            self.tracker.reset()
+
+    @property
+    def penetration(self) -> float:
+        """The fraction of the cards that has been dealt since the last shuffle, returns float."""
+        total = len(self.codes) + len(self.discarded_codes)
+        return len(self.discarded_codes) / total if total else 0.0
+
+    def snapshot(self) -> bytes:
+        """Captures the order of the cards, the discarded cards and the state of rng, returns bytes."""
+        writer = SnapshotWriter(SnapshotKind.SHOE)
+        writer.integer(self.decks)
+        writer.integer(self.jokers)
+        writer.blob(self.codes.tobytes())
+        writer.blob(self.discarded_codes.tobytes())
+        writer.random_state(self.rng)
+        return writer.getvalue()
+
+    def restore(self, data: bytes) -> None:
+        """Replaces the cards, the discarded cards and the state of rng with a snapshot, returns None.
+
+        Raises:
+            ValueError: if the data is not a snapshot of a CompactShoe.
+        """
+        reader = SnapshotReader(data, SnapshotKind.SHOE)
+        decks = reader.integer()
+        jokers = bool(reader.integer())
+        codes = array("B", reader.blob())
+        discarded_codes = array("B", reader.blob())
+        state = reader.random_state()
+        reader.finish()
+        check_card_codes(codes)
+        check_card_codes(discarded_codes)
+        self.decks, self.jokers = decks, jokers
+        self.codes, self.discarded_codes = codes, discarded_codes
+        self.rng.setstate(state)
+        self.is_shuffled = True
+        if self.tracker is not None:
+            self.tracker.reset()
+
+    def deal(self) -> int:
+        """Moves the top card of the shoe into the discarded cards without creating a Card, returns int.
+
+        Returns:
+            The card encoded as by encode_card.
+        """
+        code = self.codes.pop()
+        self.discarded_codes.append(code)
+        if self.tracker is not None:
+            self.tracker.remove(code >> 4, code & 15)
+        return code
+
+    def pick_card(self, discard: bool = False, is_open: bool = True, random: bool = False) -> Card:
+        """Pick card from top of the shoe, return Card.
+
+        Args:
+            discard: Remove card from shoe into discarded cards if true, default False.
+            is_open: Checks whether the card should be dealt face up (open).
+            random: Checks whether a random card should be selected rather than the top one.
+        """
+        index = self.rng.randrange(len(self.codes)) if random is True else -1
+        code = self.codes[index]
+        if discard:
+            self.codes[index] = self.codes[-1]  # Move the top card into the gap so removing stays O(1)
+            self.codes.pop()
+            self.discarded_codes.append(code)
+            if self.tracker is not None:
+                self.tracker.remove(code >> 4, code & 15)
+        return decode_card(code, is_open)
+
+
+class ShufflePolicy:
+    """Decides when the cards used in previous rounds return to the deck.
+
+    This policy shuffles the whole deck, including the discarded cards, before every round.
+    """
+    def new_round(self, deck: DeckOfCards) -> bool:
+        """Prepares a deck for a new round, returns True if the deck was shuffled.
+
+        Args:
+            deck: The DeckOfCards or CompactShoe the round is played with.
+        """
+        deck.shuffle_cards()
+        return True
+
+
+class PenetrationShuffle(ShufflePolicy):
+    """Shuffles the deck only once a fraction of it has been dealt, like a cut card in a shoe.
+
+    A deck that was never shuffled is shuffled before its first round.
+
+    Attributes:
+        penetration: The fraction of the deck dealt after which the deck is shuffled before the next round.
+    """
+    def __init__(self, penetration: float = 0.75):
+        if not 0 < penetration < 1:
+            raise ValueError("Penetration must be between 0 and 1.")
+        self.penetration = penetration
+
+    def new_round(self, deck: DeckOfCards) -> bool:
+        if not deck.is_shuffled or deck.penetration >= self.penetration:
+            deck.shuffle_cards()
+            return True
+        return False
+
+
+class ContinuousShuffle(ShufflePolicy):
+    """Returns the discarded cards to random positions in the deck before every round, like a continuous shuffling
+    machine. The deck is only shuffled as a whole before its first round, if it was never shuffled."""
+    def new_round(self, deck: DeckOfCards) -> bool:
+        if not deck.is_shuffled:
+            deck.shuffle_cards()
+            return True
+        deck.reinsert_discarded()
+        return False
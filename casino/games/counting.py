@@ -0,0 +1,125 @@
+"""Tracks the composition of a shoe and the running and true counts of card counting systems.
+
+A ShoeTracker attaches itself to a DeckOfCards or CompactShoe. The deck reports every card that leaves it, so the
+remaining amount of every rank and suit is updated in constant time instead of by counting the cards left in the
+deck. Running and true counts are calculated from the amount left of the 14 ranks, which takes constant time too.
+Cards leave the deck when they are dealt, including closed cards, so the tracker follows the real composition of
+the shoe rather than the cards a player at the table has seen.
+"""
+import operator
+from array import array
+
+from casino.games.cards import Suit, CardValue
+
+
+class CountingSystem:
+    """A card counting system which assigns a tag to every rank.
+
+    The running count starts at offset minus the tags of every card in a full shoe and increases by the tag of every
+    card dealt. Balanced systems, whose tags sum to 0 over a deck, start at 0 with an offset of 0. Unbalanced
+    systems like KO use the offset to start at their initial running count.
+
+    Attributes:
+        name: Name of the system.
+        tags: The tags of the cards worth 1 (ACE) up to 10 (TEN, JACK, QUEEN and KING) points.
+        offset: Running count once every card of the shoe has been dealt.
+    """
+    def __init__(self, name: str, tags: tuple, offset: int = 0):
+        if len(tags) != 10:
+            raise ValueError("A counting system needs a tag for every card from ACE to TEN.")
+        self.name = name
+        self.tags = tuple(tags)
+        self.offset = offset
+        # Tags indexed by int(CardValue), jokers are not counted.
+        self.value_tags = (0,) + tuple(self.tags[min(value, 10) - 1] for value in range(1, 14)) + (0,)
+
+    def __repr__(self) -> str:
+        return f"CountingSystem({self.name!r})"
+
+
+HI_LO = CountingSystem("Hi-Lo", (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1))
+KO = CountingSystem("KO", (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1), offset=4)  # Starts at 4 - 4 per deck
+OMEGA_II = CountingSystem("Omega II", (0, 1, 1, 2, 2, 2, 1, 0, -1, -2))
+SYSTEMS = {system.name: system for system in (HI_LO, KO, OMEGA_II)}
+
+_VALUES = len(CardValue) + 1  # Counts are indexed by int(CardValue) and int(Suit), index 0 is unused
+_SUITS = len(Suit) + 1
+
+
+class ShoeTracker:
+    """Keeps the composition and the running counts of the cards left in a deck.
+
+    Creating a tracker attaches it to the deck. Every dealt card updates the tracker in constant time, and the
+    tracker is reset from the cards in the deck whenever the discarded cards return to it. The running counts are
+    not updated per card but calculated from value_counts when they are asked for, so tracking more systems does
+    not slow down dealing.
+
+    Attributes:
+        deck: The DeckOfCards or CompactShoe being tracked.
+        systems: The CountingSystems counted by default, the first one is used when no system is given.
+        remaining: Amount of cards left in the deck.
+        value_counts: List of the amount of cards left per int(CardValue), index 0 is unused.
+        suit_counts: List of the amount of cards left per int(Suit), index 0 is unused.
+        point_counts: Array of the amount of cards left worth 1 (ACE) up to 10 points, index 0 is unused.
+    """
+    def __init__(self, deck, systems: tuple = (HI_LO,)):
+        self.deck = deck
+        self.systems = tuple(systems)
+        self.remaining = 0
+        self.value_counts = [0] * _VALUES
+        self.suit_counts = [0] * _SUITS
+        self.point_counts = array("q", [0] * 11)
+        self.reset()
+        deck.tracker = self
+
+    def reset(self) -> None:
+        """Counts the cards left in the deck again, returns None."""
+        value_counts = self.value_counts = [0] * _VALUES
+        suit_counts = self.suit_counts = [0] * _SUITS
+        remaining = 0
+        for card in self.deck.cards:
+            value_counts[card.value._value_] += 1
+            suit_counts[card.suit._value_] += 1
+            remaining += 1
+        self.remaining = remaining
+        for points in range(1, 10):
+            self.point_counts[points] = value_counts[points]
+        self.point_counts[10] = sum(value_counts[10:14])
+
+    def remove(self, suit: int, value: int) -> None:
+        """Updates the counts for a card that left the deck, returns None.
+
+        Args:
+            suit: int(Suit) of the card.
+            value: int(CardValue) of the card.
+        """
+        self.remaining -= 1
+        self.value_counts[value] -= 1
+        self.suit_counts[suit] -= 1
+        if value < 14:
+            self.point_counts[value if value < 10 else 10] -= 1
+
+    def running_count(self, system: CountingSystem = None) -> int:
+        """The running count of a system, the first system if none is given, returns int."""
+        if system is None:
+            system = self.systems[0]
+        return system.offset - sum(map(operator.mul, system.value_tags, self.value_counts))
+
+    def true_count(self, system: CountingSystem = None) -> float:
+        """The running count of a system per deck of 52 cards left, returns float.
+
+        Returns 0.0 once the deck is empty.
+        """
+        return self.running_count(system) * 52 / self.remaining if self.remaining else 0.0
+
+    def composition(self) -> tuple:
+        """The amount of cards left worth 1 (ACE) up to 10 points, as used by casino.games.solver, returns tuple."""
+        return tuple(self.point_counts[1:])
+
+    def composition_view(self):
+        """A NumPy view of the amount of cards left worth 1 (ACE) up to 10 points, returns numpy.ndarray.
+
+        The view shares its memory with the tracker, so it stays up to date as cards are dealt. Requires NumPy.
+        """
+        import numpy
+        return numpy.frombuffer(self.point_counts, dtype=numpy.int64)[1:]
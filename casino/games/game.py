@@ -1,41 +1,195 @@
+import time
+from typing import Generator
+
+from casino.games.metrics import Metrics, timed, counted
 from casino.users.users import BaseUser
 
 
+class Decision:
+    """A decision the user has to make before a game can continue.
+
+    Attributes:
+        name: Identifies the kind of decision, e.g. "bet" or "action".
+        prompt: The question shown to a user at the terminal.
+        options: The legal answers, None if any answer is accepted and validated by the game itself.
+        seat: The seat of the player who has to decide, 0 in games with a single player.
+    """
+    __slots__ = ("name", "prompt", "options", "seat")
+
+    def __init__(self, name: str, prompt: str, options: tuple = None, seat: int = 0):
+        self.name = name
+        self.prompt = prompt
+        self.options = options
+        self.seat = seat
+
+    def __repr__(self) -> str:
+        return f"Decision({self.name!r}, options={self.options!r}, seat={self.seat!r})"
+
+
 class Game:
     """A skeleton for a game
 
-    This class should inherited by another class which should extend the content method. You use this class by invoking
-    the play method which repeats the content method in a loop.
+    This class should inherited by another class which should extend the steps or content method. You use this class
+    by invoking the play method which plays rounds in a loop at the terminal.
+
+    Games can also be driven without a terminal: next_decision returns the decision the game is waiting for and apply
+    answers it. Neither method blocks, so a single thread can play many games at once.
 
     Attributes:
         has_ended: Checks if the game has ended.
         user: The player that plays the game.
+        metrics: The Metrics the game records into, None if the game is not instrumented.
+        output: Callable receiving every message shown to the user, defaults to print. None makes the game quiet:
+            messages are dropped and games skip formatting them.
     """
+    PHASES = ()  # Names of the methods timed when the game is instrumented
+    COUNTERS = {}  # Maps names of methods to the counter increased by every call when the game is instrumented
+
     def __init__(self, user: BaseUser):
         self.has_ended = False
         self.user = user
+        self.metrics = None
+        self.output = print
+        self._steps = None
+        self._pending = None
 
     def play(self) -> None:
         """Event loop of the game, returns None"""
         while self.has_ended is False:
             try:
                 while self.has_ended is False:
-                    self.content()
+                    self.play_round()
             except KeyboardInterrupt:
                 if self.end_game() is True:
                     self.has_ended = True
+                    if self._steps is not None:  # Closing the round lets the game clean up, e.g. return bets
+                        self._steps.close()
+                        self._steps = self._pending = None
                     break
                 else:
                     continue
 
+    def play_round(self) -> None:
+        """Plays a single round with the user at the terminal, returns None."""
+        decision = self.next_decision()
+        while decision is not None:
+            decision = self.apply(self.ask(decision))
+
     def content(self) -> None:
         """This is the main code in which the game is executed, returns None
 
-        The code for the game should be added to this method. Do not edit the play() method as it is only a wrapper
-        for this method.
+        The code for the game should be added to this method or to steps. Do not edit the play() method as it is only
+        a wrapper for this method.
         """
         return None
 
+    def steps(self) -> Generator[Decision, str, None]:
+        """Plays a single round of the game, yields every Decision and receives its answer.
+
+        Games that need input from the user should overwrite this method and yield a Decision instead of calling
+        input(). The default implementation runs content without any decisions.
+        """
+        self.content()
+        yield from ()
+
+    def next_decision(self) -> Decision:
+        """Plays until the user has to make a decision, returns Decision.
+
+        Starts a new round if no round is in progress.
+
+        Returns:
+            The decision the game waits for, None if the round finished without a decision or the game has ended.
+        """
+        if self._pending is None and not self.has_ended:
+            if self._steps is None:
+                self._steps = self.steps()
+            self._advance(None)
+        return self._pending
+
+    def apply(self, answer) -> Decision:
+        """Answers the pending decision and plays until the next decision, returns Decision.
+
+        Args:
+            answer: The answer to the pending decision, must be one of its options if it has any.
+
+        Returns:
+            The next decision in the round, None if the round has finished.
+
+        Raises:
+            ValueError: if no decision is pending or the answer is not one of the options.
+        """
+        decision = self._pending
+        if decision is None:
+            raise ValueError("There is no decision to answer")
+        if decision.options is not None and answer not in decision.options:
+            raise ValueError(f"Please enter {decision.options}")
+        self._pending = None
+        self._advance(answer)
+        return self._pending
+
+    def instrument(self, metrics: Metrics) -> None:
+        """Records the latencies and counters of this game into metrics, returns None.
+
+        The time a round spends running, without the time waiting for decisions, is recorded as the "round" phase
+        and every finished round increases the "rounds" counter. The methods named in PHASES are timed and the
+        methods in COUNTERS counted. Only the methods of this instance are wrapped, so a game that is not
+        instrumented runs without any overhead.
+
+        Args:
+            metrics: The Metrics to record into, None removes the instrumentation.
+        """
+        for name in ("_advance", *self.PHASES, *self.COUNTERS):
+            self.__dict__.pop(name, None)
+        self.metrics = metrics
+        if metrics is None:
+            return None
+        for phase in self.PHASES:
+            setattr(self, phase, timed(getattr(self, phase), phase, metrics))
+        for name, counter in self.COUNTERS.items():
+            setattr(self, name, counted(getattr(self, name), counter, metrics))
+        advance = self._advance
+        elapsed = 0.0
+
+        def timed_advance(answer) -> None:
+            nonlocal elapsed
+            start = time.perf_counter()
+            try:
+                advance(answer)
+            finally:
+                elapsed += time.perf_counter() - start
+                if self._steps is None:  # The round has finished
+                    metrics.observe("round", elapsed)
+                    metrics.count("rounds")
+                    elapsed = 0.0
+        self._advance = timed_advance
+
+    def _advance(self, answer) -> None:
+        """Resumes the round with an answer until it yields a decision or finishes, returns None."""
+        try:
+            self._pending = self._steps.send(answer)
+        except StopIteration:
+            self._steps = None
+        except BaseException:
+            self._steps = None
+            raise
+
+    def ask(self, decision: Decision) -> str:
+        """Asks the user at the terminal to make a decision, returns string.
+
+        Options may also be chosen by entering their number, starting at 1.
+        """
+        self.message(decision.prompt)
+        while True:
+            answer = input(">>> ")
+            if decision.options is None:
+                return answer
+            answer = answer.lower().strip(' ')
+            if answer in decision.options:
+                return answer
+            if answer.isdigit() and 1 <= int(answer) <= len(decision.options):
+                return decision.options[int(answer) - 1]
+            self.message(f"Please enter {decision.options}")
+
     def end_game(self, force: bool = False) -> bool:
         """Checks whether the game should be ended, returns boolean.
 
@@ -56,6 +210,18 @@ class Game:
                 return_ = False
         return return_
 
+    def message(self, message: str) -> None:
+        """Shows a message to the user, returns None.
+
+        Games should use this method instead of print() so output can redirect or silence them. Messages that are
+        expensive to format should only be formatted if output is not None.
+
+        Args:
+            message: The text shown to the user.
+        """
+        if self.output is not None:
+            self.output(message)
+
     @staticmethod
     def validate_input(prompt: str, options: tuple) -> str:
         """A staticmethod which will wait until user has entered a correct input, returns string."""
@@ -63,7 +229,7 @@ class Game:
         while True:
             user_input = input(">>> ")
             if user_input.lower().strip(' ') in [option.lower() for option in options]:
-                return_ = user_input.lower()
+                return_ = user_input.lower().strip(' ')
                 break
             else:
                 print(f"Please enter {options}")
@@ -0,0 +1,193 @@
+"""Round histories of card games as streams of fixed-size events.
+
+A game emits an Event for every shuffle, bet, card dealt, action and settlement into an EventSink. Events are plain
+tuples of integers so they can be stored as fixed-size binary records: cards are stored with encode_card and amounts
+as integer cents.
+
+BinaryEventLog appends events to a file that starts with LOG_HEADER, followed by one RECORD per event. read_events
+memory-maps such a file and yields its events one at a time, and replay_rounds groups a stream of events into
+rounds, so logs of any size can be replayed without loading them into memory.
+"""
+import mmap
+import os
+import struct
+from enum import IntEnum
+from typing import Generator, Iterable, NamedTuple
+
+LOG_HEADER = b"CSNHIST\x01"  # Magic bytes and format version at the start of every log file
+RECORD = struct.Struct("<QIBBBBq")  # round, table, kind, seat, card, detail, amount
+HOUSE_SEAT = 255  # Seat of the house in the events of a table
+BUFFERED_EVENTS = 4096  # Amount of events a BinaryEventLog collects before writing them to the file
+READ_EVENTS = 4096  # Amount of events read_events unpacks at once
+
+
+class EventKind(IntEnum):
+    ROUND = 1  # A new round starts at a seat, amount is the balance of its player
+    SHUFFLE = 2  # The discarded cards are shuffled back into the deck
+    BET = 3  # The player of a seat places a bet, amount is the bet
+    DEAL = 4  # A card is dealt to a seat, detail is 1 if the card is open
+    ACTION = 5  # The player of a seat picks an action, detail is an Action
+    REVEAL = 6  # The house reveals its closed cards
+    SETTLE = 7  # A hand of a seat is settled, detail is an Outcome and amount the net win of the player
+    PLAYER = 8  # A player takes a seat whose number differs from their id at the table, amount is the id
+
+
+class Action(IntEnum):
+    HIT = 1
+    STAND = 2
+    DOUBLE = 3
+    SPLIT = 4
+    SURRENDER = 5
+    INSURANCE = 6  # The player takes insurance, amount is the insurance bet
+
+
+class Outcome(IntEnum):
+    WIN = 1
+    LOSS = 2
+    PUSH = 3
+    BLACKJACK = 4
+    SURRENDER = 5
+    INSURANCE = 6  # The insurance bet is settled when the house peeks, separately from the hands of the seat
+
+
+class Event(NamedTuple):
+    """A single thing that happened at a table.
+
+    Attributes:
+        round: Number of the round at the table, starting at 1.
+        table: Id of the table.
+        kind: The EventKind.
+        seat: Seat the event belongs to, HOUSE_SEAT for the house.
+        card: The card dealt encoded with encode_card, 0 if no card was dealt.
+        detail: Meaning depends on the kind of the event.
+        amount: Amount of money in cents, 0 if no money is involved.
+    """
+    round: int
+    table: int
+    kind: int
+    seat: int
+    card: int
+    detail: int
+    amount: int
+
+
+class EventSink:
+    """Receives the events of one or more games. This sink drops every event."""
+
+    def emit(self, event: Event) -> None:
+        """Receives a single event, returns None."""
+        return None
+
+    def flush(self) -> None:
+        """Writes all received events to the backend of the sink, returns None."""
+        return None
+
+    def close(self) -> None:
+        """Flushes the sink and releases its backend, returns None."""
+        self.flush()
+
+
+class MemorySink(EventSink):
+    """Keeps every event in a list.
+
+    Attributes:
+        events: The events received, in order.
+    """
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event: Event) -> None:
+        self.events.append(event)
+
+
+class BinaryEventLog(EventSink):
+    """Appends events to a binary log file.
+
+    Events are packed into RECORD and written once BUFFERED_EVENTS events have been collected, when the log is
+    flushed and when it is closed. Events that have not been written yet are lost if the process crashes, a record
+    that was only partially written is ignored by read_events. Opening an existing log cuts such a record off, so
+    the events appended after it stay aligned.
+
+    Attributes:
+        path: The path of the log file.
+    """
+    def __init__(self, path: str, buffered_events: int = BUFFERED_EVENTS):
+        self.path = path
+        self._buffer = bytearray()
+        self._buffer_size = buffered_events * RECORD.size
+        if os.path.isfile(path) and os.path.getsize(path):  # Checked before opening, which would create the file
+            _check_header(path)
+        self._file = open(path, "ab")
+        size = self._file.tell()
+        if size == 0:
+            self._file.write(LOG_HEADER)
+        else:
+            partial = (size - len(LOG_HEADER)) % RECORD.size
+            if partial:  # Left behind by a crash while writing
+                self._file.truncate(size - partial)
+
+    def emit(self, event: Event) -> None:
+        self._buffer += RECORD.pack(*event)
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        super(BinaryEventLog, self).close()
+        self._file.close()
+
+
+def _check_header(path: str) -> None:
+    """Checks that a file is a round history log, returns None.
+
+    Raises:
+        ValueError: if the file does not start with LOG_HEADER.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(LOG_HEADER)) != LOG_HEADER:
+            raise ValueError(f"{path} is not a round history log")
+
+
+def read_events(path: str) -> Generator[Event, None, None]:
+    """Reads the events of a binary log file one at a time, yields Event.
+
+    The file is memory-mapped, so only the pages being read are loaded into memory.
+
+    Raises:
+        ValueError: if the file is not a round history log.
+    """
+    _check_header(path)
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        end = size - (size - len(LOG_HEADER)) % RECORD.size  # Skips a partially written last record
+        if end == len(LOG_HEADER):
+            return None
+        step = READ_EVENTS * RECORD.size
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start in range(len(LOG_HEADER), end, step):  # Slicing copies a block of records out of the map
+                yield from map(Event._make, RECORD.iter_unpack(data[start:min(start + step, end)]))
+
+
+def replay_rounds(events: Iterable[Event]) -> Generator[tuple, None, None]:
+    """Groups a stream of events into rounds, yields tuple.
+
+    The events of rounds played at different tables may be interleaved. A round is complete once its table starts
+    a new round or the stream ends, so only the rounds in progress at every table are kept in memory.
+
+    Yields:
+        A tuple of the table id, the round number and the list of events of the round, in the order the rounds
+        are completed.
+    """
+    rounds = {}
+    for event in events:
+        if event.kind == EventKind.ROUND and event.table in rounds and rounds[event.table][0].round != event.round:
+            previous = rounds.pop(event.table)
+            yield event.table, previous[0].round, previous
+        rounds.setdefault(event.table, []).append(event)
+    for table, round_events in rounds.items():
+        yield table, round_events[0].round, round_events
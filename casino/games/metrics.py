@@ -0,0 +1,211 @@
+"""Latency histograms and counters of games, exported as Prometheus text or JSON.
+
+Games record into a Metrics instance once Game.instrument is called. Instrumentation wraps the methods of a single
+game instance, so games that are not instrumented run the plain methods without any checks.
+"""
+import functools
+import os
+import time
+from bisect import bisect_left
+from typing import Iterable
+
+LATENCY_BUCKETS = tuple(10 ** (exponent / 4) for exponent in range(-24, 1))  # Upper bounds in seconds, 1us to 1s
+
+
+class Histogram:
+    """Counts observed values in buckets with fixed upper bounds.
+
+    Attributes:
+        bounds: The upper bounds of the buckets, in increasing order. Values above the last bound are counted in an
+            extra bucket.
+        buckets: Amount of values observed in every bucket, not cumulative.
+        count: Amount of values observed.
+        sum: Sum of the values observed.
+    """
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Adds a value to its bucket, returns None."""
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, fraction: float) -> float:
+        """Estimates the value below which a fraction of the values lies, returns float.
+
+        Returns the upper bound of the bucket the quantile falls in, infinity if it falls above the last bound and
+        0.0 if nothing has been observed.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, amount in zip(self.bounds, self.buckets):
+            seen += amount
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    """Latency histograms per phase and event counters of one or more games.
+
+    Attributes:
+        labels: dict of labels identifying the metrics in exports, e.g. {"table": "1"}.
+        phases: dict mapping phase names to their Histogram of latencies in seconds.
+        counters: dict mapping counter names to their counts.
+        started: time.perf_counter() when the metrics were created, used to calculate rates.
+    """
+    def __init__(self, labels: dict = None):
+        self.labels = dict(labels) if labels is not None else {}
+        self.phases = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """Records the latency of a phase, returns None."""
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram()
+        histogram.observe(seconds)
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Increases a counter, returns None."""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def rates(self) -> dict:
+        """Calculates the average amount per second of every counter since the metrics were created, returns dict."""
+        seconds = time.perf_counter() - self.started
+        return {counter: amount / seconds if seconds > 0 else 0.0 for counter, amount in self.counters.items()}
+
+    def snapshot(self) -> dict:
+        """Copies the current state of the metrics into plain types, returns dict."""
+        return {
+            "labels": dict(self.labels),
+            "counters": dict(self.counters),
+            "rates": self.rates(),
+            "phases": {
+                phase: {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "p50": _finite(histogram.quantile(0.5)),
+                    "p99": _finite(histogram.quantile(0.99)),
+                    "buckets": dict(zip([*map(repr, histogram.bounds), "+Inf"], histogram.buckets)),
+                } for phase, histogram in self.phases.items()
+            },
+        }
+
+
+def _finite(value: float) -> float:
+    """Replaces infinity, which JSON can't represent, by None, returns float."""
+    return None if value == float("inf") else value
+
+
+def _label_text(labels: dict) -> str:
+    """Formats labels as a Prometheus label set without braces, returns string."""
+    escaped = {name: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for name, value in labels.items()}
+    return ",".join(f'{name}="{value}"' for name, value in escaped.items())
+
+
+def _series(name: str, labels: dict) -> str:
+    """Formats the name and labels of a Prometheus series, returns string."""
+    return f"{name}{{{_label_text(labels)}}}" if labels else name
+
+
+def prometheus_text(metrics: Iterable[Metrics], prefix: str = "casino") -> str:
+    """Formats metrics in the Prometheus text exposition format, returns string.
+
+    Phases become a single histogram with a phase label, counters become a counter and a per second gauge each.
+    """
+    metrics = list(metrics)
+    lines = [f"# HELP {prefix}_phase_seconds Time spent in a phase of a round.",
+             f"# TYPE {prefix}_phase_seconds histogram"]
+    for metric in metrics:
+        for phase, histogram in metric.phases.items():
+            labels = _label_text({**metric.labels, "phase": phase})
+            cumulative = 0
+            for bound, amount in zip(histogram.bounds + (float("inf"),), histogram.buckets):
+                cumulative += amount
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{prefix}_phase_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{prefix}_phase_seconds_sum{{{labels}}} {histogram.sum!r}")
+            lines.append(f"{prefix}_phase_seconds_count{{{labels}}} {histogram.count}")
+    counters = sorted({counter for metric in metrics for counter in metric.counters})
+    for counter in counters:
+        lines.append(f"# TYPE {prefix}_{counter}_total counter")
+        for metric in metrics:
+            if counter in metric.counters:
+                lines.append(f"{_series(f'{prefix}_{counter}_total', metric.labels)} {metric.counters[counter]}")
+        lines.append(f"# TYPE {prefix}_{counter}_per_second gauge")
+        for metric in metrics:
+            if counter in metric.counters:
+                rate = metric.rates()[counter]
+                lines.append(f"{_series(f'{prefix}_{counter}_per_second', metric.labels)} {rate!r}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: str, text: str) -> None:
+    """Replaces a file in a single step, so readers never see a partially written file, returns None."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        file.write(text)
+    os.replace(temporary, path)
+
+
+def write_prometheus(path: str, metrics: Iterable[Metrics]) -> None:
+    """Writes metrics to a Prometheus text file, e.g. for the textfile collector of node_exporter, returns None."""
+    _write_atomic(path, prometheus_text(metrics))
+
+
+def write_json(path: str, metrics: Iterable[Metrics]) -> None:
+    """Writes a JSON list with a snapshot of every Metrics, returns None."""
+    import json
+    _write_atomic(path, json.dumps([metric.snapshot() for metric in metrics], indent=2))
+
+
+def timed(method, phase: str, metrics: Metrics):
+    """Wraps a method to record the latency of every call as a phase, returns the wrapper.
+
+    Generator methods are timed while they run, the time spent waiting for the values they yield to be answered is
+    left out.
+    """
+    import inspect  # Imported here, games are only instrumented on demand
+    if inspect.isgeneratorfunction(method):
+        @functools.wraps(method)
+        def timed_generator(*args, **kwargs):
+            generator = method(*args, **kwargs)
+            elapsed = 0.0
+            answer = None
+            while True:
+                start = time.perf_counter()
+                try:
+                    value = generator.send(answer)
+                except StopIteration as stop:
+                    metrics.observe(phase, elapsed + time.perf_counter() - start)
+                    return stop.value
+                elapsed += time.perf_counter() - start
+                answer = yield value
+        return timed_generator
+
+    @functools.wraps(method)
+    def timed_method(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            metrics.observe(phase, time.perf_counter() - start)
+    return timed_method
+
+
+def counted(method, counter: str, metrics: Metrics):
+    """Wraps a method to increase a counter on every call, returns the wrapper."""
+    @functools.wraps(method)
+    def counted_method(*args, **kwargs):
+        metrics.count(counter)
+        return method(*args, **kwargs)
+    return counted_method
@@ -0,0 +1,344 @@
+"""Roulette on a European (single zero) or American (double zero) wheel.
+
+Every bet that can be placed on a wheel gets an id in its BetLayout. Bets are kept in a BetLedger of flat arrays
+holding the player, bet id and amount in cents of every bet. When the ball lands, the layout's row for the winning
+pocket gives the multiplier returned on every bet id, so all bets on the table are settled with a single gather
+and multiply instead of a loop over bet objects.
+
+This module requires numpy, which can be installed with the numpy extra of the package.
+"""
+import random
+from functools import lru_cache
+from typing import Generator
+
+import numpy as np
+
+from casino.games.game import Game, Decision
+from casino.users.money import Money
+from casino.users.users import PlayableUser
+
+BET = "bet"
+PLAY_AGAIN = "play again"
+SPIN = "spin"
+
+STRAIGHT = "straight"
+SPLIT = "split"
+STREET = "street"
+CORNER = "corner"
+LINE = "line"
+DOZEN = "dozen"
+COLUMN = "column"
+RED = "red"
+BLACK = "black"
+ODD = "odd"
+EVEN = "even"
+LOW = "low"
+HIGH = "high"
+TOP_LINE = "topline"
+
+PAYOUTS = {STRAIGHT: 35, SPLIT: 17, STREET: 11, CORNER: 8, TOP_LINE: 6, LINE: 5, DOZEN: 2, COLUMN: 2,
+           RED: 1, BLACK: 1, ODD: 1, EVEN: 1, LOW: 1, HIGH: 1}  # Paid to 1 on top of the returned bet
+RED_NUMBERS = frozenset((1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36))
+DOUBLE_ZERO = 37  # Pocket number of 00 on an American wheel
+LEDGER_CAPACITY = 1024  # Amount of bets a new BetLedger has room for before it grows
+
+_BET_DECISION = Decision(BET, "Place a bet like 'red 10', 'straight 17 5' or 'split 17 20 5', or enter 'spin'.")
+_PLAY_AGAIN_DECISION = Decision(PLAY_AGAIN, "\nDo you want to play another round?[y/n]", ("y", "n"))
+
+
+class Wheel:
+    """A roulette wheel.
+
+    Attributes:
+        name: Name of the wheel.
+        pockets: Amount of pockets, numbered 0 to 36 and DOUBLE_ZERO on an American wheel.
+    """
+    def __init__(self, name: str, pockets: int):
+        self.name = name
+        self.pockets = pockets
+
+    def __repr__(self) -> str:
+        return f"Wheel({self.name!r}, {self.pockets})"
+
+    def label(self, number: int) -> str:
+        """The name of a pocket as shown on the wheel, returns string."""
+        return "00" if number == DOUBLE_ZERO else str(number)
+
+
+EUROPEAN = Wheel("European", 37)
+AMERICAN = Wheel("American", 38)
+
+
+def _inside_bets() -> list:
+    """Lists every bet on a group of numbers of the grid of 1 to 36, returns list of (kind, numbers)."""
+    bets = []
+    for row in range(12):  # The grid has 12 rows of 3 numbers, row 0 holds 1, 2 and 3
+        first = row * 3 + 1
+        bets.append((STREET, (first, first + 1, first + 2)))
+        for column in range(3):
+            number = first + column
+            if column < 2:
+                bets.append((SPLIT, (number, number + 1)))
+            if row < 11:
+                bets.append((SPLIT, (number, number + 3)))
+                if column < 2:
+                    bets.append((CORNER, (number, number + 1, number + 3, number + 4)))
+        if row < 11:
+            bets.append((LINE, tuple(range(first, first + 6))))
+    return bets
+
+
+def _zero_bets(wheel: Wheel) -> list:
+    """Lists every inside bet including 0 or 00 on a wheel, returns list of (kind, numbers).
+
+    On a European layout 0 borders 1, 2 and 3, which also form the first four corner. On an American layout 0
+    borders 1 and 2, 00 borders 2 and 3, and the five numbers 0, 00, 1, 2 and 3 form the top line.
+    """
+    if wheel.pockets <= DOUBLE_ZERO:
+        return [(SPLIT, (0, 1)), (SPLIT, (0, 2)), (SPLIT, (0, 3)), (STREET, (0, 1, 2)), (STREET, (0, 2, 3)),
+                (CORNER, (0, 1, 2, 3))]
+    return [(SPLIT, (0, 1)), (SPLIT, (0, 2)), (SPLIT, (2, DOUBLE_ZERO)), (SPLIT, (3, DOUBLE_ZERO)),
+            (SPLIT, (0, DOUBLE_ZERO)), (STREET, (0, 1, 2)), (STREET, (0, 2, DOUBLE_ZERO)),
+            (STREET, (2, 3, DOUBLE_ZERO)), (TOP_LINE, (0, 1, 2, 3, DOUBLE_ZERO))]
+
+
+class BetLayout:
+    """Every bet that can be placed on a wheel, with the multiplier it returns for every pocket.
+
+    Attributes:
+        wheel: The Wheel the layout belongs to.
+        bets: List of (kind, numbers) of every bet, indexed by bet id. Dozens and columns hold their numbers too.
+        returns: 2-D int64 array with a row per pocket and a column per bet id, holding the multiple of the bet
+            returned to the player when the ball lands in that pocket: the payout plus 1 when the bet wins, 0 when
+            it loses.
+    """
+    def __init__(self, wheel: Wheel):
+        self.wheel = wheel
+        self.bets = [(STRAIGHT, (number,)) for number in range(wheel.pockets)]
+        self.bets += _inside_bets() + _zero_bets(wheel)
+        self.bets += [(DOZEN, tuple(range(first, first + 12))) for first in (1, 13, 25)]
+        self.bets += [(COLUMN, tuple(range(first, 37, 3))) for first in (1, 2, 3)]
+        self.bets += [(RED, tuple(sorted(RED_NUMBERS))), (BLACK, tuple(sorted(set(range(1, 37)) - RED_NUMBERS))),
+                      (ODD, tuple(range(1, 37, 2))), (EVEN, tuple(range(2, 37, 2))),
+                      (LOW, tuple(range(1, 19))), (HIGH, tuple(range(19, 37)))]
+        self._ids = {bet: bet_id for bet_id, bet in enumerate(self.bets)}
+        self.returns = np.zeros((wheel.pockets, len(self.bets)), dtype=np.int64)
+        for bet_id, (kind, numbers) in enumerate(self.bets):
+            self.returns[list(numbers), bet_id] = PAYOUTS[kind] + 1
+
+    def bet_id(self, kind: str, numbers: tuple = ()) -> int:
+        """Looks up the id of a bet, returns int.
+
+        Args:
+            kind: One of the bet kinds, e.g. STRAIGHT or RED.
+            numbers: The numbers covered by an inside bet in any order, or the number (1 to 3) of a dozen or
+                column. Outside bets on colours, odd, even, low and high take no numbers.
+
+        Raises:
+            ValueError: if the bet can't be placed on this wheel.
+        """
+        if kind in (DOZEN, COLUMN):
+            if len(numbers) != 1 or numbers[0] not in (1, 2, 3):
+                raise ValueError(f"A {kind} bet needs a single number from 1 to 3.")
+            return self._ids[kind, self._by_kind(kind)[numbers[0] - 1]]
+        if kind in (RED, BLACK, ODD, EVEN, LOW, HIGH):
+            if numbers:
+                raise ValueError(f"A {kind} bet takes no numbers.")
+            return self._ids[kind, self._by_kind(kind)[0]]
+        bet_id = self._ids.get((kind, tuple(sorted(numbers))))
+        if bet_id is None:
+            raise ValueError(f"{kind} {' '.join(map(self.wheel.label, numbers))} is not a bet on this wheel.")
+        return bet_id
+
+    def _by_kind(self, kind: str) -> list:
+        """The numbers of every bet of a kind, in order, returns list."""
+        return [numbers for bet_kind, numbers in self.bets if bet_kind == kind]
+
+
+@lru_cache(maxsize=None)
+def bet_layout(wheel: Wheel) -> BetLayout:
+    """The BetLayout of a wheel, built once per wheel, returns BetLayout."""
+    return BetLayout(wheel)
+
+
+class BetLedger:
+    """The bets placed on a table for a single spin, stored in flat arrays.
+
+    The arrays are preallocated and double in size when they are full, so placing a bet does not allocate.
+
+    Attributes:
+        size: Amount of bets in the ledger.
+        players: int32 array with the index of the player of every bet.
+        bet_ids: int32 array with the bet id of every bet in the layout of the table.
+        amounts: int64 array with the amount of every bet in cents.
+    """
+    def __init__(self, capacity: int = LEDGER_CAPACITY):
+        self.size = 0
+        self.players = np.zeros(capacity, dtype=np.int32)
+        self.bet_ids = np.zeros(capacity, dtype=np.int32)
+        self.amounts = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _reserve(self, size: int) -> None:
+        """Grows the arrays until they have room for size bets, returns None."""
+        capacity = len(self.amounts)
+        if size <= capacity:
+            return None
+        capacity = max(capacity, 1)
+        while capacity < size:
+            capacity *= 2
+        for name in ("players", "bet_ids", "amounts"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def place(self, player: int, bet_id: int, cents: int) -> None:
+        """Adds a single bet, returns None."""
+        self._reserve(self.size + 1)
+        self.players[self.size] = player
+        self.bet_ids[self.size] = bet_id
+        self.amounts[self.size] = cents
+        self.size += 1
+
+    def place_many(self, players, bet_ids, cents) -> None:
+        """Adds a batch of bets given as equally long arrays, returns None."""
+        amount = len(cents)
+        self._reserve(self.size + amount)
+        end = self.size + amount
+        self.players[self.size:end] = players
+        self.bet_ids[self.size:end] = bet_ids
+        self.amounts[self.size:end] = cents
+        self.size = end
+
+    def clear(self) -> None:
+        """Removes every bet while keeping the arrays, returns None."""
+        self.size = 0
+
+    def settle(self, layout: BetLayout, number: int) -> np.ndarray:
+        """Calculates what every bet returns when the ball lands on a number, returns numpy.ndarray.
+
+        Returns:
+            int64 array with the cents returned to the player of every bet, 0 for losing bets. Winning bets return
+            their amount plus the payout.
+        """
+        size = self.size
+        return layout.returns[number, self.bet_ids[:size]] * self.amounts[:size]
+
+    def totals(self, returned: np.ndarray, players: int) -> np.ndarray:
+        """Sums the cents returned per player, returns numpy.ndarray.
+
+        Args:
+            returned: The result of settle.
+            players: Amount of players at the table, the length of the result.
+        """
+        totals = np.zeros(players, dtype=np.int64)
+        np.add.at(totals, self.players[:self.size], returned)
+        return totals
+
+
+def parse_bet(text: str, wheel: Wheel) -> tuple:
+    """Parses a bet entered at the terminal like 'split 17 20 5', returns tuple of kind, numbers and Money.
+
+    Raises:
+        ValueError: if the text is not a bet.
+    """
+    words = text.lower().split()
+    if len(words) < 2 or words[0] not in PAYOUTS:
+        raise ValueError(f"Please enter a bet on one of {', '.join(PAYOUTS)} followed by the amount.")
+    numbers = []
+    for word in words[1:-1]:
+        if word == "00":
+            if wheel.pockets <= DOUBLE_ZERO:
+                raise ValueError("00 is not a number on this wheel.")
+            numbers.append(DOUBLE_ZERO)
+        elif word.isdigit() and int(word) <= 36:
+            numbers.append(int(word))
+        else:
+            raise ValueError(f"{word} is not a number on the wheel.")
+    return words[0], tuple(numbers), Money(words[-1])
+
+
+class Roulette(Game):
+    """A game of roulette for a single user at the terminal.
+
+    Every round the user places any amount of bets and then spins the wheel. Bets are deducted from the balance
+    when they are placed and all bets are settled at once when the ball lands.
+
+    Attributes:
+        user: The user currently playing the game.
+        wheel: The Wheel played on.
+        layout: The BetLayout of the wheel.
+        ledger: The BetLedger with the bets of the current round, the user is player 0.
+        rng: The random number generator spinning the wheel, defaults to a new unseeded generator.
+        last_number: The pocket the ball landed in last, None before the first spin.
+    """
+    def __init__(self, user: PlayableUser, wheel: Wheel = EUROPEAN, rng: random.Random = None):
+        super(Roulette, self).__init__(user=user)
+        self.user = user  # overwrite Game.user to make it of type PlayableUser
+        self.wheel = wheel
+        self.layout = bet_layout(wheel)
+        self.ledger = BetLedger()
+        self.rng = rng if rng is not None else random.Random()
+        self.last_number = None
+
+    def steps(self) -> Generator[Decision, str, None]:
+        self.ledger.clear()
+        try:
+            while True:
+                answer = yield _BET_DECISION
+                if str(answer).strip().lower() == SPIN:
+                    if len(self.ledger):
+                        break
+                    self.message("Please place a bet before spinning the wheel.")
+                    continue
+                try:
+                    self.place_bet(*parse_bet(str(answer), self.wheel))
+                except (TypeError, ValueError) as e:
+                    self.message(str(e))
+        except BaseException:  # The round is abandoned before the spin, e.g. its steps are closed
+            self.refund()
+            raise
+        self.settle(self.spin())
+        answer = yield _PLAY_AGAIN_DECISION
+        if answer == "n":
+            self.has_ended = True
+
+    def place_bet(self, kind: str, numbers: tuple, amount: Money) -> None:
+        """Deducts a bet from the balance of the user and adds it to the ledger, returns None.
+
+        Raises:
+            ValueError: if the bet does not exist, is not positive or exceeds the balance.
+        """
+        amount = Money(amount)
+        bet_id = self.layout.bet_id(kind, numbers)
+        if amount <= 0:
+            raise ValueError("Amount must be positive.")
+        self.user.lose_balance(amount)
+        self.ledger.place(0, bet_id, amount.cents)
+
+    def refund(self) -> None:
+        """Returns the bets of a round that ends without a spin to the user, returns None."""
+        staked = Money.from_cents(int(self.ledger.amounts[:len(self.ledger)].sum()))
+        if staked:
+            self.user.win_balance(staked)
+            self.message(f"Your bets are returned: {staked}")
+        self.ledger.clear()
+
+    def spin(self) -> int:
+        """Spins the wheel, returns the number of the pocket the ball lands in."""
+        self.last_number = self.rng.randrange(self.wheel.pockets)
+        self.message(f"The ball lands on {self.wheel.label(self.last_number)}.")
+        return self.last_number
+
+    def settle(self, number: int) -> None:
+        """Pays out every bet of the round, returns None."""
+        won = Money.from_cents(int(self.ledger.settle(self.layout, number).sum()))
+        if won:
+            self.user.win_balance(won)
+            self.message(f"Congratulations, you receive: {won}")
+        else:
+            self.message("You lose")
+        self.ledger.clear()
@@ -0,0 +1,365 @@
+import os
+import random
+
+from casino.games.blackjack import (Blackjack, BlackjackPlayer, BlackjackHand, HIT, STAND,
+                                    DOUBLE, SPLIT, SURRENDER, BET, ACTION, INSURANCE)
+from casino.games.cards import Card, DeckOfCards, ShufflePolicy
+from casino.games.history import EventSink
+from casino.games.snapshot import SnapshotWriter, SnapshotReader, SnapshotKind, write_snapshot, read_snapshot
+from casino.users.money import Money
+
+CHUNK_SIZE = 10000  # Rounds simulated with a single RNG stream by simulate_parallel
+CHECKPOINT_INTERVAL = 10000  # Rounds simulated between two checkpoints
+FALLBACK_ACTIONS = {DOUBLE: HIT, SPLIT: HIT, SURRENDER: HIT}  # Played when a strategy picks an action not allowed
+
+
+class ThresholdStrategy:
+    """A strategy that hits until the hand reaches a given total, like the house does.
+
+    Attributes:
+        stand_on: The lowest total at which the strategy stands.
+    """
+    def __init__(self, stand_on: int = 17):
+        self.stand_on = stand_on
+
+    def __call__(self, hand: BlackjackHand, upcard: Card) -> str:
+        return HIT if max(hand.value) < self.stand_on else STAND
+
+
+class FlatBet:
+    """A bet policy that bets the same amount every round.
+
+    Attributes:
+        amount: The amount bet every round.
+    """
+    def __init__(self, amount: Money = 1):
+        self.amount = Money(amount)
+
+    def __call__(self, player: BlackjackPlayer) -> Money:
+        return self.amount
+
+
+class SimulationResult:
+    """Aggregated outcome of a number of simulated rounds.
+
+    Attributes:
+        rounds: Amount of rounds played, counted per seat.
+        wins: Rounds won by the player, not counting blackjacks.
+        pushes: Rounds in which the bet was returned.
+        losses: Rounds lost by the player.
+        blackjacks: Rounds won by the player with a blackjack.
+        surrenders: Hands the player surrendered.
+        wagered: Total Money bet over all rounds.
+        net: Total Money won by the player, negative if the player lost money.
+        mean: Mean net result of a round.
+        sum_of_squares: Sum of squared deviations from the mean, used to calculate the variance.
+    """
+    def __init__(self):
+        self.rounds = 0
+        self.wins = 0
+        self.pushes = 0
+        self.losses = 0
+        self.blackjacks = 0
+        self.surrenders = 0
+        self.wagered = Money()
+        self.net = Money()
+        self.mean = 0.0
+        self.sum_of_squares = 0.0
+
+    def __repr__(self) -> str:
+        return (f"SimulationResult(rounds={self.rounds}, wins={self.wins}, pushes={self.pushes}, "
+                f"losses={self.losses}, blackjacks={self.blackjacks}, surrenders={self.surrenders}, "
+                f"house_edge={self.house_edge:.5f}, variance={self.variance:.5f})")
+
+    @property
+    def house_edge(self) -> float:
+        """The fraction of the wagered amount the house wins, returns float."""
+        return -self.net.cents / self.wagered.cents if self.wagered else 0.0
+
+    @property
+    def variance(self) -> float:
+        """The sample variance of the net result of a round, returns float."""
+        return self.sum_of_squares / (self.rounds - 1) if self.rounds > 1 else 0.0
+
+    def add_round(self, bet: Money, net: Money) -> None:
+        """Adds the result of a single round, returns None.
+
+        The mean and variance are updated using Welford's online algorithm.
+
+        Args:
+            bet: The amount bet in the round.
+            net: The amount won in the round, negative if the round was lost.
+        """
+        self.rounds += 1
+        self.wagered += bet
+        self.net += net
+        result = float(net)
+        delta = result - self.mean
+        self.mean += delta / self.rounds
+        self.sum_of_squares += delta * (result - self.mean)
+
+    def merge(self, other: "SimulationResult") -> None:
+        """Adds the results of another simulation to this one, returns None.
+
+        The variance is combined using Chan's parallel algorithm, so merging partial results gives the same
+        aggregate as playing all rounds in a single simulation up to floating point rounding.
+
+        Args:
+            other: The results to add.
+        """
+        rounds = self.rounds + other.rounds
+        if rounds == 0:
+            return None
+        delta = other.mean - self.mean
+        self.mean += delta * other.rounds / rounds
+        self.sum_of_squares += other.sum_of_squares + delta * delta * self.rounds * other.rounds / rounds
+        self.rounds = rounds
+        self.wins += other.wins
+        self.pushes += other.pushes
+        self.losses += other.losses
+        self.blackjacks += other.blackjacks
+        self.surrenders += other.surrenders
+        self.wagered += other.wagered
+        self.net += other.net
+
+    def snapshot(self) -> bytes:
+        """Captures the aggregated results, returns bytes."""
+        writer = SnapshotWriter(SnapshotKind.RESULT)
+        for count in (self.rounds, self.wins, self.pushes, self.losses, self.blackjacks, self.surrenders,
+                      self.wagered.cents, self.net.cents):
+            writer.integer(count)
+        writer.number(self.mean)
+        writer.number(self.sum_of_squares)
+        return writer.getvalue()
+
+    def restore(self, data: bytes) -> None:
+        """Replaces the aggregated results with a snapshot, returns None.
+
+        Raises:
+            ValueError: if the data is not a snapshot of a SimulationResult.
+        """
+        reader = SnapshotReader(data, SnapshotKind.RESULT)
+        counts = [reader.integer() for _ in range(8)]
+        mean = reader.number()
+        sum_of_squares = reader.number()
+        reader.finish()
+        self.rounds, self.wins, self.pushes, self.losses, self.blackjacks, self.surrenders = counts[:6]
+        self.wagered = Money.from_cents(counts[6])
+        self.net = Money.from_cents(counts[7])
+        self.mean = mean
+        self.sum_of_squares = sum_of_squares
+
+
+class SimulatedPlayer(BlackjackPlayer):
+    """A blackjack player whose balance is never depleted, used to simulate rounds.
+
+    Attributes:
+        username: Name of the user.
+        balance: Amount of money the player has, only used to validate bets.
+        net: Amount won in the current round, negative if money was lost.
+    """
+    def __init__(self, username: str = "Simulated player", balance: Money = 10 ** 12):
+        super(SimulatedPlayer, self).__init__(username=username, balance=balance)
+        self.net = Money()
+
+    def win_balance(self, amount: Money) -> None:
+        self.net += Money(amount)
+
+    def lose_balance(self, amount: Money) -> None:
+        self.net -= Money(amount)
+
+
+class HeadlessBlackjack(Blackjack):
+    """A game of blackjack which is played by a strategy instead of a user at the terminal.
+
+    The game is quiet, its output is None, so no messages are formatted.
+
+    Attributes:
+        strategy: Callable receiving the hand of a seat and the house's open card, returns the action to play or a
+            tuple of actions in order of preference. The first allowed action of a tuple is played, a single action
+            that is not allowed is replaced by its FALLBACK_ACTIONS.
+        bet_policy: Callable receiving the player of a seat, returns the amount to bet.
+        insurance_policy: Callable receiving the hand of a seat and the house's open card, returns True to take
+            insurance. Insurance is never taken by default.
+        result: SimulationResult the played rounds are added to.
+    """
+    def __init__(self, user: SimulatedPlayer, deck: DeckOfCards, strategy=None, bet_policy=None,
+                 shuffle_policy: ShufflePolicy = None, insurance_policy=None):
+        super(HeadlessBlackjack, self).__init__(user=user, deck=deck, shuffle_policy=shuffle_policy)
+        self.user = user
+        self.strategy = strategy if strategy is not None else ThresholdStrategy()
+        self.bet_policy = bet_policy if bet_policy is not None else FlatBet()
+        self.insurance_policy = insurance_policy
+        self.result = SimulationResult()
+        self.output = None
+
+    def content(self) -> None:
+        """Plays a single round, answering every decision with the strategy or bet policy, returns None.
+
+        Every seat adds its own round to the result.
+
+        Raises:
+            ValueError: if the strategy plays an action that is not allowed and has no FALLBACK_ACTIONS, or a tuple
+                of actions none of which is allowed.
+        """
+        seats = self.seats
+        for player in seats:
+            player.net = Money()
+        decision = self.next_decision()
+        while decision is not None:
+            if decision.name == ACTION:
+                action = self.strategy(seats[decision.seat].hand, self.house.hand.cards[0])
+                if action not in decision.options:
+                    if isinstance(action, tuple):
+                        allowed = next((option for option in action if option in decision.options), None)
+                    else:
+                        allowed = FALLBACK_ACTIONS.get(action)
+                    if allowed is None:
+                        raise ValueError(f"The strategy played {action!r}, which allows none of {decision.options}")
+                    action = allowed
+                decision = self.apply(action)
+            elif decision.name == BET:
+                decision = self.apply(self.bet_policy(seats[decision.seat]))
+            elif decision.name == INSURANCE:
+                insure = (self.insurance_policy is not None and
+                          self.insurance_policy(seats[decision.seat].hand, self.house.hand.cards[0]))
+                decision = self.apply("y" if insure else "n")
+            else:  # The round is over once the game asks to play another round
+                player = seats[decision.seat]
+                self.result.add_round(player.bet, player.net)
+                decision = self.apply("y")
+
+    def snapshot(self) -> bytes:
+        """Captures the game and the results of the rounds played, returns bytes."""
+        writer = SnapshotWriter(SnapshotKind.SIMULATION)
+        writer.blob(super(HeadlessBlackjack, self).snapshot())
+        writer.blob(self.result.snapshot())
+        return writer.getvalue()
+
+    def restore(self, data: bytes, balances: bool = True) -> None:
+        reader = SnapshotReader(data, SnapshotKind.SIMULATION)
+        game = reader.blob()
+        result = reader.blob()
+        reader.finish()
+        super(HeadlessBlackjack, self).restore(game, balances)
+        self.result.restore(result)
+
+    def event_player_blackjack(self, seat: int = 0) -> None:
+        self.result.blackjacks += 1
+        super(HeadlessBlackjack, self).event_player_blackjack(seat)
+
+    def event_player_wins(self, seat: int = 0) -> None:
+        self.result.wins += 1
+        super(HeadlessBlackjack, self).event_player_wins(seat)
+
+    def event_house_wins(self, seat: int = 0) -> None:
+        self.result.losses += 1
+        super(HeadlessBlackjack, self).event_house_wins(seat)
+
+    def event_player_push(self, seat: int = 0) -> None:
+        self.result.pushes += 1
+        super(HeadlessBlackjack, self).event_player_push(seat)
+
+    def event_player_surrender(self, seat: int = 0) -> None:
+        self.result.surrenders += 1
+        super(HeadlessBlackjack, self).event_player_surrender(seat)
+
+
+def simulate(rounds: int, strategy=None, bet_policy=None, deck: DeckOfCards = None,
+             shuffle_policy: ShufflePolicy = None, seats: int = 1, insurance_policy=None, checkpoint: str = None,
+             checkpoint_interval: int = CHECKPOINT_INTERVAL, history: EventSink = None) -> SimulationResult:
+    """Plays a number of blackjack rounds without any user interaction, returns SimulationResult.
+
+    With a checkpoint file the game and the results are written to it every checkpoint_interval rounds and after
+    the last round. If the file exists the simulation resumes from it, so a simulation that is killed and started
+    again with the same arguments gives the same result as one that was never interrupted.
+
+    Args:
+        rounds: Amount of rounds to play, every seat plays each of them.
+        strategy: Callable deciding whether to hit or stand, defaults to standing on 17 like the house.
+        bet_policy: Callable deciding the bet of every round, defaults to a flat bet of 1.
+        deck: The deck to play with, defaults to a new DeckOfCards.
+        shuffle_policy: ShufflePolicy of the game, defaults to a shuffle before every round.
+        seats: Amount of seats at the table sharing the deck, all played with the same strategy and bet policy.
+        insurance_policy: Callable deciding whether to take insurance, defaults to never.
+        checkpoint: Path of the checkpoint file, None to not checkpoint.
+        checkpoint_interval: Amount of rounds played between two checkpoints.
+        history: EventSink receiving the events of every round, e.g. an AnalyticsSink, and flushed after the last
+            round. None to not record events. The sink is not part of the checkpoints.
+
+    Returns:
+        The aggregated results of all played rounds, a round at every seat counts as a round.
+    """
+    game = HeadlessBlackjack(SimulatedPlayer(), deck if deck is not None else DeckOfCards(), strategy, bet_policy,
+                             shuffle_policy, insurance_policy)
+    for seat in range(1, seats):
+        game.sit(SimulatedPlayer(f"Simulated player {seat + 1}"))
+    game.history = history
+    played = 0
+    if checkpoint is not None and os.path.exists(checkpoint):
+        game.restore(read_snapshot(checkpoint))
+        played = game.result.rounds // seats
+    while played < rounds:
+        game.content()
+        played += 1
+        if checkpoint is not None and (played % checkpoint_interval == 0 or played == rounds):
+            write_snapshot(checkpoint, game.snapshot())
+    if history is not None:
+        history.flush()
+    return game.result
+
+
+def _simulate_chunk(seed: int, chunk: int, rounds: int, strategy, bet_policy, decks: int,
+                    shuffle_policy: ShufflePolicy, insurance_policy, checkpoints: str) -> SimulationResult:
+    """Simulates a single chunk of simulate_parallel with its own RNG stream, returns SimulationResult."""
+    deck = DeckOfCards(rng=random.Random(f"{seed}:{chunk}"), decks=decks)
+    checkpoint = os.path.join(checkpoints, f"chunk-{chunk}.snapshot") if checkpoints is not None else None
+    return simulate(rounds, strategy, bet_policy, deck, shuffle_policy, insurance_policy=insurance_policy,
+                    checkpoint=checkpoint)
+
+
+def simulate_parallel(rounds: int, seed: int = 0, workers: int = None, strategy=None, bet_policy=None,
+                      chunk_size: int = CHUNK_SIZE, decks: int = 1,
+                      shuffle_policy: ShufflePolicy = None, insurance_policy=None,
+                      checkpoints: str = None) -> SimulationResult:
+    """Plays a number of blackjack rounds spread over multiple processes, returns SimulationResult.
+
+    The rounds are split into chunks of chunk_size rounds. Every chunk is played with its own deck and a random
+    generator seeded from the seed and the index of the chunk, and the results are merged in chunk order. The result
+    therefore only depends on the seed and chunk_size, not on the amount of workers.
+
+    Args:
+        rounds: Amount of rounds to play.
+        seed: The master seed all RNG streams are derived from.
+        workers: Amount of processes to use, defaults to the amount of cores. 1 plays all chunks in this process.
+        strategy: Callable deciding whether to hit or stand, must be picklable.
+        bet_policy: Callable deciding the bet of every round, must be picklable.
+        chunk_size: Amount of rounds played with a single RNG stream.
+        decks: Amount of decks in the shoe of every chunk.
+        shuffle_policy: ShufflePolicy of every chunk, must be picklable.
+        insurance_policy: Callable deciding whether to take insurance, must be picklable.
+        checkpoints: Existing directory every chunk writes its checkpoint file to, see simulate. Running the same
+            simulation with the same directory again resumes every chunk, None to not checkpoint.
+
+    Returns:
+        The aggregated results of all played rounds.
+    """
+    chunks = range((rounds + chunk_size - 1) // chunk_size)
+    sizes = [min(chunk_size, rounds - chunk * chunk_size) for chunk in chunks]
+    arguments = ([seed] * len(sizes), chunks, sizes, [strategy] * len(sizes), [bet_policy] * len(sizes),
+                 [decks] * len(sizes), [shuffle_policy] * len(sizes), [insurance_policy] * len(sizes),
+                 [checkpoints] * len(sizes))
+    if workers == 1:
+        results = map(_simulate_chunk, *arguments)
+        return _merge_results(results)
+    from concurrent.futures import ProcessPoolExecutor  # Imported here, it takes longer to import than this module
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _merge_results(executor.map(_simulate_chunk, *arguments))
+
+
+def _merge_results(results) -> SimulationResult:
+    """Merges an iterable of results in order, returns SimulationResult."""
+    total = SimulationResult()
+    for result in results:
+        total.merge(result)
+    return total
@@ -0,0 +1,165 @@
+"""Versioned binary snapshots of decks, hands, players and games, used to checkpoint and resume them.
+
+Every snapshot starts with SNAPSHOT_MAGIC, the version of the format and the SnapshotKind of the object, followed
+by the fields of the object in little-endian byte order. Objects containing other objects embed the complete
+snapshots of their parts, so every part is checked when it is restored. Cards are stored as a single byte each with
+encode_card, amounts as integer cents and random number generators as their full internal state.
+
+Snapshots only contain state, never code: a game is restored into an instance created with the same strategies and
+policies as the one the snapshot was taken of.
+"""
+import os
+import random
+import struct
+from enum import IntEnum
+
+SNAPSHOT_MAGIC = b"CSNSNAP"
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct("<7sBB")  # magic, version, kind
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_LENGTH = struct.Struct("<I")
+_MT_STATE = struct.Struct("<625I")  # The 624 words of the Mersenne Twister and its position
+
+
+class SnapshotKind(IntEnum):
+    DECK = 1
+    SHOE = 2
+    HAND = 3
+    PLAYER = 4
+    BLACKJACK = 5
+    SIMULATION = 6
+    RESULT = 7
+
+
+class SnapshotWriter:
+    """Collects the fields of a snapshot.
+
+    Args:
+        kind: The SnapshotKind written into the header.
+    """
+    def __init__(self, kind: SnapshotKind):
+        self._parts = [HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, kind)]
+
+    def integer(self, value: int) -> None:
+        """Adds a signed 64 bit integer, returns None."""
+        self._parts.append(_INT.pack(value))
+
+    def number(self, value: float) -> None:
+        """Adds a float, returns None."""
+        self._parts.append(_FLOAT.pack(value))
+
+    def blob(self, data: bytes) -> None:
+        """Adds bytes prefixed with their length, returns None."""
+        self._parts.append(_LENGTH.pack(len(data)))
+        self._parts.append(bytes(data))
+
+    def text(self, value: str) -> None:
+        """Adds a string encoded as UTF-8, returns None."""
+        self.blob(value.encode())
+
+    def random_state(self, rng: random.Random) -> None:
+        """Adds the state of a random number generator, returns None."""
+        version, internal, gauss = rng.getstate()
+        self.integer(version)
+        self._parts.append(_MT_STATE.pack(*internal))
+        self.integer(gauss is not None)
+        self.number(gauss if gauss is not None else 0.0)
+
+    def getvalue(self) -> bytes:
+        """Joins the fields into the snapshot, returns bytes."""
+        return b"".join(self._parts)
+
+
+class SnapshotReader:
+    """Reads the fields of a snapshot in the order they were written.
+
+    Args:
+        data: The snapshot.
+        kind: The SnapshotKind the snapshot must have.
+
+    Raises:
+        ValueError: if the data is no snapshot of the kind or was written by another version of the format.
+    """
+    def __init__(self, data: bytes, kind: SnapshotKind):
+        self._data = memoryview(data)
+        if len(data) < HEADER.size:
+            raise ValueError("Snapshot is truncated")
+        magic, version, found = HEADER.unpack_from(self._data)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Data is not a snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Snapshot version {version} is not supported, expected {SNAPSHOT_VERSION}")
+        if found != kind:
+            raise ValueError(f"Snapshot of a {_kind_name(found)} can't be restored into a {kind.name.lower()}")
+        self._offset = HEADER.size
+
+    def _unpack(self, layout: struct.Struct) -> tuple:
+        """Reads the next fields with a fixed layout, returns tuple."""
+        if self._offset + layout.size > len(self._data):
+            raise ValueError("Snapshot is truncated")
+        values = layout.unpack_from(self._data, self._offset)
+        self._offset += layout.size
+        return values
+
+    def integer(self) -> int:
+        """Reads a signed 64 bit integer, returns int."""
+        return self._unpack(_INT)[0]
+
+    def number(self) -> float:
+        """Reads a float, returns float."""
+        return self._unpack(_FLOAT)[0]
+
+    def blob(self) -> bytes:
+        """Reads bytes prefixed with their length, returns bytes."""
+        length = self._unpack(_LENGTH)[0]
+        if self._offset + length > len(self._data):
+            raise ValueError("Snapshot is truncated")
+        data = bytes(self._data[self._offset:self._offset + length])
+        self._offset += length
+        return data
+
+    def text(self) -> str:
+        """Reads a string, returns string."""
+        return self.blob().decode()
+
+    def random_state(self) -> tuple:
+        """Reads the state of a random number generator as used by random.Random.setstate, returns tuple."""
+        version = self.integer()
+        internal = self._unpack(_MT_STATE)
+        has_gauss = self.integer()
+        gauss = self.number()
+        return version, internal, gauss if has_gauss else None
+
+    def finish(self) -> None:
+        """Checks that every field has been read, returns None.
+
+        Raises:
+            ValueError: if the snapshot contains more data.
+        """
+        if self._offset != len(self._data):
+            raise ValueError("Snapshot contains unexpected data")
+
+
+def _kind_name(kind: int) -> str:
+    """Names a kind found in a snapshot, which may be unknown, returns string."""
+    try:
+        return SnapshotKind(kind).name.lower()
+    except ValueError:
+        return f"unknown kind {kind}"
+
+
+def write_snapshot(path: str, data: bytes) -> None:
+    """Replaces a file with a snapshot in a single step, so a crash never leaves a partial snapshot, returns None."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def read_snapshot(path: str) -> bytes:
+    """Reads a snapshot written by write_snapshot, returns bytes."""
+    with open(path, "rb") as file:
+        return file.read()
@@ -0,0 +1,177 @@
+"""Exact expected values of hitting and standing in blackjack.
+
+The house plays by the rules of Blackjack: it peeks for blackjack before the player acts and draws until its highest
+value is at least HOUSE_STANDS_ON. A round the player gets to act in therefore never has a house blackjack.
+
+Shoe compositions are tuples of 10 counts, the amount of cards worth 1 (ACE) up to 10 (TEN, JACK, QUEEN and KING)
+left in the shoe. The house's draws are taken from the composition without replacement, and the final totals of
+every (composition, house hand) combination are cached. The player's draws are taken from the composition at the
+moment of the decision.
+"""
+from functools import lru_cache
+
+from casino.games.blackjack import BlackjackHand, CARD_POINTS, HIT, STAND, HOUSE_STANDS_ON
+from casino.games.cards import Card, CardValue
+
+HOUSE_CACHE_SIZE = 1 << 17  # Maximum amount of (composition, house hand) combinations kept in the cache
+HOUSE_OUTCOMES = (17, 18, 19, 20, 21, "bust")
+_BUST = len(HOUSE_OUTCOMES) - 1
+
+
+def shoe_composition(decks: int = 1) -> tuple:
+    """The composition of a full shoe of normal decks, returns tuple."""
+    return (4 * decks,) * 9 + (16 * decks,)
+
+
+def composition_of(deck) -> tuple:
+    """Counts the cards left in a DeckOfCards or CompactShoe, returns tuple.
+
+    Jokers are ignored. Decks with a ShoeTracker attached return the composition kept by the tracker.
+    """
+    if getattr(deck, "tracker", None) is not None:
+        return deck.tracker.composition()
+    counts = [0] * 10
+    for card in deck.cards:
+        if card.value != CardValue.JOKER:
+            counts[CARD_POINTS[int(card.value)] - 1] += 1
+    return tuple(counts)
+
+
+def _best_total(hard: int, has_ace: bool) -> int:
+    """The highest value of a hand that does not exceed 21 if possible, returns int."""
+    return hard + 10 if has_ace and hard + 10 <= 21 else hard
+
+
+def _remove(composition: tuple, points: int) -> tuple:
+    """Removes a card worth points from the composition, returns tuple."""
+    index = points - 1
+    return composition[:index] + (composition[index] - 1,) + composition[index + 1:]
+
+
+@lru_cache(maxsize=HOUSE_CACHE_SIZE)
+def house_outcomes(composition: tuple, hard: int, has_ace: bool) -> tuple:
+    """Calculates the probability of every final total of the house, returns tuple.
+
+    Args:
+        composition: The cards the house draws from.
+        hard: Total of the house's hand with aces counted as 1.
+        has_ace: Checks whether the house's hand contains an ace.
+
+    Returns:
+        The probabilities of the outcomes in HOUSE_OUTCOMES, in the same order.
+
+    Raises:
+        ValueError: if the shoe runs out of cards before the house is done drawing.
+    """
+    outcomes = [0.0] * len(HOUSE_OUTCOMES)
+    best = _best_total(hard, has_ace)
+    if best >= HOUSE_STANDS_ON:
+        outcomes[_BUST if best > 21 else best - HOUSE_STANDS_ON] = 1.0
+        return tuple(outcomes)
+    cards = sum(composition)
+    if cards == 0:
+        raise ValueError("The shoe ran out of cards")
+    for points, count in enumerate(composition, 1):
+        if count:
+            probability = count / cards
+            following = house_outcomes(_remove(composition, points), hard + points, has_ace or points == 1)
+            for index, outcome in enumerate(following):
+                outcomes[index] += probability * outcome
+    return tuple(outcomes)
+
+
+def house_distribution(composition: tuple, upcard: int) -> tuple:
+    """Calculates the final totals of the house given its open card, returns tuple.
+
+    The hole card is drawn from the composition without the open card. Hole cards that would give the house a
+    blackjack are left out, because the round would have ended when the house peeked.
+
+    Args:
+        composition: The composition of the shoe including the open card of the house.
+        upcard: Points of the open card of the house, 1 for ACE.
+
+    Returns:
+        The probabilities of the outcomes in HOUSE_OUTCOMES, in the same order.
+    """
+    composition = _remove(composition, upcard)
+    outcomes = [0.0] * len(HOUSE_OUTCOMES)
+    weight = 0
+    for points, count in enumerate(composition, 1):
+        if count == 0 or {upcard, points} == {1, 10}:
+            continue
+        weight += count
+        following = house_outcomes(_remove(composition, points), upcard + points, upcard == 1 or points == 1)
+        for index, outcome in enumerate(following):
+            outcomes[index] += count * outcome
+    return tuple(outcome / weight for outcome in outcomes)
+
+
+def stand_ev(total: int, distribution: tuple) -> float:
+    """The expected value of standing on a total against a house distribution, returns float."""
+    if total > 21:
+        return -1.0
+    ev = distribution[_BUST]
+    for house_total, probability in zip(HOUSE_OUTCOMES, distribution[:_BUST]):
+        if total > house_total:
+            ev += probability
+        elif total < house_total:
+            ev -= probability
+    return ev
+
+
+def solve(composition: tuple) -> dict:
+    """Calculates the expected values of hitting and standing for every decision, returns dict.
+
+    Args:
+        composition: The composition of the shoe before the open card of the house is dealt.
+
+    Returns:
+        A dict mapping (player total, soft flag, house upcard) to a tuple of the expected value of standing and
+        hitting, per unit bet. Totals run from 4 to 21 for hard hands and 12 to 21 for soft hands, upcards from
+        1 (ACE) to 10.
+    """
+    table = {}
+    for upcard in range(1, 11):
+        if composition[upcard - 1] == 0:
+            continue
+        distribution = house_distribution(composition, upcard)
+        remaining = _remove(composition, upcard)
+        cards = sum(remaining)
+        probabilities = [(points, count / cards) for points, count in enumerate(remaining, 1) if count]
+
+        @lru_cache(maxsize=None)
+        def best_ev(hard: int, has_ace: bool) -> float:
+            total = _best_total(hard, has_ace)
+            if total > 21:
+                return -1.0
+            return max(stand_ev(total, distribution), hit_ev(hard, has_ace))
+
+        @lru_cache(maxsize=None)
+        def hit_ev(hard: int, has_ace: bool) -> float:
+            return sum(probability * best_ev(hard + points, has_ace or points == 1)
+                       for points, probability in probabilities)
+
+        for total in range(4, 22):
+            table[total, False, upcard] = (stand_ev(total, distribution), hit_ev(total, False))
+        for total in range(12, 22):
+            table[total, True, upcard] = (stand_ev(total, distribution), hit_ev(total - 10, True))
+    return table
+
+
+class BasicStrategy:
+    """A strategy that hits whenever hitting has a higher expected value than standing.
+
+    Instances can be used as the strategy of HeadlessBlackjack.
+
+    Attributes:
+        table: dict mapping (player total, soft flag, house upcard) to HIT or STAND.
+    """
+    def __init__(self, composition: tuple = None):
+        evs = solve(composition if composition is not None else shoe_composition(6))
+        self.table = {key: HIT if hit > stand else STAND for key, (stand, hit) in evs.items()}
+
+    def __call__(self, hand: BlackjackHand, upcard: Card) -> str:
+        total = max(hand.value)
+        if total > 21:
+            return STAND
+        return self.table.get((max(total, 4), hand.is_soft, CARD_POINTS[int(upcard.value)]), STAND)
@@ -0,0 +1,314 @@
+"""Blackjack strategies described by decision tables and compiled into flat lookup arrays.
+
+A DecisionTable maps a hand total, whether the hand is soft, whether it is a pair, the house's upcard and the true
+count to the actions the player prefers. Actions are written like the cells of a printed strategy chart, one
+letter per action in order of preference: H hit, S stand, D double down, P split and R surrender. Dh doubles or
+hits when doubling is not allowed, Rs surrenders or stands. A pair whose actions don't end with H or S continues
+with the actions of the same total that is not a pair.
+
+An entry applies from a true count on, or at any count if it has none. At a given true count, rounded down, the
+entry with the highest count not above it is played, so a deviation is an entry with the count it starts at.
+
+Compiling a table into a TableStrategy looks up every combination of a hand state of BlackjackHand, pair flag,
+upcard and true count once, so every decision is a single index into an array of action codes. Tables are read
+from CSV or JSON with the columns total, soft, pair, upcard, action and count, see read_table.
+"""
+import csv
+import json
+import math
+import os
+from typing import Iterable
+
+from casino.games.blackjack import (BlackjackHand, CARD_POINTS, HAND_VALUES, HAND_IS_BUST, HAND_IS_SOFT, HIT, STAND,
+                                    DOUBLE, SPLIT, SURRENDER)
+from casino.games.cards import Card, CardValue
+from casino.games.counting import CountingSystem, ShoeTracker
+
+ACTION_LETTERS = {"h": HIT, "s": STAND, "d": DOUBLE, "p": SPLIT, "r": SURRENDER}
+UPCARD_ORDER = (2, 3, 4, 5, 6, 7, 8, 9, 10, 1)  # Columns of the charts below, the ace is last like on printed charts
+MIN_TOTAL = 4  # Lower hard totals, which only occur before the second card is dealt, are looked up as this
+_RANKS = len(CardValue) + 1  # Upcards are indexed by int(CardValue), index 0 is unused
+
+# Basic strategy for four to eight decks with the rules of Blackjack: the house stands on soft 17, doubling after
+# splitting and late surrender are allowed. Hard totals missing from the chart are always hit up to 8 and stood on
+# from 17.
+BASIC_HARD = {
+    9: "H Dh Dh Dh Dh H H H H H",
+    10: "Dh Dh Dh Dh Dh Dh Dh Dh H H",
+    11: "Dh Dh Dh Dh Dh Dh Dh Dh Dh H",
+    12: "H H S S S H H H H H",
+    13: "S S S S S H H H H H",
+    14: "S S S S S H H H H H",
+    15: "S S S S S H H H Rh H",
+    16: "S S S S S H H Rh Rh Rh",
+}
+BASIC_SOFT = {
+    13: "H H H Dh Dh H H H H H",
+    14: "H H H Dh Dh H H H H H",
+    15: "H H Dh Dh Dh H H H H H",
+    16: "H H Dh Dh Dh H H H H H",
+    17: "H Dh Dh Dh Dh H H H H H",
+    18: "S Ds Ds Ds Ds S S H H H",
+}  # Soft 12 is always hit, soft 19 and higher always stood on
+BASIC_PAIRS = {
+    (4, False): "P P P P P P H H H H",
+    (6, False): "P P P P P P H H H H",
+    (8, False): "H H H P P H H H H H",
+    (12, False): "P P P P P H H H H H",
+    (14, False): "P P P P P P H H H H",
+    (16, False): "P P P P P P P P P P",
+    (18, False): "P P P P P S P P S S",
+    (12, True): "P P P P P P P P P P",
+}  # Pairs of fives and of cards worth 10 are never split
+# The Hi-Lo index plays of the Illustrious 18 without insurance, as (total, soft, pair, upcard, action, count)
+# rows. Plays made below a count move the chart's action to the count and make the play the action at any count.
+HI_LO_DEVIATIONS = (
+    (16, False, False, 10, "Rs", 0),
+    (15, False, False, 10, "Rs", 4),
+    (20, False, True, 5, "P", 5),
+    (20, False, True, 6, "P", 4),
+    (10, False, False, 10, "Dh", 4),
+    (12, False, False, 3, "S", 2),
+    (12, False, False, 2, "S", 3),
+    (11, False, False, 1, "Dh", 1),
+    (9, False, False, 2, "Dh", 1),
+    (10, False, False, 1, "Dh", 4),
+    (9, False, False, 7, "Dh", 3),
+    (16, False, False, 9, "Rs", 5),
+    (13, False, False, 2, "H", None),
+    (13, False, False, 2, "S", -1),
+    (12, False, False, 4, "H", None),
+    (12, False, False, 4, "S", 0),
+    (12, False, False, 5, "H", None),
+    (12, False, False, 5, "S", -2),
+    (12, False, False, 6, "H", None),
+    (12, False, False, 6, "S", -1),
+)
+
+
+def parse_actions(code: str) -> tuple:
+    """Converts the letters of a chart cell like Dh into actions in order of preference, returns tuple.
+
+    Raises:
+        ValueError: if a letter is not in ACTION_LETTERS.
+    """
+    try:
+        actions = tuple(ACTION_LETTERS[letter] for letter in code.strip().lower())
+    except KeyError:
+        raise ValueError(f"{code!r} is not a cell of a strategy chart, use the letters H, S, D, P and R") from None
+    if not actions:
+        raise ValueError("A cell of a strategy chart needs at least one action")
+    return actions
+
+
+class DecisionTable:
+    """The actions a player prefers in every situation, keyed on the hand, the house's upcard and the true count.
+
+    Attributes:
+        entries: dict mapping (total, soft, pair, upcard) to a dict mapping the count an entry applies from, None for
+            any count, to its actions. Totals are the highest value of the hand, upcards the points of the card from
+            1 (ACE) to 10.
+    """
+    def __init__(self):
+        self.entries = {}
+
+    def set(self, total: int, soft: bool, pair: bool, upcard: int, action: str, count: int = None) -> None:
+        """Adds an entry, replacing the entry of the same situation and count, returns None.
+
+        Args:
+            total: The highest value of the hand, 4 to 21.
+            soft: Checks whether the hand contains an ace counted as 11.
+            pair: Checks whether the hand is a pair.
+            upcard: Points of the house's upcard, 1 for an ace up to 10.
+            action: The letters of a chart cell, e.g. Dh.
+            count: The true count from which the entry applies, None to apply at any count.
+
+        Raises:
+            ValueError: if the situation can't occur or the action is not a chart cell.
+        """
+        if not MIN_TOTAL <= total <= 21 or soft and total < 12 or not 1 <= upcard <= 10:
+            raise ValueError(f"A {'soft' if soft else 'hard'} {total} against {upcard} is not a decision")
+        self.entries.setdefault((total, bool(soft), bool(pair), upcard), {})[count] = parse_actions(action)
+
+    def lookup(self, total: int, soft: bool, pair: bool, upcard: int, true_count: float = 0) -> tuple:
+        """Finds the actions of a situation without compiling the table, returns tuple.
+
+        Situations without any entry are stood on.
+        """
+        total = max(total, MIN_TOTAL)
+        actions = self._entry(total, soft, pair, upcard, math.floor(true_count))
+        if actions is None or actions[-1] not in (HIT, STAND):  # Pairs continue with the actions of their total
+            actions = (actions or ()) + (self._entry(total, soft, False, upcard, math.floor(true_count)) or (STAND,))
+        return actions
+
+    def _entry(self, total: int, soft: bool, pair: bool, upcard: int, count: int) -> tuple:
+        """The actions of the entry with the highest count not above count, None if there is none, returns tuple."""
+        entries = self.entries.get((total, soft, pair, upcard))
+        if not entries:
+            return None
+        counts = [entry for entry in entries if entry is not None and entry <= count]
+        if counts:
+            return entries[max(counts)]
+        return entries.get(None)
+
+    def counts(self) -> list:
+        """The counts that entries apply from, in increasing order, returns list."""
+        return sorted({count for entries in self.entries.values() for count in entries if count is not None})
+
+    def update(self, rows: Iterable[tuple]) -> None:
+        """Adds the entries of rows of (total, soft, pair, upcard, action, count), returns None."""
+        for row in rows:
+            self.set(*row)
+
+    def compile(self, tracker: ShoeTracker = None, system: CountingSystem = None) -> "TableStrategy":
+        """Compiles the table into a strategy, returns TableStrategy."""
+        return TableStrategy(self, tracker, system)
+
+
+class TableStrategy:
+    """A DecisionTable compiled into a flat array of action codes.
+
+    Instances are strategies of BlackjackBot and HeadlessBlackjack, they return the actions of a hand in order of
+    preference. The array has an entry for every hand state of BlackjackHand, pair flag, int(CardValue) of the
+    upcard and true count from one below the lowest count of the table up to the highest. Counts outside of that
+    range play like its ends.
+
+    Attributes:
+        table: The compiled DecisionTable, changes to it after compiling are not played.
+        tracker: ShoeTracker giving the true count, None to play as if the true count is 0.
+        system: CountingSystem of the true count, the first system of the tracker if None.
+        actions: The distinct tuples of actions of the table, indexed by action code.
+        codes: bytes with the action code of every entry of the array.
+    """
+    def __init__(self, table: DecisionTable, tracker: ShoeTracker = None, system: CountingSystem = None):
+        self.table = table
+        self.tracker = tracker
+        self.system = system
+        counts = table.counts()
+        self._lowest = counts[0] - 1 if counts else 0  # Count of the first column, below every entry with a count
+        self._columns = counts[-1] - self._lowest + 1 if counts else 1
+        self._zero = min(max(-self._lowest, 0), self._columns - 1)  # Column of a true count of 0
+        codes = {}
+        cells = bytearray()
+        situations = {}  # Many states share a total, so every situation is looked up once
+        for state, values in enumerate(HAND_VALUES):
+            soft = HAND_IS_SOFT[state]
+            for pair in (False, True):
+                for rank in range(_RANKS):
+                    upcard = CARD_POINTS[rank]
+                    for column in range(self._columns):
+                        if HAND_IS_BUST[state] or not 1 <= upcard <= 10:  # Never asked
+                            actions = (STAND,)
+                        else:
+                            situation = (max(values), soft, pair, upcard, column)
+                            actions = situations.get(situation)
+                            if actions is None:
+                                actions = situations[situation] = table.lookup(*situation[:4], self._lowest + column)
+                        cells.append(codes.setdefault(actions, len(codes)))
+        if len(codes) > 256:
+            raise ValueError("A table can't have more than 256 different cells")
+        self.actions = tuple(codes)
+        self.codes = bytes(cells)
+
+    def __call__(self, hand: BlackjackHand, upcard: Card) -> tuple:
+        index = ((hand.state << 1 | hand.is_pair) * _RANKS + upcard.value._value_) * self._columns
+        if self._columns > 1:
+            if self.tracker is None:
+                index += self._zero
+            else:
+                column = math.floor(self.tracker.true_count(self.system)) - self._lowest
+                index += 0 if column < 0 else column if column < self._columns else self._columns - 1
+        return self.actions[self.codes[index]]
+
+
+class CountedInsurance:
+    """An insurance policy that takes insurance from a true count on, the most valuable index play of Hi-Lo.
+
+    Attributes:
+        tracker: ShoeTracker giving the true count.
+        true_count: The lowest true count at which insurance is taken.
+        system: CountingSystem of the true count, the first system of the tracker if None.
+    """
+    def __init__(self, tracker: ShoeTracker, true_count: float = 3, system: CountingSystem = None):
+        self.tracker = tracker
+        self.true_count = true_count
+        self.system = system
+
+    def __call__(self, hand: BlackjackHand, upcard: Card) -> bool:
+        return self.tracker.true_count(self.system) >= self.true_count
+
+
+def _chart_rows(chart: dict, soft: bool = None) -> list:
+    """Converts a chart of rows of cells per upcard into rows of (total, soft, pair, upcard, action, count), returns
+    list."""
+    rows = []
+    for key, cells in chart.items():
+        total, is_soft, pair = (key, soft, False) if soft is not None else (*key, True)
+        for upcard, cell in zip(UPCARD_ORDER, cells.split()):
+            rows.append((total, is_soft, pair, upcard, cell, None))
+    return rows
+
+
+def basic_strategy(deviations: bool = False) -> DecisionTable:
+    """Creates the table of BASIC_HARD, BASIC_SOFT and BASIC_PAIRS, returns DecisionTable.
+
+    Args:
+        deviations: Adds the HI_LO_DEVIATIONS, to be compiled with a ShoeTracker counting Hi-Lo.
+    """
+    table = DecisionTable()
+    for upcard in range(1, 11):
+        for total in range(MIN_TOTAL, 22):
+            table.set(total, False, False, upcard, "H" if total < 17 else "S")
+        for total in range(12, 22):
+            table.set(total, True, False, upcard, "H" if total < 19 else "S")
+    table.update(_chart_rows(BASIC_HARD, soft=False))
+    table.update(_chart_rows(BASIC_SOFT, soft=True))
+    table.update(_chart_rows(BASIC_PAIRS))
+    if deviations:
+        table.update(HI_LO_DEVIATIONS)
+    return table
+
+
+def _flag(value) -> bool:
+    """Reads a soft or pair flag of CSV or JSON, returns bool."""
+    if isinstance(value, str):
+        if value.strip().lower() not in ("", "0", "1", "false", "true", "no", "yes"):
+            raise ValueError(f"{value!r} is not a flag, use true or false")
+        return value.strip().lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+def _upcard(value) -> int:
+    """Reads an upcard of CSV or JSON, given as its points or as A for an ace, returns int."""
+    if isinstance(value, str) and value.strip().upper() == "A":
+        return 1
+    return int(value)
+
+
+def read_table(path: str) -> DecisionTable:
+    """Reads a table from a CSV file with a header or from a JSON list of objects, returns DecisionTable.
+
+    Every row or object has the fields total, soft, pair, upcard, action and optionally count, e.g.
+    16,false,false,10,Rh,  or  {"total": 16, "soft": false, "pair": false, "upcard": 10, "action": "Rs", "count": 0}.
+    The format is chosen by the extension of the file.
+
+    Raises:
+        ValueError: if the file is not a .csv or .json file or contains an invalid row.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline="") as file:
+        if extension == ".csv":
+            rows = list(csv.DictReader(file))
+        elif extension == ".json":
+            rows = json.load(file)
+        else:
+            raise ValueError(f"Can't read a table from {path}, use a .csv or .json file")
+    table = DecisionTable()
+    for number, row in enumerate(rows, 1):
+        try:
+            count = row.get("count")
+            table.set(int(row["total"]), _flag(row["soft"]), _flag(row["pair"]), _upcard(row["upcard"]),
+                      row["action"], int(count) if count not in (None, "") else None)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Row {number} of {path} is not a valid entry: {e}") from None
+    return table
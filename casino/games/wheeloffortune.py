@@ -0,0 +1,234 @@
+"""A wheel of fortune with weighted segments.
+
+The wheel is divided into segments with a weight, the relative chance of the wheel stopping on it, and a payout,
+the multiple of the stake returned when it does. Spins are sampled from an AliasTable in constant time. The table
+takes linear time to build, so after a weight changes single spins use CumulativeWeights, which is updated in
+logarithmic time, until the next batch of spins rebuilds the alias table.
+"""
+import random
+from fractions import Fraction
+from typing import Generator
+
+from casino.games.game import Game, Decision
+from casino.users.money import Money
+from casino.users.users import PlayableUser
+
+BET = "bet"
+PLAY_AGAIN = "play again"
+
+_BET_DECISION = Decision(BET, "Please enter the amount you want to bet.")
+_PLAY_AGAIN_DECISION = Decision(PLAY_AGAIN, "\nDo you want to spin again?[y/n]", ("y", "n"))
+
+
+class Segment:
+    """A segment of a wheel of fortune.
+
+    Attributes:
+        label: The text shown on the segment.
+        weight: The relative chance of the wheel stopping on the segment.
+        payout: The multiple of the stake returned when the wheel stops on the segment, 0 for a losing segment.
+    """
+    __slots__ = ("label", "weight", "payout")
+
+    def __init__(self, label: str, weight: float, payout=0):
+        if weight < 0:
+            raise ValueError("Weight can't be negative.")
+        self.label = label
+        self.weight = weight
+        self.payout = Fraction(repr(payout)) if isinstance(payout, float) else Fraction(payout)
+        if self.payout < 0:
+            raise ValueError("Payout can't be negative.")
+
+    def __repr__(self) -> str:
+        return f"Segment({self.label!r}, {self.weight!r}, {str(self.payout)!r})"
+
+
+class AliasTable:
+    """Samples indices with probabilities proportional to weights in constant time, using Walker's alias method.
+
+    Attributes:
+        probabilities: Chance of keeping every index instead of taking its alias.
+        aliases: The index taken instead of every index.
+    """
+    def __init__(self, weights: list):
+        size = len(weights)
+        total = sum(weights)
+        if size == 0 or total <= 0:
+            raise ValueError("At least one weight must be positive.")
+        scaled = [weight * size / total for weight in weights]
+        self.probabilities = [1.0] * size
+        self.aliases = list(range(size))
+        small = [index for index, weight in enumerate(scaled) if weight < 1]
+        large = [index for index, weight in enumerate(scaled) if weight >= 1]
+        while small and large:  # Vose's method: fill the column of every small index with a large one
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # Leftovers are 1 up to floating point rounding and keep their probability of 1.0
+
+    def sample(self, rng: random.Random) -> int:
+        """Draws a single index, returns int."""
+        spot = rng.random() * len(self.probabilities)
+        index = int(spot)
+        return index if spot - index < self.probabilities[index] else self.aliases[index]
+
+    def sample_many(self, rng: random.Random, amount: int) -> list:
+        """Draws a number of indices, returns list."""
+        probabilities, aliases = self.probabilities, self.aliases
+        size = len(probabilities)
+        draw = rng.random
+        indices = []
+        append = indices.append
+        for _ in range(amount):
+            spot = draw() * size
+            index = int(spot)
+            append(index if spot - index < probabilities[index] else aliases[index])
+        return indices
+
+
+class CumulativeWeights:
+    """Samples indices with probabilities proportional to weights, with cheap weight updates.
+
+    The cumulative weights are kept in a binary indexed tree, so sampling searches the running total like bisect
+    on a list of cumulative weights, and changing a weight only updates the log(n) partial sums containing it.
+
+    Attributes:
+        total: Sum of the weights.
+    """
+    def __init__(self, weights: list):
+        self._size = len(weights)
+        self._tree = [0] * (self._size + 1)
+        self._weights = [0] * self._size
+        self.total = 0
+        for index, weight in enumerate(weights):
+            self.update(index, weight)
+        self._step = 1 << (self._size.bit_length() - 1) if self._size else 0
+
+    def update(self, index: int, weight: float) -> None:
+        """Changes the weight of an index, returns None."""
+        change = weight - self._weights[index]
+        self._weights[index] = weight
+        self.total += change
+        position = index + 1
+        while position <= self._size:
+            self._tree[position] += change
+            position += position & -position
+
+    def sample(self, rng: random.Random) -> int:
+        """Draws a single index, returns int.
+
+        Raises:
+            ValueError: if no weight is positive.
+        """
+        if self.total <= 0:
+            raise ValueError("At least one weight must be positive.")
+        target = rng.random() * self.total
+        position = 0
+        step = self._step
+        while step:
+            following = position + step
+            if following <= self._size and self._tree[following] <= target:
+                position = following
+                target -= self._tree[following]
+            step >>= 1
+        position = min(position, self._size - 1)
+        while self._weights[position] <= 0:  # Rounding may land past the last segment with a weight
+            position -= 1
+        return position
+
+
+def return_to_player(segments: list) -> Fraction:
+    """Calculates the expected multiple of the stake returned by a spin, returns Fraction."""
+    total = sum(Fraction(segment.weight) for segment in segments)
+    return sum(Fraction(segment.weight) * segment.payout for segment in segments) / total
+
+
+def variance(segments: list) -> Fraction:
+    """Calculates the variance of the multiple of the stake returned by a spin, returns Fraction."""
+    total = sum(Fraction(segment.weight) for segment in segments)
+    mean = return_to_player(segments)
+    return sum(Fraction(segment.weight) * (segment.payout - mean) ** 2 for segment in segments) / total
+
+
+class WheelOfFortune(Game):
+    """A wheel of fortune for a single user at the terminal.
+
+    Every round the user bets an amount, the wheel is spun and the payout of the segment it stops on is returned.
+
+    Attributes:
+        user: The user currently playing the game.
+        segments: The Segments of the wheel.
+        rng: The random number generator spinning the wheel, defaults to a new unseeded generator.
+        last_segment: The Segment the wheel stopped on last, None before the first spin.
+    """
+    def __init__(self, user: PlayableUser, segments: list, rng: random.Random = None):
+        super(WheelOfFortune, self).__init__(user=user)
+        self.user = user  # overwrite Game.user to make it of type PlayableUser
+        self.segments = list(segments)
+        self.rng = rng if rng is not None else random.Random()
+        self.last_segment = None
+        weights = [segment.weight for segment in self.segments]
+        self._alias = AliasTable(weights)
+        self._cumulative = CumulativeWeights(weights)
+
+    @property
+    def rtp(self) -> Fraction:
+        """The expected multiple of the stake returned by a spin, returns Fraction."""
+        return return_to_player(self.segments)
+
+    @property
+    def variance(self) -> Fraction:
+        """The variance of the multiple of the stake returned by a spin, returns Fraction."""
+        return variance(self.segments)
+
+    def set_weight(self, index: int, weight: float) -> None:
+        """Changes the weight of a segment, returns None.
+
+        Single spins sample the cumulative weights until the next spin_many rebuilds the alias table.
+
+        Raises:
+            ValueError: if the weight is negative.
+        """
+        if weight < 0:
+            raise ValueError("Weight can't be negative.")
+        self.segments[index].weight = weight
+        self._cumulative.update(index, weight)
+        self._alias = None
+
+    def spin(self) -> int:
+        """Spins the wheel once, returns the index of the segment it stops on."""
+        if self._alias is not None:
+            return self._alias.sample(self.rng)
+        return self._cumulative.sample(self.rng)
+
+    def spin_many(self, amount: int) -> list:
+        """Spins the wheel a number of times, returns list of the indices of the segments it stops on."""
+        if self._alias is None:
+            self._alias = AliasTable([segment.weight for segment in self.segments])
+        return self._alias.sample_many(self.rng, amount)
+
+    def steps(self) -> Generator[Decision, str, None]:
+        while True:
+            amount = yield _BET_DECISION
+            try:
+                stake = Money(amount)
+                if stake <= 0:
+                    raise ValueError("Amount must be positive.")
+                self.user.lose_balance(stake)
+                break
+            except (TypeError, ValueError) as e:
+                self.message(str(e))
+        self.last_segment = self.segments[self.spin()]
+        payout = self.last_segment.payout
+        won = stake.payout(payout.numerator, payout.denominator)
+        self.message(f"The wheel stops on {self.last_segment.label}.")
+        if won:
+            self.user.win_balance(won)
+            self.message(f"Congratulations, you receive: {won}")
+        else:
+            self.message("You lose")
+        answer = yield _PLAY_AGAIN_DECISION
+        if answer == "n":
+            self.has_ended = True
@@ -0,0 +1,136 @@
+"""A load test for casino.ui.server driving many simulated players at once.
+
+Every simulated player opens a table, bets a flat amount, declines insurance and hits until its hand is worth at
+least 17. The time between sending a decision and receiving the answer of the server is recorded for every
+decision.
+
+Run the load test against a running server with: python -m casino.ui.loadtest --players 5000 --rounds 10
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from casino.games.blackjack import BET, INSURANCE, HIT, STAND
+
+PLAYERS_PER_CONNECTION = 250
+
+
+class LoadTestClient:
+    """A single connection to the server that plays for a number of simulated players.
+
+    Attributes:
+        rounds: Amount of rounds every player plays before leaving.
+        bet: Amount every player bets every round.
+        stand_on: The lowest total at which the players stand.
+        latencies: Seconds between sending a decision and receiving the answer, for every decision.
+    """
+    def __init__(self, rounds: int, bet: float = 1, stand_on: int = 17):
+        self.rounds = rounds
+        self.bet = bet
+        self.stand_on = stand_on
+        self.latencies = []
+        self._writer = None
+        self._players = 0
+        self._sent_at = {}
+        self._rounds_left = {}
+
+    async def play(self, host: str, port: int, players: int) -> None:
+        """Opens a table for every player and plays until all players left, returns None."""
+        reader, self._writer = await asyncio.open_connection(host, port, limit=1 << 16)
+        self._players = players
+        for _ in range(players):
+            self._send({"type": "open", "username": "Load test", "balance": "1000000000000"})
+        try:
+            async for line in reader:
+                self.handle(json.loads(line))
+                if self._players == 0:
+                    break
+        finally:
+            self._writer.close()
+
+    def handle(self, message: dict) -> None:
+        """Answers a single message of the server, returns None."""
+        table = message.get("table")
+        sent_at = self._sent_at.pop(table, None)
+        if sent_at is not None:
+            self.latencies.append(time.perf_counter() - sent_at)
+        if message["type"] == "opened":
+            self._rounds_left[table] = self.rounds
+        elif message["type"] == "result":
+            self._rounds_left[table] -= 1
+        elif message["type"] == "decision":
+            if self._rounds_left[table] == 0:
+                self._send({"type": "leave", "table": table})
+                self._players -= 1
+            elif message["decision"] == BET:
+                self._send({"type": "bet", "table": table, "amount": self.bet}, table)
+            elif message["decision"] == INSURANCE:
+                self._send({"type": "action", "table": table, "action": "n"}, table)
+            else:
+                self._send({"type": "action", "table": table, "action": self.decide(message["value"])}, table)
+        elif message["type"] == "error":
+            raise RuntimeError(message["error"])
+
+    def decide(self, value: list) -> str:
+        """Picks an action from the value of the player's hand, returns str."""
+        return HIT if max(value) < self.stand_on else STAND
+
+    def _send(self, message: dict, table: int = None) -> None:
+        if table is not None:
+            self._sent_at[table] = time.perf_counter()
+        self._writer.write(json.dumps(message).encode() + b"\n")
+
+
+def percentile(values: list, fraction: float) -> float:
+    """The value below which the given fraction of values lies, returns float."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def run_load_test(host: str, port: int, players: int, rounds: int,
+                        players_per_connection: int = PLAYERS_PER_CONNECTION) -> dict:
+    """Plays rounds for a number of simulated players against a server, returns dict.
+
+    Args:
+        host: Host of the server.
+        port: Port of the server.
+        players: Amount of simulated players, every player plays at its own table.
+        rounds: Amount of rounds every player plays.
+        players_per_connection: Amount of players sharing a single connection.
+
+    Returns:
+        A dict with the amount of decisions, the duration in seconds and the p50 and p99 latency in milliseconds.
+    """
+    clients = []
+    while players > 0:
+        clients.append((LoadTestClient(rounds), min(players, players_per_connection)))
+        players -= players_per_connection
+    start = time.perf_counter()
+    await asyncio.gather(*(client.play(host, port, amount) for client, amount in clients))
+    duration = time.perf_counter() - start
+    latencies = [latency for client, _ in clients for latency in client.latencies]
+    return {
+        "decisions": len(latencies),
+        "seconds": duration,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test a blackjack table server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--players-per-connection", type=int, default=PLAYERS_PER_CONNECTION)
+    arguments = parser.parse_args()
+    report = asyncio.run(run_load_test(arguments.host, arguments.port, arguments.players, arguments.rounds,
+                                       arguments.players_per_connection))
+    print(f"{report['decisions']} decisions in {report['seconds']:.2f}s, "
+          f"p50 {report['p50_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""An asyncio server hosting many blackjack tables in a single process.
+
+Clients talk to the server over TCP with one JSON object per line. A single connection can play at any amount of
+tables, every message carries the id of the table it belongs to.
+
+Client messages:
+    {"type": "open", "username": "name", "balance": 100} opens a new table, answered with "opened".
+    {"type": "bet", "table": id, "amount": 10} places the bet of a round.
+    {"type": "action", "table": id, "action": "hit"} hits, stands, doubles, splits or surrenders, or answers
+        "y" or "n" when offered insurance.
+    {"type": "leave", "table": id} closes the table.
+
+Server messages:
+    {"type": "opened", "table": id}
+    {"type": "decision", "table": id, "decision": "bet", "action" or "insurance", "options": [...], "value": [...],
+     "house_value": [...], "messages": [...]}
+    {"type": "result", "table": id, "balance": "100.00", "messages": [...]}
+    {"type": "error", "table": id, "error": "description"}
+
+An illegal answer to a decision is answered with an error and the decision is sent again. After
+MAX_INVALID_ANSWERS illegal answers in a row the table is closed.
+
+Run the server with: python -m casino.ui.server --port 8765
+"""
+import argparse
+import asyncio
+import itertools
+import json
+
+from casino.games.blackjack import Blackjack, BlackjackPlayer, BET, PLAY_AGAIN
+from casino.games.game import Decision
+from casino.games.cards import DeckOfCards, PenetrationShuffle
+from casino.games.history import EventSink, BinaryEventLog
+from casino.games.metrics import Metrics, write_json, write_prometheus
+
+DECKS = 6  # Amount of decks in the shoe of every table
+PENETRATION = 0.75  # Fraction of the shoe dealt before it is shuffled
+METRICS_INTERVAL = 10  # Seconds between two exports of the metrics of the tables
+MAX_INVALID_ANSWERS = 3  # Illegal answers in a row after which a table is closed
+
+
+class NetworkBlackjack(Blackjack):
+    """A game of blackjack which collects its messages to send them to a client instead of printing them.
+
+    Attributes:
+        messages: Messages shown since the last call to flush_messages.
+    """
+    def __init__(self, user: BlackjackPlayer, deck: DeckOfCards, penetration: float = PENETRATION):
+        super(NetworkBlackjack, self).__init__(user=user, deck=deck, shuffle_policy=PenetrationShuffle(penetration))
+        self.messages = []
+
+    def message(self, message: str) -> None:
+        self.messages.append(message.strip("\n"))
+
+    def flush_messages(self) -> list:
+        """Returns the collected messages and starts a new list, returns list."""
+        messages, self.messages = self.messages, []
+        return messages
+
+
+class BlackjackTable:
+    """A blackjack table played by a remote client, run as a coroutine.
+
+    The table drives its game through Game.next_decision and Game.apply. Every decision is sent to the client and
+    the table waits for the answer in its inbox, so a waiting table costs no thread.
+
+    Attributes:
+        table_id: The id of the table on the server.
+        game: The NetworkBlackjack played at the table.
+        inbox: asyncio.Queue with the messages the client sent to this table.
+        send: Callable sending a message to the client.
+    """
+    def __init__(self, table_id: int, game: NetworkBlackjack, send):
+        self.table_id = table_id
+        self.game = game
+        self.inbox = asyncio.Queue()
+        self.send = send
+
+    async def run(self) -> None:
+        """Plays rounds until the client leaves or answers illegally too often, returns None."""
+        game = self.game
+        invalid_answers = 0
+        while not game.has_ended:
+            decision = game.next_decision()
+            while decision is not None:
+                if decision.name == PLAY_AGAIN:  # The client keeps playing until it leaves
+                    self.send({"type": "result", "table": self.table_id, "balance": str(game.user.balance),
+                               "messages": game.flush_messages()})
+                    decision = game.apply("y")
+                    continue
+                message = await self.decide(decision)
+                if message is None:
+                    game.has_ended = True
+                    return None
+                try:
+                    decision = game.apply(message.get("amount" if decision.name == BET else "action"))
+                except ValueError as e:
+                    invalid_answers += 1
+                    if invalid_answers >= MAX_INVALID_ANSWERS:
+                        self.send({"type": "error", "table": self.table_id,
+                                   "error": f"{e} The table was closed after {invalid_answers} illegal answers."})
+                        game.has_ended = True
+                        return None
+                    self.send({"type": "error", "table": self.table_id, "error": str(e)})
+                else:
+                    invalid_answers = 0
+
+    async def decide(self, decision: Decision) -> dict:
+        """Sends a decision to the client and waits for the answer, returns dict.
+
+        Returns:
+            The message of the client, None if the client left the table.
+        """
+        self.send({"type": "decision", "table": self.table_id, "decision": decision.name,
+                   "options": decision.options, "value": self.game.user.hand.value,
+                   "house_value": self.game.house.hand.value, "messages": self.game.flush_messages()})
+        message = await self.inbox.get()
+        return None if message.get("type") == "leave" else message
+
+
+class TableServer:
+    """Accepts client connections and routes their messages to the tables they play at.
+
+    Attributes:
+        tables: dict mapping table ids to the BlackjackTable instances currently open.
+        decks: Amount of decks in the shoe of every new table.
+        penetration: Fraction of the shoe of every table dealt before it is shuffled.
+        history: EventSink receiving the round history of every table, None if rounds are not recorded.
+        instrumented: Checks if the games of new tables record Metrics labeled with their table id.
+    """
+    def __init__(self, decks: int = DECKS, penetration: float = PENETRATION, history: EventSink = None,
+                 instrumented: bool = False):
+        self.tables = {}
+        self.decks = decks
+        self.penetration = penetration
+        self.history = history
+        self.instrumented = instrumented
+        self._table_ids = itertools.count(1)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """Starts listening for clients, returns asyncio.AbstractServer."""
+        return await asyncio.start_server(self.handle_client, host, port, limit=1 << 16)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Reads the messages of a single connection until it closes, returns None."""
+        def send(message: dict) -> None:
+            if not writer.is_closing():
+                writer.write(json.dumps(message).encode() + b"\n")
+
+        tasks = {}
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    send({"type": "error", "table": None, "error": "Invalid JSON"})
+                    continue
+                if not isinstance(message, dict):
+                    send({"type": "error", "table": None, "error": "Messages must be JSON objects"})
+                    continue
+                table_id = message.get("table")
+                if message.get("type") == "open":
+                    try:
+                        table = self.open_table(message, send)
+                    except (TypeError, ValueError) as e:
+                        send({"type": "error", "table": None, "error": str(e)})
+                        continue
+                    tasks[table.table_id] = asyncio.create_task(self.run_table(table))
+                    send({"type": "opened", "table": table.table_id})
+                elif isinstance(table_id, int) and table_id in tasks and table_id in self.tables:
+                    self.tables[table_id].inbox.put_nowait(message)
+                else:  # Tables of other connections and tables that have closed
+                    send({"type": "error", "table": table_id, "error": "Unknown table"})
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            writer.close()
+
+    def open_table(self, message: dict, send) -> BlackjackTable:
+        """Creates a table for the player described in an open message, returns BlackjackTable."""
+        user = BlackjackPlayer(str(message.get("username", "Player")), message.get("balance", 100))
+        game = NetworkBlackjack(user, DeckOfCards(decks=self.decks), self.penetration)
+        table = BlackjackTable(next(self._table_ids), game, send)
+        game.history, game.table_id = self.history, table.table_id
+        if self.instrumented:
+            game.instrument(Metrics({"table": table.table_id}))
+        self.tables[table.table_id] = table
+        return table
+
+    def metrics(self) -> list:
+        """Collects the Metrics of every open instrumented table, returns list."""
+        return [table.game.metrics for table in self.tables.values() if table.game.metrics is not None]
+
+    async def export_metrics(self, path: str, interval: float = METRICS_INTERVAL) -> None:
+        """Writes the metrics of the open tables to a file every interval seconds, returns None.
+
+        Files ending in .json get a JSON snapshot, any other file the Prometheus text format.
+        """
+        write = write_json if path.endswith(".json") else write_prometheus
+        while True:
+            write(path, self.metrics())
+            await asyncio.sleep(interval)
+
+    async def run_table(self, table: BlackjackTable) -> None:
+        """Runs a table and removes it from the server once it is closed, returns None."""
+        try:
+            await table.run()
+        finally:
+            del self.tables[table.table_id]
+
+
+async def run_server(host: str, port: int, decks: int = DECKS, penetration: float = PENETRATION,
+                     history: EventSink = None, metrics_path: str = None) -> None:
+    """Runs a TableServer until the process is stopped, returns None."""
+    tables = TableServer(decks, penetration, history, instrumented=metrics_path is not None)
+    server = await tables.serve(host, port)
+    exporter = asyncio.create_task(tables.export_metrics(metrics_path)) if metrics_path is not None else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if exporter is not None:
+            exporter.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Host blackjack tables over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--decks", type=int, default=DECKS)
+    parser.add_argument("--penetration", type=float, default=PENETRATION)
+    parser.add_argument("--history", help="Path of a binary log the round history of every table is appended to")
+    parser.add_argument("--metrics", help="Path of a Prometheus text or .json file the table metrics are written to")
+    arguments = parser.parse_args()
+    history = BinaryEventLog(arguments.history) if arguments.history else None
+    try:
+        asyncio.run(run_server(arguments.host, arguments.port, arguments.decks, arguments.penetration, history,
+                               arguments.metrics))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if history is not None:
+            history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import threading
+from contextlib import contextmanager
+
+from casino.users.money import Money
+
+
+class Account:
+    """The balance of a single user as kept by a BalanceStore.
+
+    Attributes:
+        username: The name of the user the account belongs to.
+        balance: The amount of money in the account.
+    """
+    __slots__ = ("username", "balance")
+
+    def __init__(self, username: str, balance: Money):
+        self.username = username
+        self.balance = balance
+
+    def __repr__(self) -> str:
+        return f"Account({self.username!r}, {self.balance!r})"
+
+
+class BalanceStore:
+    """A thread-safe store of user balances.
+
+    The store is an identity map: every call to account with the same username returns the same Account, so all
+    users created with the same name and store share a single balance. Balances only change through credit and
+    debit, which hold the lock of the store. Amounts are converted to Money, backends store them as integer cents.
+
+    This class keeps balances in memory only. Subclasses persist them by overwriting the _load, _insert, _update and
+    _commit hooks.
+    """
+    def __init__(self):
+        self._accounts = {}
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+
+    def account(self, username: str, balance: Money = 0) -> Account:
+        """Gets the account of a user, opening it if it does not exist yet, returns Account.
+
+        Args:
+            username: The name of the user.
+            balance: The balance of the account if it has to be opened.
+        """
+        with self._lock:
+            account = self._accounts.get(username)
+            if account is None:
+                stored = self._load(username)
+                if stored is None:
+                    balance = Money(balance)
+                    self._insert(username, balance.cents)
+                    self._written()
+                else:
+                    balance = Money.from_cents(stored)
+                account = self._accounts[username] = Account(username, balance)
+            return account
+
+    def credit(self, account: Account, amount: Money) -> None:
+        """Adds an amount to the balance of an account, returns None."""
+        amount = Money(amount)
+        with self._lock:
+            self._update(account, amount.cents, None)
+            account.balance += amount
+            self._written()
+
+    def debit(self, account: Account, amount: Money) -> None:
+        """Deducts an amount from the balance of an account if the balance allows it, returns None.
+
+        Raises:
+            ValueError: if the balance is lower than the amount deducted.
+        """
+        amount = Money(amount)
+        with self._lock:
+            if account.balance < amount or not self._update(account, -amount.cents, amount.cents):
+                raise ValueError("User balance is too low")
+            account.balance -= amount
+            self._written()
+
+    def set_balance(self, account: Account, balance: Money) -> None:
+        """Overwrites the balance of an account, returns None."""
+        balance = Money(balance)
+        with self._lock:
+            self._update(account, (balance - account.balance).cents, None)
+            account.balance = balance
+            self._written()
+
+    @contextmanager
+    def batch(self):
+        """Context manager which writes all settlements made inside it in a single transaction.
+
+        Settlements made by other threads while a batch is open join the same transaction.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._commit()
+
+    def flush(self) -> None:
+        """Writes all pending settlements to the backend, returns None."""
+        with self._lock:
+            self._commit()
+
+    def close(self) -> None:
+        """Flushes the store and releases the backend, returns None."""
+        self.flush()
+
+    def _written(self) -> None:
+        """Called after every write to the backend, returns None."""
+        return None
+
+    def _load(self, username: str) -> int:
+        """Reads the balance in cents of a user from the backend, returns None if the user is unknown."""
+        return None
+
+    def _insert(self, username: str, cents: int) -> None:
+        """Adds a new account with a balance in cents to the backend, returns None."""
+        return None
+
+    def _update(self, account: Account, change: int, minimum: int) -> bool:
+        """Changes a balance by an amount of cents, returns False if the stored balance is lower than minimum."""
+        return True
+
+    def _commit(self) -> None:
+        """Commits the pending writes of the backend, returns None."""
+        return None
+
+
+class MemoryBalanceStore(BalanceStore):
+    """A BalanceStore that only keeps balances in memory."""
+
+
+class SQLiteBalanceStore(BalanceStore):
+    """A BalanceStore that persists balances in an SQLite database.
+
+    Writes are committed once every batch_size settlements and at the end of every batch() block. A debit is a
+    conditional UPDATE, so it stays atomic when other processes use the same database. The balances cached in the
+    accounts only reflect the writes made through this store.
+
+    Attributes:
+        path: The path of the database file.
+        batch_size: Amount of settlements grouped into a single transaction outside of batch() blocks. Settlements
+            that have not been committed yet are lost if the process crashes.
+    """
+    def __init__(self, path: str = ":memory:", batch_size: int = 1):
+        super(SQLiteBalanceStore, self).__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self._uncommitted = 0
+        import sqlite3  # Imported here, games keeping balances in memory never need it
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS balances (username TEXT PRIMARY KEY, cents INTEGER)")
+        self._connection.commit()
+
+    def close(self) -> None:
+        super(SQLiteBalanceStore, self).close()
+        self._connection.close()
+
+    def _written(self) -> None:
+        self._uncommitted += 1
+        if self._batch_depth == 0 and self._uncommitted >= self.batch_size:
+            self._commit()
+
+    def _load(self, username: str) -> int:
+        row = self._connection.execute("SELECT cents FROM balances WHERE username = ?", (username,)).fetchone()
+        return None if row is None else row[0]
+
+    def _insert(self, username: str, cents: int) -> None:
+        self._connection.execute("INSERT INTO balances VALUES (?, ?)", (username, cents))
+
+    def _update(self, account: Account, change: int, minimum: int) -> bool:
+        if minimum is None:
+            self._connection.execute("UPDATE balances SET cents = cents + ? WHERE username = ?",
+                                     (change, account.username))
+            return True
+        cursor = self._connection.execute(
+            "UPDATE balances SET cents = cents + ? WHERE username = ? AND cents >= ?",
+            (change, account.username, minimum))
+        return cursor.rowcount == 1
+
+    def _commit(self) -> None:
+        if self._uncommitted:
+            self._connection.commit()
+            self._uncommitted = 0
@@ -0,0 +1,123 @@
+import math
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+
+CENTS = 100  # Minor units in a single unit of money
+
+
+class Money:
+    """An exact amount of money stored as an integer amount of cents.
+
+    Money can be created from ints, strings, floats, Decimals and other Money. Amounts with fractions of a cent are
+    refused instead of rounded, so a float like 0.1 becomes exactly 10 cents. Money can be added to and subtracted
+    from other Money, multiplied by ints and compared with Money and plain numbers. Comparisons with numbers are
+    exact like those between ints and floats, and Money hashes like the number it equals, so Money and numbers can
+    be mixed as keys of dicts and sets. A float like 0.1 is not exactly a tenth, so it doesn't equal Money(0.1).
+
+    Attributes:
+        cents: The amount in cents.
+    """
+    __slots__ = ("cents",)
+
+    def __init__(self, amount=0):
+        if isinstance(amount, Money):
+            self.cents = amount.cents
+        elif isinstance(amount, int) and not isinstance(amount, bool):
+            self.cents = amount * CENTS
+        elif isinstance(amount, (str, float, Decimal)):
+            try:
+                cents = Decimal(repr(amount) if isinstance(amount, float) else amount) * CENTS
+            except InvalidOperation:
+                raise ValueError(f"could not convert {amount!r} to Money") from None
+            if not cents.is_finite() or cents != cents.to_integral_value():
+                raise ValueError(f"could not convert {amount!r} to Money")
+            self.cents = int(cents)
+        else:
+            raise TypeError(f"could not convert {type(amount).__name__} to Money")
+
+    @classmethod
+    def from_cents(cls, cents: int) -> "Money":
+        """Creates Money from an amount of cents, returns Money."""
+        money = cls.__new__(cls)
+        money.cents = cents
+        return money
+
+    def __str__(self) -> str:
+        sign = "-" if self.cents < 0 else ""
+        units, cents = divmod(abs(self.cents), CENTS)
+        return f"{sign}{units}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    def __hash__(self) -> int:
+        units, cents = divmod(self.cents, CENTS)
+        return hash(Fraction(self.cents, CENTS)) if cents else hash(units)
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __float__(self) -> float:
+        return self.cents / CENTS
+
+    def __neg__(self) -> "Money":
+        return Money.from_cents(-self.cents)
+
+    def __add__(self, other) -> "Money":
+        if isinstance(other, Money):
+            return Money.from_cents(self.cents + other.cents)
+        if other == 0:  # Allows sum() of Money
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> "Money":
+        if isinstance(other, Money):
+            return Money.from_cents(self.cents - other.cents)
+        return NotImplemented
+
+    def __mul__(self, other: int) -> "Money":
+        if isinstance(other, int) and not isinstance(other, bool):
+            return Money.from_cents(self.cents * other)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def _cents_of(self, other) -> int:
+        """The cents of Money or a plain number to compare with, returns None if other can't be Money."""
+        if isinstance(other, Money):
+            return other.cents
+        if isinstance(other, float):
+            return Fraction(other) * CENTS if math.isfinite(other) else other
+        if isinstance(other, (int, Decimal)) and not isinstance(other, bool):
+            return other * CENTS
+        return None
+
+    def __eq__(self, other) -> bool:
+        cents = self._cents_of(other)
+        return NotImplemented if cents is None else self.cents == cents
+
+    def __lt__(self, other) -> bool:
+        cents = self._cents_of(other)
+        return NotImplemented if cents is None else self.cents < cents
+
+    def __le__(self, other) -> bool:
+        cents = self._cents_of(other)
+        return NotImplemented if cents is None else self.cents <= cents
+
+    def __gt__(self, other) -> bool:
+        cents = self._cents_of(other)
+        return NotImplemented if cents is None else self.cents > cents
+
+    def __ge__(self, other) -> bool:
+        cents = self._cents_of(other)
+        return NotImplemented if cents is None else self.cents >= cents
+
+    def payout(self, numerator: int, denominator: int) -> "Money":
+        """Calculates a payout at the odds numerator:denominator, returns Money.
+
+        Payouts that don't come to a whole cent are rounded down to the cent, in favour of the house. A blackjack
+        paid at 3:2 on a bet of 0.05 pays 0.07.
+        """
+        return Money.from_cents(self.cents * numerator // denominator)
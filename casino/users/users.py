@@ -1,3 +1,7 @@
+from casino.users.balances import BalanceStore, MemoryBalanceStore
+from casino.users.money import Money
+
+
 class BaseUser:
     """A base for users.
 
@@ -11,31 +15,45 @@ class BaseUser:
 class PlayableUser(BaseUser):
     """A user class representing a player.
 
+    The balance is kept in an Account of a BalanceStore. Users created with the same username and store share
+    the same balance.
+
     Attributes:
         username: The name of the user.
         balance: The amount of money the user possesses.
+        store: The BalanceStore keeping the balance, every user gets its own MemoryBalanceStore by default.
+        account: The Account of the user in the store.
     """
-    def __init__(self, username: str, balance: float = 100):
+    def __init__(self, username: str, balance: Money = 100, store: BalanceStore = None):
         super(PlayableUser, self).__init__(username=username)
-        self.balance = balance
+        self.store = store if store is not None else MemoryBalanceStore()
+        self.account = self.store.account(username, balance)
 
-    def win_balance(self, amount: float) -> None:
+    @property
+    def balance(self) -> Money:
+        return self.account.balance
+
+    @balance.setter
+    def balance(self, amount: Money) -> None:
+        self.store.set_balance(self.account, amount)
+
+    def win_balance(self, amount: Money) -> None:
         """Add won amount to balance, return None.
 
         Args:
             amount: The amount added to the user balance.
         """
-        self.balance += amount
+        self.store.credit(self.account, amount)
 
-    def lose_balance(self, amount: float) -> None:
+    def lose_balance(self, amount: Money) -> None:
         """Deduct lost balance, return None.
 
+        The check and the deduction are a single atomic operation of the store.
+
         Args:
             amount: The amount deducted from user balance.
 
         Raises:
             ValueError: if the user balance is lower than the amount deducted.
         """
-        if self.balance < amount:  # Check if the deducted amount exceeds balance
-            raise(ValueError("User balance is too low"))
-        self.balance -= amount
+        self.store.debit(self.account, amount)
@@ -0,0 +1,140 @@
+import random
+import statistics
+
+import pytest
+
+from casino.games.analytics import (RunningStats, Drawdown, QuantileSketch, RiskOfRuin, BankrollTracker, AnalyticsSink,
+                                    ruin_probability)
+from casino.games.blackjack import Blackjack, BlackjackPlayer, BET, INSURANCE, PLAY_AGAIN, STAND
+from casino.games.cards import DeckOfCards
+from casino.games.simulation import simulate
+
+
+def random_nets(seed, amount=1000):
+    rng = random.Random(seed)
+    return [rng.choice((-200, -100, -100, 0, 100, 100, 150, 200)) for _ in range(amount)]
+
+
+def worst_fall(changes):
+    total = peak = worst = 0
+    for change in changes:
+        total += change
+        peak = max(peak, total)
+        worst = max(worst, peak - total)
+    return worst
+
+
+def test_running_stats_match_statistics_and_merge():
+    values = [value / 7 for value in random_nets(1)]
+    whole = RunningStats()
+    parts = [RunningStats(), RunningStats(), RunningStats()]
+    for index, value in enumerate(values):
+        whole.add(value)
+        parts[index * 3 // len(values)].add(value)
+    assert whole.mean == pytest.approx(statistics.mean(values))
+    assert whole.variance == pytest.approx(statistics.variance(values))
+    assert (whole.minimum, whole.maximum) == (min(values), max(values))
+    merged = RunningStats()
+    for part in parts:
+        merged.merge(part)
+    assert (merged.count, merged.minimum) == (whole.count, whole.minimum)
+    assert merged.variance == pytest.approx(whole.variance)
+
+
+def test_drawdown_of_consecutive_parts_merges_into_the_whole():
+    drawdown = Drawdown()
+    for change in (100, 50, -120, 30, -90, 200):
+        drawdown.add(change)
+    assert (drawdown.total, drawdown.peak, drawdown.low, drawdown.max_drawdown) == (170, 170, -30, 180)
+    for seed in range(20):
+        changes = random_nets(seed, 200)
+        whole, first, second = Drawdown(), Drawdown(), Drawdown()
+        for index, change in enumerate(changes):
+            whole.add(change)
+            (first if index < seed * 10 else second).add(change)
+        first.merge(second)
+        assert repr(first) == repr(whole) and whole.max_drawdown == worst_fall(changes)
+
+
+def test_quantile_sketch_stays_within_relative_accuracy():
+    rng = random.Random(2)
+    values = [rng.choice((-1, 1)) * rng.lognormvariate(5, 2) for _ in range(5000)] + [0] * 100
+    first, second = QuantileSketch(0.02), QuantileSketch(0.02)
+    for index, value in enumerate(values):
+        (first if index % 2 else second).add(value)
+    first.merge(second)
+    ordered = sorted(values)
+    for fraction in (0.0, 0.01, 0.25, 0.5, 0.75, 0.99, 1.0):
+        expected = ordered[int(fraction * (len(ordered) - 1))]
+        assert abs(first.quantile(fraction) - expected) <= 0.02 * abs(expected) + 1e-9
+    assert len(first.positive) + len(first.negative) < 1000
+    with pytest.raises(ValueError):
+        first.merge(QuantileSketch(0.01))
+
+
+def test_risk_of_ruin_counts_sessions_by_their_lowest_point():
+    ruin = RiskOfRuin((1000, 100, 500))
+    for low in (0, -100, -499, -500, -2000):
+        ruin.add_session(low)
+    assert ruin.probabilities() == {100: 0.8, 500: 0.4, 1000: 0.2}
+    assert ruin_probability(0.0, 1.0, 100) == 1.0 and ruin_probability(1.0, 0.0, 100) == 0.0
+    assert ruin_probability(0.01, 1.3, 100) == pytest.approx(0.2147, abs=1e-4)
+
+
+def test_trackers_of_whole_sessions_merge_into_one():
+    nets = random_nets(3, 1000)
+    whole = BankrollTracker(session_rounds=100, bankrolls=(500, 1000, 5000))
+    parts = [BankrollTracker(session_rounds=100, bankrolls=(500, 1000, 5000)) for _ in range(4)]
+    for index, net in enumerate(nets):
+        whole.add_round(net)
+        parts[index // 300].add_round(net)
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.sessions.count == whole.sessions.count == 10
+    assert merged.ruin.probabilities() == whole.ruin.probabilities()
+    assert merged.sessions.quantile(0.5) == whole.sessions.quantile(0.5)
+    assert merged.drawdown.max_drawdown == whole.drawdown.max_drawdown == worst_fall(nets)
+    assert merged.rounds.mean == pytest.approx(whole.rounds.mean)
+
+
+def test_sink_tracks_every_seat_of_a_simulation():
+    sink = AnalyticsSink(session_rounds=50, bankrolls=(1000, 5000))
+    result = simulate(500, deck=DeckOfCards(rng=random.Random(4)), seats=2, history=sink)
+    assert sorted(sink.trackers) == [(0, 0), (0, 1)]
+    assert sum(tracker.rounds.count for tracker in sink.trackers.values()) == result.rounds
+    assert sum(tracker.drawdown.total for tracker in sink.trackers.values()) == result.net.cents
+    assert all(tracker.sessions.count == 10 for tracker in sink.trackers.values())
+    later = AnalyticsSink(session_rounds=50, bankrolls=(1000, 5000))
+    simulate(100, deck=DeckOfCards(rng=random.Random(5)), history=later)
+    sink.merge(later)
+    assert sink.trackers[0, 0].rounds.count == 600 and sink.trackers[0, 0].sessions.count == 12
+
+
+def test_sink_follows_players_when_seats_are_renumbered():
+    sink = AnalyticsSink()
+    players = [BlackjackPlayer(f"seat {seat}", balance=1000) for seat in range(3)]
+    game = Blackjack(players[0], DeckOfCards(rng=random.Random(6)), history=sink)
+    game.output = None
+    for player in players[1:]:
+        game.sit(player)
+    rounds = [0, 0, 0]
+    for round_number in range(4):
+        if round_number == 2:
+            game.sit(BlackjackPlayer("late", balance=1000))
+            players.append(game.seats[-1])
+            rounds.append(0)
+        decision = game.next_decision()
+        while decision is not None:
+            if decision.name == PLAY_AGAIN:
+                rounds[players.index(game.seats[decision.seat])] += 1
+                leaves = round_number == 0 and decision.seat == 0 or round_number == 2 and decision.seat == 1
+                decision = game.apply("n" if leaves else "y")
+            else:
+                decision = game.apply({BET: 10, INSURANCE: "n"}.get(decision.name, STAND))
+    sink.flush()
+    assert game.player_ids == [1, 3] and [player.username for player in game.seats] == ["seat 1", "late"]
+    assert {key: tracker.rounds.count for key, tracker in sink.trackers.items()} == {
+        (0, 0): 1, (0, 1): 4, (0, 2): 3, (0, 3): 2}
+    assert [sink.trackers[0, player].drawdown.total for player in range(4)] == [
+        player.balance.cents - 100000 for player in players]
@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+from casino.games.blackjack import BlackjackPlayer
+from casino.users.balances import MemoryBalanceStore, SQLiteBalanceStore
+from casino.users.users import PlayableUser
+
+
+def test_users_with_the_same_name_share_a_balance():
+    store = MemoryBalanceStore()
+    first, second = BlackjackPlayer("alice", 50, store), BlackjackPlayer("alice", 999, store)
+    first.win_balance(10)
+    assert second.balance == 60
+    assert PlayableUser("bob").balance == 100
+
+
+def test_debit_is_refused_when_balance_is_too_low():
+    user = PlayableUser("carol", 5)
+    with pytest.raises(ValueError):
+        user.lose_balance(6)
+    assert user.balance == 5
+
+
+def test_sqlite_store_persists_batched_settlements(tmp_path):
+    path = str(tmp_path / "balances.db")
+    store = SQLiteBalanceStore(path, batch_size=100)
+    user = PlayableUser("dave", 100, store)
+    with store.batch():
+        for _ in range(10):
+            user.win_balance(2)
+        user.lose_balance(5)
+    store.close()
+    reopened = SQLiteBalanceStore(path)
+    assert PlayableUser("dave", 0, reopened).balance == 115
+    reopened.close()
+
+
+def test_concurrent_debits_never_overdraw():
+    store = SQLiteBalanceStore()
+    user = PlayableUser("erin", 100, store)
+    refused = []
+
+    def debit() -> None:
+        for _ in range(30):
+            try:
+                user.lose_balance(1)
+            except ValueError:
+                refused.append(1)
+
+    threads = [threading.Thread(target=debit) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert user.balance == 0 and len(refused) == 50
+    assert store._load("erin") == 0
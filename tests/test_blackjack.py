@@ -1,6 +1,228 @@
-from casino.games.blackjack import Blackjack, BlackjackPlayer
-from casino.games.cards import DeckOfCards
+import random
 
-user = BlackjackPlayer('test')
-game = Blackjack(user, DeckOfCards())
-game.play()
+import pytest
+
+from casino.games.blackjack import (Blackjack, BlackjackPlayer, BET, ACTION, INSURANCE, PLAY_AGAIN, HIT, STAND,
+                                    DOUBLE, SPLIT, SURRENDER, MAX_SEATS)
+from casino.games.cards import DeckOfCards, Card, Suit, CardValue, ShufflePolicy
+from casino.games.history import MemorySink, EventKind
+from casino.users.balances import MemoryBalanceStore
+from casino.users.money import Money
+
+
+class ScriptedBlackjack(Blackjack):
+    """Answers every decision from a script instead of the terminal."""
+    def __init__(self, user, deck, answers):
+        super(ScriptedBlackjack, self).__init__(user, deck)
+        self.answers = answers
+        self.messages = []
+
+    def ask(self, decision):
+        return self.answers[decision.name]
+
+    def message(self, message):
+        self.messages.append(message)
+
+
+def test_play_runs_rounds_until_the_user_quits():
+    user = BlackjackPlayer("test", balance=100)
+    answers = {BET: "10", ACTION: STAND, INSURANCE: "n", PLAY_AGAIN: "n"}
+    game = ScriptedBlackjack(user, DeckOfCards(rng=random.Random(3)), answers)
+    game.play()
+    assert game.has_ended
+    assert user.balance in (85, 90, 100, 110, 115)
+    assert any(message.startswith("\nThe house") for message in game.messages)
+
+
+def test_hitting_until_bust_loses_the_bet():
+    for seed in range(20):
+        user = BlackjackPlayer("test", balance=100)
+        answers = {BET: "10", ACTION: HIT, INSURANCE: "n", PLAY_AGAIN: "n"}
+        game = ScriptedBlackjack(user, DeckOfCards(rng=random.Random(seed)), answers)
+        game.play()
+        if not game.house.hand.is_blackjack and not game.user.hand.is_blackjack:
+            assert game.user.hand.is_bust and user.balance == 90
+
+
+class CountingStore(MemoryBalanceStore):
+    """Counts the transactions committed by the store."""
+    def __init__(self):
+        super(CountingStore, self).__init__()
+        self.commits = 0
+
+    def _commit(self):
+        self.commits += 1
+
+
+def stand(decision):
+    return {BET: 10, INSURANCE: "n"}.get(decision.name, STAND)
+
+
+def seated_game(seats, seed=0, store=None):
+    players = [BlackjackPlayer(f"seat {seat}", balance=100, store=store) for seat in range(seats)]
+    game = ScriptedBlackjack(players[0], DeckOfCards(rng=random.Random(seed)), {})
+    for player in players[1:]:
+        game.sit(player)
+    return game, players
+
+
+def test_table_seats_at_most_seven_players():
+    game, players = seated_game(MAX_SEATS)
+    assert game.seats == players
+    with pytest.raises(ValueError):
+        game.sit(BlackjackPlayer("late"))
+
+
+def test_seats_share_the_deck_and_the_house_plays_once():
+    game, players = seated_game(3, seed=5)
+    game.history = MemorySink()
+    decision = game.next_decision()
+    seats = []
+    while decision.name != PLAY_AGAIN:
+        seats.append(decision.seat)
+        decision = game.apply(stand(decision))
+    assert seats[:3] == [0, 1, 2]
+    dealt = sum(len(player.hand.cards) for player in players) + len(game.house.hand.cards)
+    assert len(game.deck.discarded_cards) == dealt
+    settled = [event.seat for event in game.history.events if event.kind == EventKind.SETTLE]
+    assert sorted(settled) == [0, 1, 2]
+    assert sum(event.kind == EventKind.REVEAL for event in game.history.events) <= 1
+
+
+def test_round_is_settled_in_a_single_batch():
+    for seed in range(10):
+        store = CountingStore()
+        game, players = seated_game(4, seed=seed, store=store)
+        decision = game.next_decision()
+        while decision.name != PLAY_AGAIN:
+            decision = game.apply(stand(decision))
+        changed = sum(player.balance != 100 for player in players)
+        assert store.commits == (1 if changed > 1 else 0)
+
+
+def test_seats_sharing_an_account_can_not_bet_more_than_its_balance():
+    store = MemoryBalanceStore()
+    first, second = BlackjackPlayer("alice", 100, store), BlackjackPlayer("alice", 100, store)
+    game = ScriptedBlackjack(first, DeckOfCards(rng=random.Random(0)), {})
+    game.sit(second)
+    assert game.next_decision().seat == 0
+    assert game.apply(60).seat == 1
+    assert game.apply(100).name == BET and game.apply(41).name == BET
+    assert second.bet == 0
+    assert game.apply(40).name != BET and second.bet == 40
+    decision = game.next_decision()
+    assert decision.name != ACTION or DOUBLE not in decision.options
+
+
+class RefusingStore(MemoryBalanceStore):
+    """Refuses every debit, like a store whose balance another process spent."""
+    def _update(self, account, change, minimum):
+        return minimum is None
+
+
+def test_failed_settlement_changes_no_balance_and_keeps_the_settlements():
+    store = MemoryBalanceStore()
+    game, players = seated_game(3, store=store)
+    settlements = [(players[0], Money(30)), (players[1], Money(-50)), (players[2], Money(-101))]
+    game.settlements = list(settlements)
+    with pytest.raises(ValueError):
+        game.settle_round()
+    assert [player.balance for player in players] == [100, 100, 100] and game.settlements == settlements
+    refusing = RefusingStore()
+    game, players = seated_game(3, store=refusing)
+    settlements = [(players[0], Money(30)), (players[1], Money(20)), (players[2], Money(-50))]
+    game.settlements = list(settlements)
+    with pytest.raises(ValueError):
+        game.settle_round()
+    assert [player.balance for player in players] == [100, 100, 100] and len(game.settlements) == 3
+    game.settlements = settlements[:2]
+    game.settle_round()
+    assert [player.balance for player in players] == [130, 120, 100] and game.settlements == []
+
+
+def test_players_leave_until_the_table_is_empty():
+    game, players = seated_game(3, seed=2)
+    decision = game.next_decision()
+    while decision is not None:
+        if decision.name == PLAY_AGAIN:
+            decision = game.apply("n" if decision.seat == 0 else "y")
+        else:
+            decision = game.apply(stand(decision))
+    assert game.seats == players[1:] and game.user is players[1] and not game.has_ended
+    decision = game.next_decision()
+    while decision is not None:
+        decision = game.apply("n" if decision.name == PLAY_AGAIN else stand(decision))
+    assert game.has_ended
+
+
+class NoShuffle(ShufflePolicy):
+    def new_round(self, deck):
+        return False
+
+
+def stacked_game(*values):
+    """Deals the values in order: player, house, player, house's closed card, then every card drawn."""
+    user = BlackjackPlayer("test", balance=100)
+    deck = DeckOfCards()
+    deck.cards = [Card(Suit.SPADES, value) for value in reversed(values)]
+    game = ScriptedBlackjack(user, deck, {})
+    game.shuffle_policy = NoShuffle()
+    return game, user
+
+
+def test_split_hands_come_from_the_pool_and_may_double():
+    game, user = stacked_game(CardValue.EIGHT, CardValue.TEN, CardValue.EIGHT, CardValue.SEVEN, CardValue.THREE,
+                              CardValue.TEN, CardValue.NINE)
+    pool = list(user.hands)
+    game.next_decision()
+    decision = game.apply(10)
+    assert decision.options == (HIT, STAND, DOUBLE, SPLIT, SURRENDER)
+    decision = game.apply(SPLIT)
+    assert user.hand.value == (11,) and SURRENDER not in decision.options
+    decision = game.apply(DOUBLE)
+    assert user.hand.value == (17,)
+    assert game.apply(STAND).name == PLAY_AGAIN
+    assert user.hands == pool and user.hand_count == 2
+    assert user.balance == 120  # 21 wins the doubled bet, 17 pushes against the house's 17
+
+
+def test_split_aces_receive_a_single_card_and_pay_even_money():
+    game, user = stacked_game(CardValue.ACE, CardValue.NINE, CardValue.ACE, CardValue.EIGHT, CardValue.KING,
+                              CardValue.FIVE)
+    game.next_decision()
+    game.apply(10)
+    assert game.apply(SPLIT).name == PLAY_AGAIN
+    assert user.balance == 100  # Ace and king win 10 instead of a 3:2 blackjack, ace and five lose 10
+    game.apply("y")
+    game.next_decision()
+    assert user.hand_count == 1 and all(len(hand.cards) == 0 for hand in user.hands[1:])
+
+
+def test_surrender_returns_half_the_bet():
+    game, user = stacked_game(CardValue.TEN, CardValue.TEN, CardValue.SIX, CardValue.NINE)
+    game.next_decision()
+    game.apply(10)
+    assert game.apply(SURRENDER).name == PLAY_AGAIN
+    assert user.balance == 95
+
+
+def test_insurance_pays_two_to_one_on_a_house_blackjack():
+    game, user = stacked_game(CardValue.TEN, CardValue.ACE, CardValue.NINE, CardValue.KING)
+    game.next_decision()
+    assert game.apply(10).name == INSURANCE
+    assert game.apply("y").name == PLAY_AGAIN
+    assert user.balance == 100  # The insurance of 5 wins 10, the hand loses 10
+
+
+def test_quiet_game_plays_the_same_round_without_formatting_messages():
+    balances = []
+    messages = []
+    for output in (messages.append, None):
+        game = Blackjack(BlackjackPlayer("test", balance=100), DeckOfCards(rng=random.Random(4)))
+        game.output = output
+        decision = game.next_decision()
+        while decision.name != PLAY_AGAIN:
+            decision = game.apply(stand(decision))
+        balances.append(game.user.balance)
+    assert any(message.startswith("\ntest received") for message in messages)
+    assert game.deal_card(game.user) == "" and balances[0] == balances[1]
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from casino.games.blackjack import BlackjackHand  # noqa: E402
+from casino.games.blackjack_batch import evaluate_hands, house_play  # noqa: E402
+from casino.games.cards import Card, Suit, CardValue  # noqa: E402
+
+
+def scalar_hand(row) -> BlackjackHand:
+    hand = BlackjackHand()
+    for rank in row:
+        if rank:
+            hand.add_card(Card(Suit.CLUBS, CardValue(int(rank))))
+    return hand
+
+
+def random_ranks(rows: int, columns: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    ranks = rng.integers(1, 14, size=(rows, columns))
+    sizes = rng.integers(0, columns + 1, size=rows)
+    return np.where(np.arange(columns) < sizes[:, None], ranks, 0)
+
+
+def test_evaluate_hands_matches_blackjack_hand():
+    ranks = random_ranks(5000, 6)
+    values = evaluate_hands(ranks)
+    for index, row in enumerate(ranks):
+        hand = scalar_hand(row)
+        assert (values.min_value[index], values.max_value[index]) == (min(hand.value), max(hand.value))
+        assert values.is_bust[index] == hand.is_bust
+        assert values.is_blackjack[index] == hand.is_blackjack
+        assert values.is_soft[index] == hand.is_soft
+
+
+def test_house_play_matches_house_deal_rules():
+    ranks = random_ranks(2000, 2, seed=1)
+    ranks[:, 0] = np.where(ranks[:, 0] == 0, 1, ranks[:, 0])
+    draws = np.random.default_rng(2).integers(1, 14, size=(2000, 12))
+    values, drawn = house_play(ranks, draws)
+    for index, row in enumerate(ranks):
+        hand = scalar_hand(row)
+        cards = iter(draws[index])
+        while max(hand.value) < 17:
+            hand.add_card(Card(Suit.CLUBS, CardValue(int(next(cards)))))
+        assert max(hand.value) == values.max_value[index]
+        assert len(hand.cards) == np.count_nonzero(row) + drawn[index]
+
+
+def test_house_play_raises_without_enough_draws():
+    with pytest.raises(ValueError):
+        house_play(np.array([[2, 2]]), np.array([[2, 2]]))
@@ -0,0 +1,51 @@
+from casino.games.blackjack import BlackjackHand
+from casino.games.cards import Card, Suit, CardValue
+
+
+def make_hand(*values, hidden: int = None) -> BlackjackHand:
+    hand = BlackjackHand()
+    for index, value in enumerate(values):
+        hand.add_card(Card(Suit.SPADES, value, index != hidden))
+    return hand
+
+
+def test_value_of_soft_and_hard_hands():
+    assert make_hand(CardValue.ACE, CardValue.SIX).value == (7, 17)
+    assert make_hand(CardValue.ACE, CardValue.SIX, CardValue.KING).value == (17,)
+    assert make_hand(CardValue.KING, CardValue.QUEEN, CardValue.TWO).value == (22,)
+    assert make_hand().value == (0,)
+
+
+def test_blackjack_bust_and_soft_flags():
+    assert make_hand(CardValue.ACE, CardValue.JACK).is_blackjack
+    assert not make_hand(CardValue.SEVEN, CardValue.FOUR, CardValue.KING).is_blackjack
+    assert make_hand(CardValue.KING, CardValue.QUEEN, CardValue.TWO).is_bust
+    assert make_hand(CardValue.ACE, CardValue.FIVE).is_soft
+
+
+def test_hidden_cards_count_after_reveal():
+    hand = make_hand(CardValue.NINE, CardValue.ACE, hidden=1)
+    assert hand.value == (9,)
+    hand.reveal_hand()
+    assert hand.value == (10, 20)
+
+
+def test_appending_and_replacing_cards_updates_value():
+    hand = make_hand(CardValue.FIVE)
+    hand.cards.append(Card(Suit.HEARTS, CardValue.SIX))
+    assert hand.value == (11,)
+    hand.cards = [Card(Suit.HEARTS, CardValue.TWO)]
+    assert hand.value == (2,)
+
+
+def test_cached_text_follows_changes_of_the_hand():
+    hand = make_hand(CardValue.NINE, CardValue.ACE, hidden=1)
+    assert str(hand) == "nine of spades and hidden"
+    hand.reveal_hand()
+    assert str(hand) == "nine of spades and ace of spades"
+    hand.add_card(Card(Suit.HEARTS, CardValue.TWO))
+    assert str(hand) == "nine of spades, ace of spades and two of hearts"
+    hand.pop_card()
+    assert str(hand) == "nine of spades and ace of spades"
+    hand.clear()
+    assert str(hand) == "nothing"
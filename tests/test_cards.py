@@ -1,74 +1,85 @@
-from casino.games import cards
-
-print("\n# ---------------------------------------- Test Suit ---------------------------------------- #\n")
-for suit in cards.Suit:
-    print(f"Suit.__repr__: {suit.__repr__()}, Suit.__int__: {suit.__int__()}")
-print("\n# ---------------------------------------- Test CardValue ---------------------------------------- #\n")
-for val in cards.CardValue:
-    print(f"Suit.__repr__: {val.__repr__()}, Suit.__int__: {val.__int__()}")
-print("\n# ---------------------------------------- Test Card ---------------------------------------- #\n")
-all_cards_open = []  # A list of all possible card combinations
-all_cards_closed = []  # A list of hidden cards
-for suit in cards.Suit:
-    for val in cards.CardValue:
-        all_cards_open.append(cards.Card(suit, val))
-        all_cards_closed.append(cards.Card(suit, val, False))
-
-print(f"""All cards open __str__ and __int__:\n
-{[x for x in map(str, all_cards_open)]}\n
-{[x for x in map(int, all_cards_open)]}""")
-print(f"""All cards closed __str__ and __int__:\n
-{[x for x in map(str, all_cards_closed)]}\n
-{[x for x in map(int, all_cards_closed)]}""")
-print("\n# ---------------------------------------- Test Hand ---------------------------------------- #\n")
-hand = cards.Hand()
-print(f"__str__ of Hand with no cards: {hand}")
-print(f"value of Hand with no cards: {hand.value}")
-hand.cards = [cards.Card(cards.Suit.HEARTS, cards.CardValue.TEN)]
-print(f"__str__ of Hand with 1 card: {hand}")
-print(f"value of Hand with 1 card: {hand.value}")
-hand.cards = [cards.Card(cards.Suit.SPADES, cards.CardValue.ACE), cards.Card(cards.Suit.CLUBS, cards.CardValue.FIVE)]
-print(f"__str__ of Hand with 2 cards: {hand}")
-print(f"value of Hand with 2 cards: {hand.value}")
-hand.cards = [cards.Card(cards.Suit.SPADES, cards.CardValue.ACE),
-              cards.Card(cards.Suit.CLUBS, cards.CardValue.TWO),
-              cards.Card(cards.Suit.HEARTS, cards.CardValue.EIGHT),
-              cards.Card(cards.Suit.DIAMONDS, cards.CardValue.KING)]
-print(f"__str__ of Hand with 4 cards: {hand}")
-print(f"value of Hand with 4 cards: {hand.value}")
-hand.cards = [cards.Card(cards.Suit.SPADES, cards.CardValue.ACE),
-              cards.Card(cards.Suit.CLUBS, cards.CardValue.TWO, False),
-              cards.Card(cards.Suit.HEARTS, cards.CardValue.EIGHT),
-              cards.Card(cards.Suit.DIAMONDS, cards.CardValue.KING)]
-print(f"__str__ of Hand with 4 cards, 1 closed: {hand}")
-print(f"value of Hand with 4 cards, 1 closed: {hand.value}")
-hand.reveal_hand()
-print(f"Hand after Hand.reveal_hand: {hand}\nand value: {hand.value}")
-print("\n# ---------------------------------------- Test DeckOfCards ---------------------------------------- #\n")
-deck_without_jokers = cards.DeckOfCards()
-print(f"All cards in deck w/o jokers: {deck_without_jokers.show_cards()}")
-deck_without_jokers.shuffle_cards()
-print(f"shuffled: {deck_without_jokers.show_cards()}")
-print("random card w/o discard:", deck_without_jokers.pick_card(random=True))
-print("random card w/ discard:", deck_without_jokers.pick_card(random=True, discard=True))
-print("top card w/ discard:", deck_without_jokers.pick_card(discard=True))
-print("top card w/ discard and hidden:", deck_without_jokers.pick_card(discard=True, is_open=False))
-print("deck length:", len(deck_without_jokers.cards))
-print("discarded cards:", deck_without_jokers.discarded_cards)
-print("shuffle including discarded cards:", deck_without_jokers.shuffle_cards(True))
-print("deck length post shuffle:", len(deck_without_jokers.cards))
-print("discarded cards post shuffle:", deck_without_jokers.discarded_cards)
-
-deck_with_jokers = cards.DeckOfCards(True)
-print(f"\nAll cards in deck w/ jokers: {deck_with_jokers.show_cards()}")
-deck_with_jokers.shuffle_cards()
-print(f"shuffled: {deck_with_jokers.show_cards()}")
-print("random card w/o discard:", deck_with_jokers.pick_card(random=True))
-print("random card w/ discard:", deck_with_jokers.pick_card(random=True, discard=True))
-print("top card w/ discard:", deck_with_jokers.pick_card(discard=True))
-print("top card w/ discard and hidden:", deck_with_jokers.pick_card(discard=True, is_open=False))
-print("deck length:", len(deck_with_jokers.cards))
-print("discarded cards:", deck_with_jokers.discarded_cards)
-print("shuffle including discarded cards:", deck_with_jokers.shuffle_cards(True))
-print("deck length post shuffle:", len(deck_with_jokers.cards))
-print("discarded cards post shuffle:", deck_with_jokers.discarded_cards)
+import random
+
+from casino.games.cards import Suit, CardValue, Card, Hand, DeckOfCards, CARD_NAMES
+
+
+def test_enums_convert_to_int_and_lowercase_names():
+    assert [int(suit) for suit in Suit] == [1, 2, 3, 4, 5]
+    assert [int(value) for value in CardValue] == list(range(1, 15))
+    assert repr(Suit.HEARTS) == "hearts" and str(CardValue.KING) == "king"
+
+
+def test_card_str_and_int():
+    assert str(Card(Suit.SPADES, CardValue.ACE)) == "ace of spades"
+    assert str(Card(Suit.JOKER, CardValue.JOKER)) == "joker"
+    assert int(Card(Suit.CLUBS, CardValue.QUEEN)) == 12
+    hidden = Card(Suit.CLUBS, CardValue.QUEEN, False)
+    assert (str(hidden), int(hidden)) == ("hidden", 0)
+
+
+def test_hand_str_value_and_reveal():
+    hand = Hand()
+    assert (str(hand), hand.value) == ("nothing", 0)
+    hand.cards = [Card(Suit.HEARTS, CardValue.TEN)]
+    assert (str(hand), hand.value) == ("ten of hearts", 10)
+    hand.cards = [Card(Suit.SPADES, CardValue.ACE), Card(Suit.CLUBS, CardValue.FIVE)]
+    assert str(hand) == "ace of spades and five of clubs"
+    hand.cards = [Card(Suit.SPADES, CardValue.ACE), Card(Suit.CLUBS, CardValue.TWO, False),
+                  Card(Suit.HEARTS, CardValue.EIGHT), Card(Suit.DIAMONDS, CardValue.KING)]
+    assert str(hand) == "ace of spades, hidden, eight of hearts and king of diamonds"
+    assert hand.value == 22
+    hand.reveal_hand()
+    assert hand.value == 24 and "hidden" not in str(hand)
+
+
+def test_deck_contains_every_card_once():
+    assert len(DeckOfCards().cards) == 52
+    deck = DeckOfCards(jokers=True)
+    assert len(deck.cards) == 54
+    assert len({(card.suit, card.value) for card in deck.cards}) == 53  # Both jokers are the same card
+
+
+def test_pick_card_deals_from_the_top_in_factory_order():
+    deck = DeckOfCards(decks=2)
+    assert len(deck.cards) == 104
+    top = deck.cards[-1]
+    assert deck.pick_card() is top and len(deck.cards) == 104
+    dealt = [deck.pick_card(discard=True) for _ in range(14)]
+    assert dealt[0] is top and deck.discarded_cards == dealt and len(deck.cards) == 90
+    assert [str(card) for card in dealt[:2]] == ["ace of hearts", "two of hearts"]
+    assert str(dealt[13]) == "ace of diamonds"  # The second suit follows the thirteen values of the first
+    hidden = deck.pick_card(discard=True, is_open=False)
+    assert not hidden.is_open and hidden is deck.discarded_cards[-1]
+
+
+def test_random_pick_fills_its_gap_with_the_top_card():
+    deck = DeckOfCards(rng=random.Random(4))
+    for _ in range(50):  # Random picks used to index by the length of the deck when it was created
+        deck.pick_card(discard=True)
+    before = list(deck.cards)
+    picked = deck.pick_card(random=True, discard=True)
+    index = before.index(picked)
+    assert deck.cards == ([before[-1]] if index == 0 else before[:-1]) and deck.discarded_cards[-1] is picked
+    assert deck.pick_card(random=True, discard=True) is before[1 - index] and deck.cards == []
+    deck = DeckOfCards(rng=random.Random(5))
+    assert len({id(deck.pick_card(random=True)) for _ in range(200)}) > 40 and len(deck.cards) == 52
+
+
+def test_shuffle_with_and_without_discarded():
+    deck = DeckOfCards(rng=random.Random(4))
+    deck.shuffle_cards()
+    deck.pick_card(discard=True)
+    deck.pick_card(random=True, discard=True)
+    assert (len(deck.cards), len(deck.discarded_cards)) == (50, 2)
+    deck.shuffle_cards(include_discarded=False)
+    assert (len(deck.cards), len(deck.discarded_cards)) == (50, 2)
+    deck.shuffle_cards()
+    assert (len(deck.cards), len(deck.discarded_cards)) == (52, 0)
+
+
+def test_card_names_match_every_open_card():
+    for suit in Suit:
+        for value in CardValue:
+            card = Card(suit, value)
+            assert CARD_NAMES[suit.value << 4 | value.value] == str(card)
+    assert str(Card(Suit.DIAMONDS, CardValue.SEVEN)) == f"{CardValue.SEVEN} of {Suit.DIAMONDS}"
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import pytest
+
+import casino
+
+
+def test_importing_the_package_imports_no_game():
+    code = "import sys, casino; print(sorted(name for name in sys.modules if name.startswith('casino')))"
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == "['casino']"
+
+
+def test_games_are_imported_on_first_use():
+    assert set(casino.GAMES) <= set(dir(casino))
+    assert casino.game_class("blackjack") is casino.blackjack.Blackjack
+    assert casino.game_class("wheeloffortune").__name__ == "WheelOfFortune"
+    with pytest.raises(ValueError):
+        casino.game_class("poker")
+    with pytest.raises(AttributeError):
+        casino.poker
+
+
+def test_hand_tables_are_built_when_imported():
+    code = ("import casino.games.blackjack as blackjack; print('HAND_VALUES' in vars(blackjack)); "
+            "from casino.games.blackjack import HAND_VALUES; print(HAND_VALUES[0])")
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert completed.stdout.split() == ["False", "(0,)"]
@@ -0,0 +1,63 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from casino.games.cards import DeckOfCards, CompactShoe, ContinuousShuffle
+from casino.games.counting import ShoeTracker, HI_LO, KO, OMEGA_II
+from casino.games.solver import composition_of
+
+SYSTEMS = (HI_LO, KO, OMEGA_II)
+
+
+def counted_from_scratch(deck, system):
+    full = DeckOfCards(decks=deck.decks)
+    return system.offset - sum(system.value_tags[int(card.value)] for card in full.cards) + sum(
+        system.value_tags[int(card.value)] for card in deck.discarded_cards)
+
+
+@pytest.mark.parametrize("deck_class", [DeckOfCards, CompactShoe])
+def test_counts_follow_every_dealt_card(deck_class):
+    deck = deck_class(decks=6, rng=random.Random(8))
+    deck.shuffle_cards()
+    tracker = ShoeTracker(deck, SYSTEMS)
+    for dealt in range(1, 200):
+        deck.pick_card(discard=True, random=dealt % 3 == 0)
+        assert tracker.remaining == len(deck.cards)
+    assert tracker.composition() == composition_of(deck) == composition_of(SimpleNamespace(cards=list(deck.cards)))
+    for system in SYSTEMS:
+        assert tracker.running_count(system) == counted_from_scratch(deck, system)
+    assert tracker.true_count(HI_LO) == pytest.approx(tracker.running_count() * 52 / len(deck.cards))
+    assert sum(tracker.suit_counts) == sum(tracker.value_counts) == len(deck.cards)
+
+
+def test_ko_starts_at_its_initial_running_count():
+    assert ShoeTracker(DeckOfCards(decks=6), (KO,)).running_count() == 4 - 4 * 6
+    assert ShoeTracker(DeckOfCards(decks=1), (HI_LO,)).running_count() == 0
+
+
+def test_shuffles_reset_the_tracker():
+    deck = DeckOfCards(decks=2, rng=random.Random(1))
+    tracker = ShoeTracker(deck, (HI_LO,))
+    for _ in range(30):
+        deck.pick_card(discard=True)
+    deck.shuffle_cards(include_discarded=False)
+    assert tracker.remaining == 74
+    deck.shuffle_cards()
+    assert tracker.remaining == 104 and tracker.running_count() == 0
+    for _ in range(30):
+        deck.pick_card(discard=True)
+    ContinuousShuffle().new_round(deck)
+    assert tracker.remaining == 104 and tracker.composition() == (8,) * 9 + (32,)
+
+
+def test_composition_view_is_live():
+    numpy = pytest.importorskip("numpy")
+    deck = CompactShoe(decks=1, rng=random.Random(2))
+    tracker = ShoeTracker(deck)
+    view = tracker.composition_view()
+    code = deck.deal()
+    points = min(code & 15, 10)
+    expected = numpy.array((4,) * 9 + (16,))
+    expected[points - 1] -= 1
+    assert (view == expected).all()
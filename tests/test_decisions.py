@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from casino.games.blackjack import Blackjack, BlackjackPlayer, BET, ACTION, INSURANCE, PLAY_AGAIN, STAND
+from casino.games.cards import DeckOfCards
+
+
+class QuietBlackjack(Blackjack):
+    def message(self, message: str) -> None:
+        return None
+
+
+def make_game(seed: int = 0) -> QuietBlackjack:
+    return QuietBlackjack(BlackjackPlayer("Bot", balance=100), DeckOfCards(rng=random.Random(seed)))
+
+
+def test_round_is_driven_by_decisions():
+    game = make_game()
+    decision = game.next_decision()
+    assert decision.name == BET and decision.options is None
+    decision = game.apply(10)
+    while decision.name in (ACTION, INSURANCE):
+        decision = game.apply(STAND if decision.name == ACTION else "n")
+    assert decision.name == PLAY_AGAIN
+    assert game.user.bet == 10
+    assert game.apply("n") is None
+    assert game.has_ended and game.next_decision() is None
+
+
+def test_invalid_bet_asks_again():
+    game = make_game()
+    game.next_decision()
+    assert game.apply("a lot").name == BET
+    assert game.apply(1000).name == BET
+    assert game.apply(5).name in (ACTION, INSURANCE, PLAY_AGAIN)
+
+
+def test_illegal_answer_raises_and_keeps_decision():
+    game = make_game()
+    game.next_decision()
+    decision = game.apply(5)
+    while decision.name != PLAY_AGAIN:
+        with pytest.raises(ValueError):
+            game.apply("fold")
+        decision = game.apply(STAND if decision.name == ACTION else "n")
+    assert game.next_decision() is decision
+
+
+def test_next_round_starts_after_playing_again():
+    game = make_game(1)
+    decision = game.next_decision()
+    decision = game.apply(5)
+    while decision.name != PLAY_AGAIN:
+        decision = game.apply(STAND if decision.name == ACTION else "n")
+    assert game.apply("y") is None
+    assert game.next_decision().name == BET
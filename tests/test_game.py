@@ -1,4 +1,59 @@
-from casino.games.game import Game
+from casino.games.game import Game, Decision
+from casino.users.users import BaseUser
 
-game = Game()
-game.play()
+
+class CountingGame(Game):
+    """Plays rounds without decisions and ends itself after a number of rounds."""
+    def __init__(self, rounds):
+        super(CountingGame, self).__init__(BaseUser("test"))
+        self.rounds = rounds
+        self.played = 0
+
+    def content(self):
+        self.played += 1
+        if self.played == self.rounds:
+            self.has_ended = True
+
+
+def feed_input(monkeypatch, *answers):
+    answers = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+
+
+def test_play_loops_content_until_the_game_ends():
+    game = CountingGame(3)
+    game.play()
+    assert game.played == 3 and game.next_decision() is None
+
+
+def test_keyboard_interrupt_asks_to_quit(monkeypatch, capsys):
+    class InterruptedGame(CountingGame):
+        def content(self):
+            super(InterruptedGame, self).content()
+            raise KeyboardInterrupt
+
+    feed_input(monkeypatch, "n", "y")
+    game = InterruptedGame(10)
+    game.play()
+    assert game.has_ended and game.played == 2
+    assert "Do you really want to quit?[y/n]" in capsys.readouterr().out
+
+
+def test_ask_accepts_options_and_their_numbers(monkeypatch, capsys):
+    game = CountingGame(1)
+    decision = Decision("action", "Hit or stand?", ("hit", "stand"))
+    feed_input(monkeypatch, "3", " STAND ")
+    assert game.ask(decision) == "stand"
+    feed_input(monkeypatch, "1")
+    assert game.ask(decision) == "hit"
+    assert "Please enter ('hit', 'stand')" in capsys.readouterr().out
+
+
+def test_output_receives_messages_and_none_silences_them(capsys):
+    game = CountingGame(1)
+    messages = []
+    game.output = messages.append
+    game.message("shown")
+    game.output = None
+    game.message("dropped")
+    assert messages == ["shown"] and capsys.readouterr().out == ""
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from casino.games.cards import DeckOfCards
+from casino.games.history import (MemorySink, BinaryEventLog, Event, EventKind, Outcome, LOG_HEADER, RECORD,
+                                  read_events, replay_rounds)
+from casino.games.simulation import HeadlessBlackjack, SimulatedPlayer
+
+
+def play(rounds, history):
+    game = HeadlessBlackjack(SimulatedPlayer(), DeckOfCards(rng=random.Random(11)))
+    game.history = history
+    for _ in range(rounds):
+        game.content()
+    return game
+
+
+def test_every_round_is_dealt_and_settled():
+    sink = MemorySink()
+    game = play(200, sink)
+    rounds = list(replay_rounds(sink.events))
+    assert [number for _, number, _ in rounds] == list(range(1, 201))
+    for _, _, events in rounds:
+        kinds = [event.kind for event in events]
+        assert kinds[:2] == [EventKind.ROUND, EventKind.SHUFFLE]
+        assert kinds.count(EventKind.DEAL) >= 4 and kinds.count(EventKind.SETTLE) == 1
+    settlements = [event for event in sink.events if event.kind == EventKind.SETTLE]
+    assert sum(event.amount for event in settlements) == game.result.net.cents
+    assert sum(event.detail == Outcome.BLACKJACK for event in settlements) == game.result.blackjacks
+
+
+def test_binary_log_roundtrip(tmp_path):
+    path = str(tmp_path / "history.log")
+    sink = MemorySink()
+    log = BinaryEventLog(path, buffered_events=7)
+    play(50, sink)
+    for event in sink.events:
+        log.emit(event)
+    log.close()
+    assert list(read_events(path)) == sink.events
+    log = BinaryEventLog(path)  # Appending keeps the events already logged
+    log.emit(Event(51, 0, EventKind.ROUND, 0, 0, 0, -5))
+    log.close()
+    assert list(read_events(path))[-1].amount == -5
+
+
+def test_read_events_skips_partial_record(tmp_path):
+    path = tmp_path / "history.log"
+    path.write_bytes(LOG_HEADER + RECORD.pack(1, 2, EventKind.BET, 0, 0, 0, 100) + b"\x01\x02")
+    assert list(read_events(str(path))) == [Event(1, 2, EventKind.BET, 0, 0, 0, 100)]
+
+
+def test_appending_after_a_partial_record_keeps_records_aligned(tmp_path):
+    path = tmp_path / "history.log"
+    first = Event(1, 2, EventKind.BET, 0, 0, 0, 100)
+    path.write_bytes(LOG_HEADER + RECORD.pack(*first) + RECORD.pack(*first)[:5])
+    log = BinaryEventLog(str(path))
+    log.emit(Event(2, 2, EventKind.BET, 1, 0, 0, 200))
+    log.close()
+    assert path.stat().st_size == len(LOG_HEADER) + 2 * RECORD.size
+    assert list(read_events(str(path))) == [first, Event(2, 2, EventKind.BET, 1, 0, 0, 200)]
+
+
+def test_read_events_rejects_other_files(tmp_path):
+    path = tmp_path / "other.log"
+    path.write_bytes(b"not a log")
+    with pytest.raises(ValueError):
+        next(read_events(str(path)))
+
+
+def test_binary_log_rejects_other_files_without_opening_them(tmp_path, monkeypatch):
+    path = tmp_path / "other.log"
+    path.write_bytes(b"not a log")
+    opened = []
+    monkeypatch.setattr("builtins.open", lambda *args, _open=open: opened.append(args[1:]) or _open(*args))
+    with pytest.raises(ValueError):
+        BinaryEventLog(str(path))
+    assert ("ab",) not in opened and path.read_bytes() == b"not a log"
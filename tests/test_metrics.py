@@ -0,0 +1,53 @@
+import json
+import random
+
+from casino.games.cards import DeckOfCards
+from casino.games.metrics import Histogram, Metrics, prometheus_text, write_json
+from casino.games.simulation import HeadlessBlackjack, SimulatedPlayer
+
+
+def play(rounds, metrics=None):
+    game = HeadlessBlackjack(SimulatedPlayer(), DeckOfCards(rng=random.Random(2)))
+    if metrics is not None:
+        game.instrument(metrics)
+    for _ in range(rounds):
+        game.content()
+    return game
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((1, 2, 4))
+    for value in (0.5, 1, 1.5, 3, 10):
+        histogram.observe(value)
+    assert histogram.buckets == [2, 1, 1, 1]
+    assert (histogram.count, histogram.sum) == (5, 16)
+    assert histogram.quantile(0.4) == 1 and histogram.quantile(0.8) == 4
+    assert histogram.quantile(1) == float("inf")
+
+
+def test_instrumented_game_records_phases_and_counters():
+    metrics = Metrics({"table": 1})
+    game = play(100, metrics)
+    assert metrics.counters["rounds"] == 100 and metrics.counters["shuffles"] == 100
+    assert metrics.counters["cards_dealt"] >= 400
+    assert metrics.phases["round"].count == metrics.phases["reset_game"].count == 100
+    assert metrics.phases["get_player_action"].count <= 100
+    game.instrument(None)
+    game.content()
+    assert metrics.counters["rounds"] == 100 and "reset_game" not in vars(game)
+
+
+def test_instrumented_game_plays_the_same_rounds():
+    assert play(300).result.net == play(300, Metrics()).result.net
+
+
+def test_exports(tmp_path):
+    metrics = Metrics({"table": 'a"b'})
+    play(10, metrics)
+    text = prometheus_text([metrics])
+    assert 'casino_phase_seconds_bucket{table="a\\"b",phase="round",le="+Inf"} 10' in text
+    assert 'casino_rounds_total{table="a\\"b"} 10' in text
+    path = tmp_path / "metrics.json"
+    write_json(str(path), [metrics])
+    snapshot = json.loads(path.read_text())[0]
+    assert snapshot["counters"]["rounds"] == 10 and snapshot["phases"]["round"]["count"] == 10
@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+import pytest
+
+from casino.games.blackjack import BlackjackPlayer
+from casino.users.money import Money
+
+
+def test_money_is_exact():
+    assert sum([Money(0.1)] * 10) == Money(1)
+    assert Money("10.50").cents == 1050
+    assert str(Money.from_cents(-5)) == "-0.05"
+
+
+def test_money_hashes_like_the_number_it_equals():
+    for amount, number in ((Money(1), 1), (Money("0.5"), 0.5), (Money("-2.25"), -2.25), (Money("0.1"), Decimal("0.1"))):
+        assert amount == number and hash(amount) == hash(number)
+    assert {Money(1): "one"}[1] == "one" and Money("0.5") in {0.5} and len({Money(3), 3, 3.0}) == 1
+    assert Money(0.1) != 0.1 and Money(0.1) == Decimal("0.1") and Money(1) < float("inf")
+
+
+def test_fractions_of_a_cent_are_refused():
+    for amount in ("0.001", 1.005, float("nan"), "ten"):
+        with pytest.raises(ValueError):
+            Money(amount)
+
+
+def test_blackjack_payout_rounds_down_to_the_cent():
+    assert Money(10).payout(3, 2) == Money(15)
+    assert Money("0.05").payout(3, 2) == Money("0.07")
+
+
+def test_bet_is_converted_and_validated():
+    player = BlackjackPlayer("frank", balance="20.25")
+    player.bet = "20.25"
+    assert player.bet == Money("20.25")
+    with pytest.raises(ValueError):
+        player.bet = 21
+    with pytest.raises(ValueError):
+        player.bet = -1
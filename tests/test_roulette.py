@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from casino.games.roulette import (  # noqa: E402
+    Roulette, BetLedger, bet_layout, parse_bet, EUROPEAN, AMERICAN, DOUBLE_ZERO,
+    STRAIGHT, SPLIT, STREET, CORNER, TOP_LINE, LINE, DOZEN, COLUMN, RED, ODD, PAYOUTS, BET, PLAY_AGAIN)
+from casino.users.users import PlayableUser  # noqa: E402
+
+
+def test_every_bet_has_the_house_edge_of_its_wheel():
+    for wheel, edge in ((EUROPEAN, 1 / 37), (AMERICAN, 2 / 38)):
+        layout = bet_layout(wheel)
+        fair = [kind != TOP_LINE for kind, numbers in layout.bets]
+        assert np.allclose(layout.returns.mean(axis=0)[fair], 1 - edge)
+    assert len(bet_layout(EUROPEAN).bets) == 37 + 57 + 12 + 22 + 11 + 6 + 3 + 3 + 6
+    top_line = bet_layout(AMERICAN).bet_id(TOP_LINE, (0, DOUBLE_ZERO, 1, 2, 3))
+    assert bet_layout(AMERICAN).returns[:, top_line].mean() == 35 / 38  # The one bet with a higher edge
+
+
+def test_bets_including_zero_and_double_zero():
+    european, american = bet_layout(EUROPEAN), bet_layout(AMERICAN)
+    for number in (1, 2, 3):
+        assert european.returns[0, european.bet_id(SPLIT, (number, 0))] == 18
+    assert european.returns[2, european.bet_id(STREET, (0, 2, 3))] == 12
+    assert european.returns[0, european.bet_id(CORNER, (0, 1, 2, 3))] == 9
+    assert american.returns[DOUBLE_ZERO, american.bet_id(SPLIT, (0, DOUBLE_ZERO))] == 18
+    assert american.returns[3, american.bet_id(SPLIT, (DOUBLE_ZERO, 3))] == 18
+    assert american.returns[DOUBLE_ZERO, american.bet_id(STREET, (0, DOUBLE_ZERO, 2))] == 12
+    assert american.returns[1, american.bet_id(STREET, (0, 1, 2))] == 12
+    assert american.returns[0, american.bet_id(TOP_LINE, (0, DOUBLE_ZERO, 1, 2, 3))] == 7
+    for layout, bet in ((european, (SPLIT, (0, DOUBLE_ZERO))), (european, (TOP_LINE, (0, 1, 2, 3))),
+                        (american, (SPLIT, (0, 3))), (european, (SPLIT, (0, 4)))):
+        with pytest.raises(ValueError):
+            layout.bet_id(*bet)
+
+
+def test_bet_ids_cover_their_numbers():
+    layout = bet_layout(AMERICAN)
+    assert layout.returns[17, layout.bet_id(SPLIT, (20, 17))] == 18
+    assert layout.returns[5, layout.bet_id(CORNER, (5, 1, 2, 4))] == 9
+    assert layout.returns[DOUBLE_ZERO, layout.bet_id(STRAIGHT, (DOUBLE_ZERO,))] == 36
+    assert layout.returns[0, layout.bet_id(RED)] == 0
+    assert layout.returns[36, layout.bet_id(COLUMN, (3,))] == 3
+    assert layout.returns[36, layout.bet_id(DOZEN, (3,))] == 3
+    for bet in ((SPLIT, (1, 5)), (LINE, (1, 2, 3)), (DOZEN, (4,)), (ODD, (1,))):
+        with pytest.raises(ValueError):
+            layout.bet_id(*bet)
+
+
+def test_ledger_settles_like_a_loop_over_bets():
+    layout = bet_layout(EUROPEAN)
+    rng = np.random.default_rng(1)
+    ledger = BetLedger(capacity=8)
+    players = rng.integers(0, 50, 5000)
+    bet_ids = rng.integers(0, len(layout.bets), 5000)
+    cents = rng.integers(1, 1000, 5000)
+    ledger.place_many(players, bet_ids, cents)
+    ledger.place(3, layout.bet_id(RED), 100)
+    for number in (0, 7, 36):
+        returned = ledger.settle(layout, number)
+        expected = [amount * (PAYOUTS[layout.bets[bet][0]] + 1) * (number in layout.bets[bet][1])
+                    for bet, amount in zip(list(bet_ids) + [layout.bet_id(RED)], list(cents) + [100])]
+        assert returned.tolist() == expected
+        totals = ledger.totals(returned, 50)
+        assert totals.sum() == returned.sum() and totals[3] >= (200 if number == 7 else 0)
+
+
+def test_parse_bet():
+    assert parse_bet("Split 17 20 5.50", EUROPEAN) == (SPLIT, (17, 20), 5.5)
+    assert parse_bet("straight 00 1", AMERICAN)[1] == (DOUBLE_ZERO,)
+    for text in ("straight 00 1", "purple 10", "straight 37 1", "red"):
+        with pytest.raises(ValueError):
+            parse_bet(text, EUROPEAN)
+
+
+def test_round_deducts_bets_and_pays_winners():
+    class QuietRoulette(Roulette):
+        def message(self, message):
+            pass
+
+    user = PlayableUser("test", balance=100)
+    game = QuietRoulette(user, rng=random.Random(5))
+    assert game.next_decision().name == BET
+    assert game.apply("spin").name == BET  # Spinning without bets is refused
+    game.apply("red 10")
+    game.apply("straight 0 1000")  # Exceeds the balance
+    game.apply("straight 0 5")
+    assert user.balance == 85
+    assert game.apply("spin").name == PLAY_AGAIN
+    number = game.last_number
+    expected = 85 + (20 if number in (1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36) else 0)
+    assert user.balance == expected + (180 if number == 0 else 0)
+    assert game.apply("n") is None and game.has_ended
+
+
+def test_bets_of_a_round_without_a_spin_are_returned():
+    user = PlayableUser("test", balance=100)
+    game = Roulette(user, AMERICAN, rng=random.Random(5))
+    game.output = None
+    game.next_decision()
+    game.apply("topline 0 00 1 2 3 10")
+    game.apply("split 0 00 5")
+    assert user.balance == 85
+    game._steps.close()  # The round is abandoned before the spin
+    assert user.balance == 100 and len(game.ledger) == 0
+    game._steps = game._pending = None
+    game.next_decision()
+    game.apply("red 10")
+
+    def quit_at_the_terminal(decision):
+        raise KeyboardInterrupt
+
+    game.ask = quit_at_the_terminal
+    game.end_game = lambda force=False: True
+    game.play()  # The user quits at the terminal before spinning
+    assert game.has_ended and user.balance == 100
@@ -0,0 +1,99 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from casino.games.blackjack import BlackjackPlayer, ACTION, INSURANCE
+from casino.games.cards import Card, CardValue, DeckOfCards, Suit
+from casino.ui.loadtest import LoadTestClient, run_load_test
+from casino.ui.server import BlackjackTable, NetworkBlackjack, TableServer, MAX_INVALID_ANSWERS
+
+
+async def play_against_server(players: int, rounds: int) -> tuple:
+    table_server = TableServer(decks=1)
+    server = await table_server.serve("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        report = await run_load_test("127.0.0.1", port, players, rounds, players_per_connection=4)
+        await asyncio.sleep(0.01)
+    return report, table_server
+
+
+def test_load_test_plays_every_table_and_closes_them():
+    report, table_server = asyncio.run(play_against_server(players=10, rounds=3))
+    assert report["decisions"] >= 10 * 3
+    assert report["p99_ms"] >= report["p50_ms"] > 0
+    assert table_server.tables == {}
+
+
+def stacked_table(*values):
+    """A table dealing the values in order: player, house, player, house's closed card, then every card drawn."""
+    deck = DeckOfCards()
+    deck.cards = [Card(Suit.SPADES, value) for value in reversed(values)]
+    deck.is_shuffled = True
+    sent = []
+    game = NetworkBlackjack(BlackjackPlayer("test", balance=100), deck)
+    return BlackjackTable(1, game, sent.append), sent
+
+
+async def play_table(table, answers):
+    for answer in answers:
+        table.inbox.put_nowait(answer)
+    table.inbox.put_nowait({"type": "leave", "table": 1})
+    await asyncio.wait_for(table.run(), timeout=5)
+
+
+def test_insurance_decision_is_answered_by_the_load_test_client():
+    table, sent = stacked_table(CardValue.TEN, CardValue.ACE, CardValue.NINE, CardValue.SEVEN, *[CardValue.TWO] * 20)
+    asyncio.run(play_table(table, [{"type": "bet", "table": 1, "amount": 5}]))
+    assert sent[1]["decision"] == INSURANCE and sent[1]["options"] == ("y", "n")
+    answers = []
+    client = LoadTestClient(rounds=1)
+    client._writer = SimpleNamespace(write=lambda data: answers.append(json.loads(data)))
+    client.handle({"type": "opened", "table": 1})
+    client.handle(sent[1])
+    assert answers == [{"type": "action", "table": 1, "action": "n"}]
+
+
+def test_illegal_answers_get_errors_and_close_the_table():
+    table, sent = stacked_table(CardValue.TEN, CardValue.ACE, CardValue.NINE, CardValue.SEVEN, *[CardValue.TWO] * 20)
+    illegal = {"type": "action", "table": 1, "action": "hit"}
+    decline = {"type": "action", "table": 1, "action": "n"}
+    asyncio.run(play_table(table, [{"type": "bet", "table": 1, "amount": 5}, illegal, decline]))
+    assert [message["type"] for message in sent] == ["decision", "decision", "error", "decision", "decision"]
+    assert sent[3]["decision"] == INSURANCE and sent[4]["decision"] == ACTION
+    table, sent = stacked_table(CardValue.TEN, CardValue.ACE, CardValue.NINE, CardValue.SEVEN, *[CardValue.TWO] * 20)
+    asyncio.run(play_table(table, [{"type": "bet", "table": 1, "amount": 5}] + [illegal] * MAX_INVALID_ANSWERS))
+    assert [message["type"] for message in sent[-2:]] == ["decision", "error"] and table.game.has_ended
+    assert sum(message["type"] == "error" for message in sent) == MAX_INVALID_ANSWERS
+
+
+async def send_after_close() -> list:
+    table_server = TableServer(decks=1)
+    server = await table_server.serve("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def exchange(*messages):
+            for message in messages:
+                writer.write(json.dumps(message).encode() + b"\n")
+            return json.loads(await asyncio.wait_for(reader.readline(), timeout=5))
+
+        replies = [await exchange({"type": "open", "username": "test"})]
+        replies.append(await exchange({"type": "leave", "table": 1}))
+        while table_server.tables:
+            await asyncio.sleep(0.01)
+        replies.append(await exchange({"type": "bet", "table": 1, "amount": 5}))
+        replies.append(await exchange([1, 2]))
+        replies.append(await exchange({"type": "bet", "table": [1]}))
+        replies.append(await exchange({"type": "open", "username": "test"}))
+        writer.close()
+    return replies
+
+
+def test_messages_to_closed_tables_get_errors_and_keep_the_connection():
+    replies = asyncio.run(send_after_close())
+    assert replies[0] == {"type": "opened", "table": 1}
+    assert [reply["type"] for reply in replies[2:5]] == ["error"] * 3
+    assert replies[2]["error"] == "Unknown table" and replies[2]["table"] == 1
+    assert replies[5] == {"type": "opened", "table": 2}
@@ -0,0 +1,45 @@
+import random
+
+from casino.games.cards import CompactShoe, Card, Suit, CardValue, encode_card, decode_card
+from casino.games.counting import ShoeTracker
+
+
+def test_encode_decode_roundtrip():
+    for suit in Suit:
+        for value in CardValue:
+            card = decode_card(encode_card(Card(suit, value)))
+            assert (card.suit, card.value) == (suit, value)
+
+
+def test_multi_deck_shoe_contains_every_card_per_deck():
+    shoe = CompactShoe(decks=6, jokers=True)
+    assert len(shoe.cards) == 6 * 54
+    assert sum(1 for card in shoe.cards if card.value == CardValue.ACE) == 24
+
+
+def test_pick_card_discards_and_shuffle_returns_discards():
+    shoe = CompactShoe(decks=2, rng=random.Random(1))
+    shoe.shuffle_cards()
+    top = shoe.cards[-1]
+    card = shoe.pick_card(discard=True, is_open=False)
+    assert (card.suit, card.value, card.is_open) == (top.suit, top.value, False)
+    shoe.pick_card(discard=True, random=True)
+    assert len(shoe.cards) == 102 and len(shoe.discarded_cards) == 2
+    shoe.shuffle_cards()
+    assert len(shoe.cards) == 104 and len(shoe.discarded_cards) == 0
+
+
+def test_compact_shoe_is_reproducible_with_seeded_rng():
+    first, second = CompactShoe(8, rng=random.Random(7)), CompactShoe(8, rng=random.Random(7))
+    first.shuffle_cards()
+    second.shuffle_cards()
+    assert first.codes == second.codes
+
+
+def test_dealt_cards_are_discarded_and_counted():
+    shoe = CompactShoe(decks=1, rng=random.Random(4))
+    tracker = ShoeTracker(shoe)
+    dealt = [shoe.deal() for _ in range(10)]
+    assert list(shoe.discarded_codes) == dealt and len(shoe.cards) == 42 and tracker.remaining == 42
+    shoe.reinsert_discarded()
+    assert len(shoe.cards) == 52 and tracker.remaining == 52
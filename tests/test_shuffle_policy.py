@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from casino.games.blackjack import Blackjack, BlackjackPlayer
+from casino.games.cards import (CompactShoe, DeckOfCards, ShufflePolicy, PenetrationShuffle, ContinuousShuffle,
+                                encode_card)
+from casino.games.simulation import simulate
+
+
+def deal(deck, amount):
+    for _ in range(amount):
+        deck.pick_card(discard=True)
+
+
+def test_penetration_shuffle_waits_for_cut_card():
+    deck = DeckOfCards(decks=2, rng=random.Random(3))
+    deck.shuffle_cards()
+    policy = PenetrationShuffle(0.5)
+    deal(deck, 51)
+    assert not policy.new_round(deck) and len(deck.cards) == 53
+    deal(deck, 1)
+    assert deck.penetration == 0.5
+    assert policy.new_round(deck) and len(deck.cards) == 104 and deck.penetration == 0.0
+
+
+@pytest.mark.parametrize("penetration", [0, 1, -0.5, 1.5])
+def test_penetration_shuffle_rejects_invalid_penetration(penetration):
+    with pytest.raises(ValueError):
+        PenetrationShuffle(penetration)
+
+
+@pytest.mark.parametrize("deck_class", [DeckOfCards, CompactShoe])
+def test_continuous_shuffle_returns_every_discarded_card(deck_class):
+    deck = deck_class(decks=1, rng=random.Random(5))
+    deck.shuffle_cards()
+    before = sorted(encode_card(card) for card in deck.cards)
+    deal(deck, 20)
+    assert not ContinuousShuffle().new_round(deck)
+    assert len(deck.discarded_cards) == 0
+    assert sorted(encode_card(card) for card in deck.cards) == before
+
+
+def test_blackjack_uses_shuffle_policy():
+    class QuietBlackjack(Blackjack):
+        def message(self, message):
+            pass
+
+    deck = DeckOfCards(decks=6, rng=random.Random(1))
+    deck.shuffle_cards()
+    game = QuietBlackjack(BlackjackPlayer("Player", 100), deck, PenetrationShuffle(0.75))
+    deal(deck, 10)
+    game.reset_game()
+    assert len(deck.discarded_cards) == 10
+    assert isinstance(QuietBlackjack(BlackjackPlayer("Player", 100), deck).shuffle_policy, ShufflePolicy)
+
+
+@pytest.mark.parametrize("policy", [PenetrationShuffle(), ContinuousShuffle()])
+@pytest.mark.parametrize("deck_class", [DeckOfCards, CompactShoe])
+def test_new_deck_is_shuffled_before_the_first_round(policy, deck_class):
+    deck = deck_class(decks=6, rng=random.Random(7))
+    factory_order = [encode_card(card) for card in deck.cards]
+    assert policy.new_round(deck) and deck.is_shuffled
+    assert [encode_card(card) for card in deck.cards] != factory_order
+    deal(deck, 10)
+    assert not policy.new_round(deck)
+
+
+def test_fresh_table_does_not_deal_in_factory_order():
+    top = [encode_card(card) for card in DeckOfCards(decks=6).cards[-4:]]
+    for policy in (PenetrationShuffle(), ContinuousShuffle()):
+        game = Blackjack(BlackjackPlayer("Player", 100), DeckOfCards(decks=6, rng=random.Random(2)), policy)
+        game.output = None
+        game.next_decision()
+        game.apply(1)
+        dealt = [game.user.hand.cards[0], game.house.hand.cards[0], game.user.hand.cards[1]]
+        assert [encode_card(card) for card in dealt] != top[::-1][:3]
+
+
+@pytest.mark.parametrize("deck_class", [DeckOfCards, CompactShoe])
+def test_shuffle_keeps_the_cards_on_the_table(deck_class):
+    deck = deck_class(rng=random.Random(8))
+    deck.shuffle_cards()
+    deal(deck, 52)
+    on_table = [encode_card(card) for card in deck.discarded_cards][-5:]
+    deck.shuffle_cards(keep=5)
+    assert [encode_card(card) for card in deck.discarded_cards] == on_table and len(deck.cards) == 47
+    assert not set(on_table) & {encode_card(card) for card in deck.cards}
+
+
+@pytest.mark.parametrize("decks, penetration, seats", [(1, 0.75, 7), (2, 0.9, 3), (1, 0.9, 7)])
+def test_seats_sharing_a_penetration_shoe_never_run_out_of_cards(decks, penetration, seats):
+    deck = DeckOfCards(decks=decks, rng=random.Random(1))
+    result = simulate(2000, deck=deck, shuffle_policy=PenetrationShuffle(penetration), seats=seats)
+    assert result.rounds == 2000 * seats
+    assert sorted(map(encode_card, deck.cards + deck.discarded_cards)) == sorted(
+        map(encode_card, DeckOfCards(decks=decks).cards))
@@ -0,0 +1,49 @@
+import pytest
+
+from casino.games.simulation import (simulate, simulate_parallel, FlatBet, ThresholdStrategy, STAND, SPLIT, DOUBLE,
+                                     SURRENDER)
+
+
+def test_simulate_counts_every_round():
+    result = simulate(500)
+    assert result.rounds == 500
+    assert result.wins + result.pushes + result.losses + result.blackjacks == 500
+    assert result.wagered == 500
+
+
+def test_simulate_uses_bet_policy_and_strategy():
+    result = simulate(200, strategy=lambda hand, upcard: STAND, bet_policy=FlatBet(5))
+    assert result.wagered == 1000
+    assert result.variance > 0
+
+
+def test_threshold_strategy_plays_every_round():
+    result = simulate(300, strategy=ThresholdStrategy(12))
+    assert result.rounds == 300
+
+
+def test_simulate_parallel_does_not_depend_on_workers():
+    serial = simulate_parallel(3000, seed=42, workers=1, chunk_size=500)
+    parallel = simulate_parallel(3000, seed=42, workers=3, chunk_size=500)
+    assert serial.rounds == parallel.rounds == 3000
+    assert (serial.net, serial.mean, serial.sum_of_squares) == (parallel.net, parallel.mean, parallel.sum_of_squares)
+    assert (serial.wins, serial.losses) == (parallel.wins, parallel.losses)
+
+
+def test_simulate_plays_every_seat():
+    result = simulate(200, seats=3)
+    assert result.rounds == 600
+    assert result.wins + result.pushes + result.losses + result.blackjacks == 600
+
+
+def test_strategies_may_split_double_and_surrender():
+    result = simulate(500, strategy=lambda hand, upcard: (SPLIT, SURRENDER, DOUBLE, STAND),
+                      insurance_policy=lambda hand, upcard: True)
+    assert result.rounds == 500 and result.surrenders > 0
+    assert result.wins + result.pushes + result.losses + result.blackjacks + result.surrenders > 500
+
+
+def test_strategies_playing_unknown_actions_raise_value_errors():
+    for action in ("fold", (SPLIT,)):  # Splitting is only allowed for pairs
+        with pytest.raises(ValueError, match="allows none of"):
+            simulate(50, strategy=lambda hand, upcard: action)
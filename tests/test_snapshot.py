@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from casino.games.blackjack import (Blackjack, BlackjackPlayer, BlackjackBot, BET, ACTION, INSURANCE, PLAY_AGAIN, HIT,
+                                    STAND)
+from casino.games.cards import Card, CardValue, DeckOfCards, CompactShoe, Suit, encode_card
+from casino.games.simulation import simulate
+from casino.games.snapshot import SnapshotWriter, SnapshotKind, SNAPSHOT_MAGIC
+from casino.games.strategy import basic_strategy
+
+
+class QuietBlackjack(Blackjack):
+    def message(self, message):
+        return None
+
+
+def answer(decision, step):
+    if decision.name == BET:
+        return 10
+    if decision.name == INSURANCE:
+        return "n"
+    if decision.name == ACTION:
+        return HIT if step % 3 else STAND
+    return "y"
+
+
+@pytest.mark.parametrize("deck_class", [DeckOfCards, CompactShoe])
+def test_deck_continues_identically_after_restore(deck_class):
+    deck = deck_class(decks=2, rng=random.Random(1))
+    deck.shuffle_cards()
+    for _ in range(30):
+        deck.pick_card(discard=True)
+    copy = deck_class(rng=random.Random(2))
+    copy.restore(deck.snapshot())
+    assert list(map(str, copy.cards)) == list(map(str, deck.cards))
+    deck.shuffle_cards()
+    copy.shuffle_cards()
+    assert list(map(str, copy.cards)) == list(map(str, deck.cards))
+
+
+def test_restore_rejects_other_kinds_and_versions():
+    deck = DeckOfCards()
+    with pytest.raises(ValueError):
+        deck.restore(BlackjackPlayer("test").snapshot())
+    data = bytearray(deck.snapshot())
+    data[len(SNAPSHOT_MAGIC)] += 1
+    with pytest.raises(ValueError):
+        deck.restore(bytes(data))
+    with pytest.raises(ValueError):
+        deck.restore(SnapshotWriter(SnapshotKind.DECK).getvalue())
+
+
+def hand_snapshot(*codes) -> bytes:
+    writer = SnapshotWriter(SnapshotKind.HAND)
+    writer.blob(bytes(codes))
+    writer.integer(500)
+    writer.integer(0)
+    return writer.getvalue()
+
+
+def test_restore_rejects_corrupted_card_codes_without_changing_state():
+    ace = encode_card(Card(Suit.SPADES, CardValue.ACE))
+    for deck_class, kind in ((DeckOfCards, SnapshotKind.DECK), (CompactShoe, SnapshotKind.SHOE)):
+        deck = deck_class(rng=random.Random(1))
+        before = deck.snapshot()
+        writer = SnapshotWriter(kind)
+        writer.integer(1)
+        if kind == SnapshotKind.SHOE:
+            writer.integer(0)
+        writer.blob(bytes([ace]))
+        writer.blob(bytes([ace, 0x0F]))  # Suit 0 does not exist
+        writer.random_state(random.Random(2))
+        with pytest.raises(ValueError):
+            deck.restore(writer.getvalue())
+        assert deck.snapshot() == before
+    player = BlackjackPlayer("test", balance=100)
+    player.hand.add_card(Card(Suit.CLUBS, CardValue.NINE))
+    before = player.snapshot()
+    writer = SnapshotWriter(SnapshotKind.PLAYER)
+    writer.text("test")
+    for value in (5000, 500, 0, 0, 2):
+        writer.integer(value)
+    writer.blob(hand_snapshot(ace, ace))
+    writer.blob(hand_snapshot(ace, 0x7F))  # Suit 7 does not exist
+    with pytest.raises(ValueError):
+        player.restore(writer.getvalue())
+    assert player.snapshot() == before
+
+
+def test_round_continues_in_another_game_after_restore():
+    for seed in range(10):
+        game = QuietBlackjack(BlackjackPlayer("first"), DeckOfCards(decks=8, rng=random.Random(seed)))
+        game.sit(BlackjackPlayer("second"))
+        decision = game.next_decision()
+        for step in range(3):
+            decision = game.apply(answer(decision, step))
+        data = game.snapshot()
+        assert len(data) < 4096
+        moved = QuietBlackjack(BlackjackPlayer("first"), DeckOfCards(rng=random.Random(99)))
+        moved.restore(data)
+        assert moved.next_decision().name == decision.name and moved.next_decision().seat == decision.seat
+        assert [player.username for player in moved.seats] == ["first", "second"]
+        step = 3
+        while decision is not None:
+            assert moved.next_decision().name == decision.name
+            decision = game.apply(answer(decision, step))
+            moved.apply(answer(moved.next_decision(), step))
+            step += 1
+        assert [player.balance for player in moved.seats] == [player.balance for player in game.seats]
+        assert str(moved.house.hand) == str(game.house.hand)
+
+
+def test_bot_table_is_restored_once_its_bots_are_seated():
+    strategy = basic_strategy().compile()
+    game = Blackjack(BlackjackBot("first", strategy), DeckOfCards(decks=6, rng=random.Random(4)))
+    game.sit(BlackjackBot("second", strategy))
+    game.output = None
+    for _ in range(3):
+        game.next_decision()
+    data = game.snapshot()
+    moved = Blackjack(BlackjackBot("first", strategy), DeckOfCards(rng=random.Random(99)))
+    moved.output = None
+    deck = moved.deck.snapshot()
+    with pytest.raises(ValueError, match="seat its bots"):
+        moved.restore(data)
+    assert moved.deck.snapshot() == deck and len(moved.seats) == 1 and moved.user.balance == 100
+    moved.sit(BlackjackBot("second", strategy))
+    moved.restore(data)
+    for _ in range(3):
+        game.next_decision()
+        moved.next_decision()
+    assert [player.balance for player in moved.seats] == [player.balance for player in game.seats]
+
+
+def test_resumed_simulation_matches_uninterrupted(tmp_path):
+    checkpoint = str(tmp_path / "simulation.snapshot")
+    expected = simulate(300, deck=DeckOfCards(rng=random.Random(5)))
+    simulate(150, deck=DeckOfCards(rng=random.Random(5)), checkpoint=checkpoint, checkpoint_interval=100)
+    resumed = simulate(300, deck=DeckOfCards(rng=random.Random(6)), checkpoint=checkpoint, checkpoint_interval=100)
+    assert repr(resumed) == repr(expected) and resumed.net == expected.net
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from casino.games.cards import DeckOfCards
+from casino.games.solver import (BasicStrategy, composition_of, house_distribution, house_outcomes,
+                                 shoe_composition, solve, stand_ev)
+
+
+def test_house_distribution_sums_to_one():
+    for upcard in range(1, 11):
+        assert sum(house_distribution(shoe_composition(6), upcard)) == pytest.approx(1.0)
+
+
+def test_stand_ev_against_certain_outcomes():
+    assert stand_ev(18, (0, 1.0, 0, 0, 0, 0)) == 0.0
+    assert stand_ev(16, (0, 0, 0, 0, 0, 1.0)) == 1.0
+    assert stand_ev(22, (0, 0, 0, 0, 0, 1.0)) == -1.0
+
+
+def test_basic_strategy_matches_known_decisions():
+    table = BasicStrategy(shoe_composition(6)).table
+    assert table[16, False, 10] == "hit"
+    assert table[12, False, 2] == "hit"
+    assert table[12, False, 4] == "stand"
+    assert table[18, True, 9] == "hit"
+    assert table[18, True, 8] == "stand"
+
+
+def test_solve_depleted_deck():
+    deck = DeckOfCards(rng=random.Random(3))
+    deck.shuffle_cards()
+    for _ in range(20):
+        deck.pick_card(discard=True)
+    composition = composition_of(deck)
+    assert sum(composition) == 32
+    table = solve(composition)
+    assert all(-1.0 <= ev <= 1.0 for evs in table.values() for ev in evs)
+
+
+def test_house_outcomes_raises_on_empty_shoe():
+    with pytest.raises(ValueError):
+        house_outcomes((0,) * 10, 10, False)
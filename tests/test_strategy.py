@@ -0,0 +1,129 @@
+import json
+import random
+
+import pytest
+
+from casino.games.blackjack import (Blackjack, BlackjackPlayer, BlackjackBot, BlackjackHand, BET, ACTION, PLAY_AGAIN,
+                                    HIT, STAND, DOUBLE, SPLIT, SURRENDER)
+from casino.games.cards import Card, CardValue, DeckOfCards, Suit
+from casino.games.counting import ShoeTracker
+from casino.games.simulation import simulate
+from casino.games.strategy import DecisionTable, basic_strategy, read_table
+
+
+def hand_of(*values):
+    hand = BlackjackHand()
+    for value in values:
+        hand.add_card(Card(Suit.HEARTS, CardValue(value)))
+    return hand
+
+
+def card(value):
+    return Card(Suit.SPADES, CardValue(value))
+
+
+class FixedCount:
+    def __init__(self, true_count):
+        self.count = true_count
+
+    def true_count(self, system=None):
+        return self.count
+
+
+def test_compiled_table_matches_lookup_for_every_hand():
+    table = basic_strategy(deviations=True)
+    for true_count in (-9, -1.5, 0, 0.9, 3, 4.2, 20):
+        strategy = table.compile(FixedCount(true_count))
+        for first in range(1, 14):
+            for second in range(first, 14):
+                for third in (None, 2, 5):
+                    hand = hand_of(first, second) if third is None else hand_of(first, second, third)
+                    if hand.is_bust:
+                        continue
+                    for upcard in range(1, 14):
+                        expected = table.lookup(max(hand.value), hand.is_soft, hand.is_pair, min(upcard, 10),
+                                                true_count)
+                        assert strategy(hand, card(upcard)) == expected
+
+
+def test_basic_strategy_follows_the_chart():
+    strategy = basic_strategy().compile()
+    assert strategy(hand_of(10, 6), card(10)) == (SURRENDER, HIT)
+    assert strategy(hand_of(6, 5), card(1)) == (HIT,)
+    assert strategy(hand_of(1, 7), card(6)) == (DOUBLE, STAND)
+    assert strategy(hand_of(8, 8), card(13)) == (SPLIT, SURRENDER, HIT)
+    assert strategy(hand_of(5, 5), card(4)) == (DOUBLE, HIT)
+    assert strategy(hand_of(12, 13), card(6)) == (STAND,)
+    assert strategy(hand_of(2, 3), card(6)) == (HIT,)
+
+
+def test_deviations_follow_the_true_count():
+    tracker = ShoeTracker(DeckOfCards(decks=6))
+    strategy = basic_strategy(deviations=True).compile(tracker)
+    assert tracker.true_count() == 0
+    assert strategy(hand_of(10, 6), card(10)) == (SURRENDER, STAND)
+    assert strategy(hand_of(10, 2), card(4)) == (STAND,)
+    assert strategy(hand_of(10, 10), card(6)) == (STAND,)
+    for _ in range(20):  # 100 low cards leave 212 cards, a true count of about 24
+        for value in range(2, 7):
+            tracker.remove(int(Suit.CLUBS), value)
+    assert strategy(hand_of(10, 10), card(6)) == (SPLIT, STAND)
+    assert strategy(hand_of(10, 6), card(9)) == (SURRENDER, STAND)
+    assert strategy(hand_of(10, 6), card(8)) == (HIT,)
+    lower = basic_strategy(deviations=True).compile(FixedCount(-2.5))
+    assert lower(hand_of(10, 3), card(2)) == (HIT,)
+    assert lower(hand_of(10, 2), card(5)) == (HIT,)
+    assert lower(hand_of(10, 6), card(10)) == (SURRENDER, HIT)
+
+
+def test_tables_are_read_from_csv_and_json(tmp_path):
+    path = tmp_path / "table.csv"
+    path.write_text("total,soft,pair,upcard,action,count\n16,false,false,10,Rh,\n16,false,false,10,S,3\n"
+                    "18,1,0,A,H,\n")
+    table = read_table(str(path))
+    assert table.lookup(16, False, False, 10) == (SURRENDER, HIT)
+    assert table.lookup(16, False, False, 10, true_count=3.5) == (STAND,)
+    assert table.lookup(18, True, False, 1) == (HIT,)
+    rows = [{"total": 16, "soft": False, "pair": False, "upcard": 10, "action": "Rh"},
+            {"total": 16, "soft": False, "pair": False, "upcard": 10, "action": "S", "count": 3},
+            {"total": 18, "soft": True, "pair": False, "upcard": "A", "action": "H"}]
+    path = tmp_path / "table.json"
+    path.write_text(json.dumps(rows))
+    assert read_table(str(path)).entries == table.entries
+    path.write_text(json.dumps([dict(rows[0], action="X")]))
+    with pytest.raises(ValueError):
+        read_table(str(path))
+    with pytest.raises(ValueError):
+        DecisionTable().set(22, False, False, 10, "H")
+
+
+def test_bots_play_their_decisions_at_a_table_with_a_user():
+    strategy = basic_strategy().compile()
+    game = Blackjack(BlackjackPlayer("Ann", balance=100), DeckOfCards(rng=random.Random(5)))
+    game.output = None
+    game.sit(BlackjackBot("Bot", strategy, balance=50))
+    game.sit(BlackjackBot("Short", strategy, balance=50, rounds=2))
+    for _ in range(3):
+        decision = game.next_decision()
+        while decision is not None:
+            assert decision.seat == 0
+            decision = game.apply(5 if decision.name == BET else STAND if decision.name == ACTION else
+                                  "y" if decision.name == PLAY_AGAIN else "n")
+    assert [player.username for player in game.seats] == ["Ann", "Bot"]
+    assert game.seats[1].rounds_played == 3 and game.seats[1].balance != 50
+
+
+def test_bots_alone_play_a_round_per_decision_until_broke():
+    game = Blackjack(BlackjackBot("Bot", basic_strategy().compile(), balance=10, bet_policy=lambda bot: 2),
+                     DeckOfCards(rng=random.Random(6)))
+    game.output = None
+    rounds = 0
+    while not game.has_ended:
+        assert game.next_decision() is None
+        rounds += 1
+    assert game.user.rounds_played == rounds and game.user.balance < 2
+
+
+def test_simulations_play_compiled_tables():
+    basic = simulate(3000, strategy=basic_strategy().compile(), deck=DeckOfCards(decks=6, rng=random.Random(7)))
+    assert basic.rounds == 3000 and basic.surrenders > 0
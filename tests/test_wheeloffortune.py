@@ -0,0 +1,71 @@
+import random
+from collections import Counter
+from fractions import Fraction
+
+import pytest
+
+from casino.games.wheeloffortune import (WheelOfFortune, Segment, AliasTable, CumulativeWeights, return_to_player,
+                                         variance, BET, PLAY_AGAIN)
+from casino.users.users import PlayableUser
+
+WEIGHTS = [24, 15, 7, 4, 2, 1, 0, 1]
+
+
+def frequencies(indices, amount):
+    counts = Counter(indices)
+    return [counts[index] / amount for index in range(len(WEIGHTS))]
+
+
+def test_samplers_follow_the_weights():
+    amount = 100000
+    expected = [weight / sum(WEIGHTS) for weight in WEIGHTS]
+    alias = AliasTable(WEIGHTS).sample_many(random.Random(1), amount)
+    cumulative = CumulativeWeights(WEIGHTS)
+    rng = random.Random(2)
+    bisected = [cumulative.sample(rng) for _ in range(amount)]
+    for indices in (alias, bisected):
+        assert frequencies(indices, amount) == pytest.approx(expected, abs=0.006)
+        assert 6 not in indices
+
+
+def test_cumulative_weights_update():
+    cumulative = CumulativeWeights(WEIGHTS)
+    for index in range(len(WEIGHTS)):
+        cumulative.update(index, 0)
+    cumulative.update(6, 3)
+    rng = random.Random(3)
+    assert {cumulative.sample(rng) for _ in range(100)} == {6} and cumulative.total == 3
+    cumulative.update(6, 0)
+    with pytest.raises(ValueError):
+        cumulative.sample(rng)
+
+
+def test_rtp_and_variance_are_exact():
+    segments = [Segment("lose", 3), Segment("double", 1, 2), Segment("half", 2, 0.5)]
+    assert return_to_player(segments) == Fraction(1 * 2 + 2 * Fraction(1, 2), 6)
+    mean = Fraction(1, 2)
+    assert variance(segments) == (3 * mean ** 2 + (2 - mean) ** 2 + 2 * (Fraction(1, 2) - mean) ** 2) / 6
+
+
+def test_set_weight_falls_back_until_spin_many():
+    game = WheelOfFortune(PlayableUser("test"), [Segment(str(weight), weight, 1) for weight in WEIGHTS],
+                          random.Random(4))
+    for index in range(len(WEIGHTS)):
+        game.set_weight(index, 0)
+    game.set_weight(2, 5)
+    assert {game.spin() for _ in range(50)} == {2}
+    assert set(game.spin_many(50)) == {2}
+
+
+def test_round_pays_the_segment():
+    class QuietWheel(WheelOfFortune):
+        def message(self, message):
+            pass
+
+    user = PlayableUser("test", balance=100)
+    game = QuietWheel(user, [Segment("triple", 1, 3), Segment("lose", 1)], random.Random(5))
+    assert game.next_decision().name == BET
+    assert game.apply("-5").name == BET
+    assert game.apply("1000").name == BET
+    assert game.apply("10").name == PLAY_AGAIN
+    assert user.balance == (120 if game.last_segment.label == "triple" else 90)